@@ -3,95 +3,270 @@ import pandas as pd
 import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
-from datetime import datetime, timedelta
-import folium
-from streamlit_folium import folium_static
+from datetime import datetime
+import streamlit.components.v1 as components
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+from olist import (analytics, basket, charts, cluster, cube, geo, instrument, patterns, results, shared, sketch, sql,
+                   store, stream)
+from olist.config import (APPROX_DISTINCT, CHECK_CUBE, DATA_DIR, GEO_TOLERANCE, LAZY_SECTIONS, QUERY_BACKEND,
+                          RESULT_CACHE, USE_CUBE)
 import warnings
 warnings.filterwarnings('ignore')
 
+# Copy-on-Write: sesi menerima view tabel bersama yang baru disalin ketika diubah (lihat olist/shared.py)
+pd.set_option('mode.copy_on_write', True)
+
 # Konfigurasi halaman
 st.set_page_config(page_title="Olist E-commerce Dashboard", 
                    page_icon="📊", 
                    layout="wide",
                    initial_sidebar_state="expanded")
 
-# Fungsi untuk memuat data hasil analisis dari notebook.ipynb
-@st.cache_data
-def load_processed_data():
+# Instrumentasi rerun (OLIST_INSTRUMENT=1, lihat olist/instrument.py); tanpa instrumentasi tidak melakukan apa-apa
+script_context = get_script_run_ctx()
+instrument.begin_run(script_context.session_id if script_context else None)
+
+# Fungsi untuk memuat data hasil analisis dari notebook.ipynb.
+# st.cache_resource menyimpan satu salinan per proses yang dipakai bersama semua sesi
+# (tanpa pickle/salinan per rerun). Cache dikunci dengan versi data sehingga delta yang baru
+# diterapkan langsung terbaca tanpa restart; max_entries=1 membuang versi lama dari memori.
+@instrument.instrumented('load_processed_data')
+@st.cache_resource(max_entries=1)
+def load_processed_data(current_version):
     try:
-        # Dalam aplikasi nyata, file-file ini akan dihasilkan dari notebook.ipynb
-        # Untuk demo, kita akan mencoba memuat langsung dari path data mentah
-        import os
-        
-        # Check if processed_data directory exists, create if it doesn't
-        if not os.path.exists('processed_data'):
-            os.makedirs('processed_data')
-            st.info("Created 'processed_data' directory. Run the notebook.ipynb first to generate processed datasets.")
-        
-        is_cloud = os.getenv('STREAMLIT_SHARING') == 'true' or os.getenv('STREAMLIT_RUN_ON_SAVE') == 'true'
+        # Baca store Parquet di processed_data/ (dibangun dengan `python -m olist.store build`),
+        # fallback ke CSV mentah jika store belum ada atau sudah kedaluwarsa
+        tables, data_version, source = store.load_tables()
         
-        if is_cloud:
-            base_path = 'data'  
-        else:
-            base_path = '../data'  
-
-        def get_file_path(filename):
-            possible_paths = [
-                os.path.join('processed_data', filename),  # Check processed data first
-                os.path.join(base_path, filename),
-                os.path.join('data', filename),  
-                os.path.join('../data', filename)
-            ]
-            
-            for path in possible_paths:
-                if os.path.exists(path):
-                    return path
-            return os.path.join(base_path, filename)
-        
-        # Memuat semua dataset
-        # Umumnya kita memuat data hasil proses, tapi karena belum dibuat, kita memuat data mentah
-        df_customers = pd.read_csv(get_file_path('customers_dataset.csv'))
-        df_order_items = pd.read_csv(get_file_path('order_items_dataset.csv'))
-        df_order_payments = pd.read_csv(get_file_path('order_payments_dataset.csv'))
-        df_order_reviews = pd.read_csv(get_file_path('order_reviews_dataset.csv'))
-        df_orders = pd.read_csv(get_file_path('orders_dataset.csv'))
-        df_product_category = pd.read_csv(get_file_path('product_category_name_translation.csv'))
-        df_products = pd.read_csv(get_file_path('products_dataset.csv'))
-        df_sellers = pd.read_csv(get_file_path('sellers_dataset.csv'))
-        
-        # Mengkonversi kolom tanggal ke format datetime
-        orders_col = ['order_purchase_timestamp', 'order_approved_at', 'order_delivered_carrier_date',
-                      'order_delivered_customer_date', 'order_estimated_delivery_date']
-        for col in orders_col:
-            df_orders[col] = pd.to_datetime(df_orders[col])
-        
-        # Menggabungkan kategori produk dengan nama bahasa Inggris
-        df_products = pd.merge(
-            df_products, 
-            df_product_category, 
-            on='product_category_name', 
-            how='left'
-        )
+        if source == 'csv':
+            st.info("Memuat data dari CSV. Jalankan `python -m olist.store build` di direktori dashboard "
+                    "untuk membangun store Parquet yang lebih cepat.")
+        elif store.store_status() == 'pending':
+            st.info("Ada delta baru di data/deltas. Jalankan `python -m olist.store append` "
+                    "untuk menambahkannya ke store.")
         
-        return {
-            'customers': df_customers,
-            'order_items': df_order_items,
-            'order_payments': df_order_payments,
-            'order_reviews': df_order_reviews,
-            'orders': df_orders,
-            'products': df_products,
-            'sellers': df_sellers
-        }
+        return shared.SharedTables(tables), data_version
+    except Exception as e:
+        st.error(f"Error loading data: {e}")
+        return None, None
+
+# Backend SQL (OLIST_QUERY_BACKEND=duckdb/sqlite): satu koneksi read-only per proses ke basis data
+# yang dibangun dengan `python -m olist.sql build`. Cache dikunci dengan stat file basis data
+# sehingga build ulang langsung terbaca; versi data diambil dari tabel meta.
+USE_SQL = QUERY_BACKEND in sql.ENGINES
+
+# Backend streaming (OLIST_QUERY_BACKEND=stream): tabel penuh tidak dimuat; penjualan, RFM, dan pembayaran
+# dihitung dari CSV yang dibaca per potongan (olist/stream.py) untuk setiap kombinasi filter
+USE_STREAM = QUERY_BACKEND == 'stream'
+USE_TABLES = not USE_SQL and not USE_STREAM
+
+@instrument.instrumented('load_database')
+@st.cache_resource(max_entries=1)
+def load_database(database_stamp):
+    status = sql.database_status(QUERY_BACKEND)
+    if status == 'missing':
+        st.error(f"Basis data {QUERY_BACKEND} belum ada. Jalankan `python -m olist.sql build "
+                 f"--engine {QUERY_BACKEND}` di direktori dashboard.")
+        return None, None
+    if status == 'stale':
+        st.info("CSV atau delta berubah sejak basis data dibangun. Jalankan `python -m olist.sql build "
+                f"--engine {QUERY_BACKEND}` untuk memperbaruinya.")
+    try:
+        con = sql.connect(QUERY_BACKEND)
+        return con, sql.read_meta(con)['version']
     except Exception as e:
         st.error(f"Error loading data: {e}")
-        return None
+        return None, None
+
+@st.cache_data
+def load_filter_options(_con, data_version):
+    if USE_STREAM:
+        return stream.filter_options()
+    return sql.filter_options(_con)
+
+# Satu pembacaan streaming menghasilkan semua metrik yang didukung untuk satu kombinasi filter;
+# pembayaran dan RFM tidak bergantung pada kategori sehingga memakai hasil tanpa filter kategori
+@instrument.instrumented('stream')
+@st.cache_data(max_entries=32)
+def load_stream_summary(start_date, end_date, selected_category, data_version):
+    frames, scalars, _, _ = stream.stream_summary(start_date, end_date, selected_category)
+    return frames, scalars
+
+# Analisis RFM dimemoisasi per (rentang tanggal, versi data); max_entries membatasi
+# jumlah rentang yang disimpan sehingga cache tidak tumbuh tanpa batas
+@instrument.instrumented('rfm', table='order_facts')
+@st.cache_data(max_entries=32)
+def load_rfm(_data, start_date, end_date, data_version):
+    if USE_SQL:
+        return sql.customer_rfm(_data, start_date, end_date)
+    if USE_STREAM:
+        return load_stream_summary(start_date, end_date, None, data_version)[0]['rfm']
+    return results.fetch('rfm', _data, data_version, start_date, end_date)
+
+# Klaster K-Means dimemoisasi per (rentang tanggal, k); _init (pusat klaster dari rentang yang
+# dilihat sebelumnya di sesi ini) tidak ikut menjadi kunci cache dan hanya mempercepat fit baru
+@instrument.instrumented('clusters', table='order_facts')
+@st.cache_data(max_entries=32)
+def load_clusters(_data, start_date, end_date, n_clusters, data_version, _init=None):
+    rfm = load_rfm(_data, start_date, end_date, data_version)
+    return analytics.customer_clusters(rfm, n_clusters, _init)
+
+# GeoJSON negara bagian dibaca dari berkas lokal dan disederhanakan sekali per toleransi
+@instrument.instrumented('state_geojson')
+@st.cache_data
+def load_state_geojson(tolerance):
+    return geo.load_state_geojson(tolerance)
+
+# HTML peta choropleth di-cache per (negara bagian terpilih, versi data, toleransi) sehingga
+# folium tidak membangun ulang peta di setiap rerun
+@instrument.instrumented('state_map')
+@st.cache_data(max_entries=32)
+def render_state_map(_customer_states, selected_state, data_version, tolerance):
+    return geo.state_choropleth_html(_customer_states, load_state_geojson(tolerance))
+
+# Peta rata-rata jarak/ongkos kirim/lama pengiriman per negara bagian, di-cache per (rentang tanggal,
+# metrik, versi data, toleransi)
+@instrument.instrumented('shipping_map')
+@st.cache_data(max_entries=32)
+def render_shipping_map(_state_shipping, column, legend_name, start_date, end_date, data_version, tolerance):
+    return geo.state_choropleth_html(_state_shipping, load_state_geojson(tolerance), column=column,
+                                     legend_name=legend_name)
+
+# Lokasi penjual dan indeks grid-nya dibangun sekali per versi data dan dipakai bersama semua sesi
+@instrument.instrumented('seller_index', table='sellers')
+@st.cache_resource(max_entries=1)
+def load_seller_index(_data, data_version):
+    return analytics.seller_index(_data['sellers'], _data['geolocation'])
+
+# Histogram pola waktu pembelian dibangun sekali per versi data dan dipakai bersama semua sesi
+@instrument.instrumented('purchase_histogram', table='order_facts')
+@st.cache_resource(max_entries=1)
+def load_purchase_histogram(_data, data_version):
+    return analytics.purchase_histogram(_data['order_facts'])
+
+# Pasangan kategori yang dibeli bersama dalam satu pesanan, dibangun sekali per versi data
+@instrument.instrumented('copurchase_pairs', table='order_facts')
+@st.cache_resource(max_entries=1)
+def load_copurchase_pairs(_data, data_version):
+    return analytics.copurchase_pairs(_data['order_facts'])
+
+# Sketsa HyperLogLog pesanan dan pelanggan per (bulan, kategori, negara bagian), dibangun sekali per versi data
+@instrument.instrumented('distinct_sketches', table='order_facts')
+@st.cache_resource(max_entries=1)
+def load_distinct_sketches(_data, data_version):
+    return analytics.distinct_sketches(_data['order_facts'])
+
+# Hasil perhitungan setiap bagian dashboard (olist/analytics.py) di-cache per input filternya,
+# sehingga berpindah bagian atau kembali ke filter sebelumnya tidak menghitung ulang.
+# _data adalah tabel bersama (pandas), koneksi basis data (olist/sql.py, USE_SQL), atau direktori CSV
+# (USE_STREAM, hasilnya diambil dari load_stream_summary). Dengan OLIST_RESULT_CACHE=1 hasil pandas
+# juga diambil dari cache disk bersama semua worker (olist/results.py).
+@instrument.instrumented('sales', table='order_facts')
+@st.cache_data(max_entries=32)
+def load_sales_summary(_data, start_date, end_date, selected_category, data_version):
+    if USE_SQL:
+        return sql.sales_summary(_data, start_date, end_date, selected_category), []
+    if USE_STREAM:
+        frames, scalars = load_stream_summary(start_date, end_date, selected_category, data_version)
+        return {'total_orders': scalars['total_orders'], 'total_sales': scalars['total_sales'],
+                'monthly_sales': frames['sales_monthly'], 'category_sales': frames['sales_by_category']}, []
+    if CHECK_CUBE:
+        return analytics.sales_summary(_data['order_facts'], _data['sales_cube'], start_date, end_date,
+                                       selected_category, use_cube=USE_CUBE, check=True)
+    return results.fetch('sales', _data, data_version, start_date, end_date, selected_category)
+
+@instrument.instrumented('patterns', table='order_facts')
+@st.cache_data(max_entries=32)
+def load_purchase_patterns(_data, start_date, end_date, selected_category, selected_state, data_version):
+    return analytics.purchase_patterns(load_purchase_histogram(_data, data_version), _data['order_facts'],
+                                       start_date, end_date, selected_category, selected_state)
+
+@instrument.instrumented('basket', table='order_facts')
+@st.cache_data(max_entries=32)
+def load_market_basket(_data, start_date, end_date, selected_category, selected_state, data_version):
+    return analytics.market_basket(load_purchase_histogram(_data, data_version),
+                                   load_copurchase_pairs(_data, data_version), _data['order_facts'],
+                                   start_date, end_date, selected_category, selected_state)
+
+@instrument.instrumented('distinct', table='order_facts')
+@st.cache_data(max_entries=32)
+def load_distinct_counts(_data, start_date, end_date, selected_category, selected_state, approximate, data_version):
+    sketches = load_distinct_sketches(_data, data_version) if approximate else None
+    return analytics.distinct_counts(_data['order_facts'], start_date, end_date, selected_category, selected_state,
+                                     sketches)
+
+@instrument.instrumented('payments', table='payment_facts')
+@st.cache_data(max_entries=32)
+def load_payment_summary(_data, start_date, end_date, data_version):
+    if USE_SQL:
+        return sql.payment_summary(_data, start_date, end_date)
+    if USE_STREAM:
+        frames, _ = load_stream_summary(start_date, end_date, None, data_version)
+        return frames['payment_methods'], frames.get('installment_counts'), frames.get('installment_values')
+    return results.fetch('payments', _data, data_version, start_date, end_date)
+
+@instrument.instrumented('delivery', table='delivery_facts')
+@st.cache_data(max_entries=32)
+def load_delivery_data(_data, start_date, end_date, data_version):
+    if USE_SQL:
+        return sql.delivery_data(_data, start_date, end_date)
+    return analytics.delivery_data(_data['delivery_facts'], start_date, end_date)
+
+@instrument.instrumented('delivery_sla', table='delivery_facts')
+@st.cache_data(max_entries=32)
+def load_delivery_sla(_data, start_date, end_date, data_version):
+    if USE_SQL:
+        return sql.delivery_sla(_data, start_date, end_date)
+    return results.fetch('delivery_sla', _data, data_version, start_date, end_date)
+
+@instrument.instrumented('reviews', table='review_facts')
+@st.cache_data(max_entries=32)
+def load_review_summary(_data, start_date, end_date, data_version):
+    return results.fetch('reviews', _data, data_version, start_date, end_date)
+
+@instrument.instrumented('seller_stats', table='seller_facts')
+@st.cache_data(max_entries=32)
+def load_seller_stats(_data, start_date, end_date, selected_category, selected_state, data_version):
+    return results.fetch('seller_stats', _data, data_version, start_date, end_date, selected_category, selected_state)
+
+@instrument.instrumented('customer_states', table='customers')
+@st.cache_data(max_entries=32)
+def load_customer_states(_data, selected_state, data_version):
+    if USE_SQL:
+        return sql.customer_states(_data, selected_state)
+    return analytics.customer_states(_data['customers'], selected_state)
+
+@instrument.instrumented('shipping', table='shipping_facts')
+@st.cache_data(max_entries=32)
+def load_shipping_summary(_data, start_date, end_date, selected_state, data_version):
+    return results.fetch('shipping', _data, data_version, start_date, end_date, state=selected_state)
+
+@instrument.instrumented('common_zip', table='customers')
+@st.cache_data(max_entries=32)
+def load_common_zip(_data, selected_state, data_version):
+    # Prefiks CEP pelanggan terbanyak (di negara bagian terpilih), nilai awal pencarian radius
+    customers = _data['customers']
+    if selected_state:
+        customers = customers[customers['customer_state'] == selected_state]
+    return int(customers['customer_zip_code_prefix'].mode().iloc[0])
+
+@instrument.instrumented('top_cities', table='customers')
+def load_top_cities(_data, selected_state):
+    if USE_SQL:
+        return sql.top_cities(_data, selected_state)
+    return analytics.top_cities(_data['customers'], selected_state)
 
 # Memuat data dengan tampilan loading spinner
-with st.spinner('Memuat data... Mohon tunggu.'):
-    data = load_processed_data()
+with st.spinner('Memuat data... Mohon tunggu.'), instrument.stage('data'):
+    if USE_SQL:
+        data, data_version = load_database(sql.database_stamp(QUERY_BACKEND))
+    elif USE_STREAM:
+        data, data_version = DATA_DIR, stream.data_version()
+    else:
+        data, data_version = load_processed_data(store.data_version())
 
 # Memeriksa apakah data berhasil dimuat
-if not data:
+if data is None:
     st.error("Gagal memuat data. Silakan periksa jalur file.")
     st.stop()
 
@@ -109,7 +284,9 @@ with st.expander("ℹ️ About this Dashboard"):
     2. **Perilaku Pelanggan**: Analisis RFM dan segmentasi pelanggan.
     3. **Metode Pembayaran**: Distribusi metode pembayaran yang digunakan pelanggan.
     4. **Performa Pengiriman**: Analisis ketepatan waktu pengiriman pesanan.
-    5. **Analisis Geografis**: Distribusi pelanggan berdasarkan lokasi geografis.
+    5. **Ulasan Pelanggan**: Distribusi skor ulasan dan hubungannya dengan keterlambatan pengiriman.
+    6. **Performa Penjual**: Peringkat penjual berdasarkan pendapatan, pesanan, ulasan, dan keterlambatan.
+    7. **Analisis Geografis**: Distribusi pelanggan berdasarkan lokasi geografis.
     
     Analisis lengkap tersedia dalam notebook.ipynb yang menyertai dashboard ini.
     """)
@@ -118,29 +295,23 @@ with st.expander("ℹ️ About this Dashboard"):
 st.sidebar.title("📊 Filter Dashboard")
 
 # Setup for date filters
-min_date = data['orders']['order_purchase_timestamp'].min()
-max_date = data['orders']['order_purchase_timestamp'].max()
+if not USE_TABLES:
+    filter_options = load_filter_options(data, data_version)
+    min_date, max_date = filter_options['min_date'], filter_options['max_date']
+else:
+    min_date = data['orders']['order_purchase_timestamp'].min()
+    max_date = data['orders']['order_purchase_timestamp'].max()
 
 # Filter date range
 with st.sidebar.expander("🗓️ Tanggal", expanded=True):
     # Option to choose preset periods or custom
     date_option = st.radio(
         "Pilih Rentang Waktu:",
-        ["Semua Data", "Tahun Terakhir", "6 Bulan Terakhir", "3 Bulan Terakhir", "Kustom"]
+        list(analytics.DATE_PRESETS) + ["Kustom"]
     )
     
-    if date_option == "Semua Data":
-        start_date = min_date
-        end_date = max_date
-    elif date_option == "Tahun Terakhir":
-        start_date = max_date - timedelta(days=365)
-        end_date = max_date
-    elif date_option == "6 Bulan Terakhir":
-        start_date = max_date - timedelta(days=180)
-        end_date = max_date
-    elif date_option == "3 Bulan Terakhir":
-        start_date = max_date - timedelta(days=90)
-        end_date = max_date
+    if date_option in analytics.DATE_PRESETS:
+        start_date, end_date = analytics.preset_range(date_option, min_date, max_date)
     else:  # Custom
         col1, col2 = st.columns(2)
         with col1:
@@ -154,7 +325,9 @@ with st.sidebar.expander("🗓️ Tanggal", expanded=True):
 # Filter kategori produk
 with st.sidebar.expander("🏷️ Kategori Produk", expanded=True):
     # Check if translated categories are available
-    if 'product_category_name_english' in data['products'].columns:
+    if not USE_TABLES:
+        categories = ['All Categories'] + filter_options['categories']
+    elif 'product_category_name_english' in data['products'].columns:
         categories = ['All Categories'] + sorted(data['products']['product_category_name_english'].dropna().unique().tolist())
     else:
         categories = ['All Categories'] + sorted(data['products']['product_category_name'].dropna().unique().tolist())
@@ -166,51 +339,65 @@ with st.sidebar.expander("🏷️ Kategori Produk", expanded=True):
 
 # Filter negara bagian untuk analisis geografis
 with st.sidebar.expander("🌎 Lokasi Geografis", expanded=True):
-    states = ['All States'] + sorted(data['customers']['customer_state'].unique().tolist())
+    if not USE_TABLES:
+        states = ['All States'] + filter_options['states']
+    else:
+        states = ['All States'] + sorted(data['customers']['customer_state'].unique().tolist())
     selected_state = st.selectbox("Pilih Negara Bagian:", states)
     
     if selected_state == 'All States':
         selected_state = None
 
-# ---- Tab layout untuk berbagai analisis ----
-tab1, tab2, tab3, tab4, tab5 = st.tabs([
-    "📊 Tren Penjualan", 
-    "👥 Analisis Pelanggan", 
-    "💳 Metode Pembayaran", 
-    "🚚 Performa Pengiriman",
-    "🌎 Analisis Geografis"
-])
+# Hitungan unik eksak (nunique) atau perkiraan HyperLogLog dari sketsa yang bisa digabung (olist/sketch.py)
+approximate = False
+if USE_TABLES:
+    with st.sidebar.expander("🔢 Hitungan Unik", expanded=False):
+        approximate = st.toggle(
+            "Perkiraan (HyperLogLog)",
+            value=APPROX_DISTINCT,
+            key='approx_distinct',
+            help=f"Pesanan dan pelanggan unik dari sketsa per bulan, kategori, dan negara bagian; "
+                 f"galat standar ±{sketch.STANDARD_ERROR * 100:.1f}%."
+        )
+
+# Kombinasi filter dicatat untuk dipilih `python -m olist.results warm` setelah data diperbarui
+if RESULT_CACHE and USE_TABLES:
+    results.record_filters(date_option, start_date, end_date, selected_category, selected_state)
+
+# ---- Bagian-bagian analisis; setiap bagian adalah fungsi yang hanya dijalankan saat ditampilkan ----
+
+# Serialisasi dan pengiriman grafik Plotly tercatat sebagai tahap tersendiri saat instrumentasi aktif
+plotly_chart = instrument.instrumented('plotly_chart')(st.plotly_chart)
+
+# Figure Plotly dibangun dan diserialisasi sekali per status filter; `key` harus memuat semua input
+# grafik (filter, pilihan widget, dan versi data). Cache hit melewati Plotly Express dan menghasilkan
+# JSON yang identik sehingga Streamlit mengirimnya sebagai referensi hash (lihat olist/charts.py).
+@instrument.instrumented('figure')
+@st.cache_data(max_entries=256)
+def figure_json(chart, key, _build):
+    return charts.figure_json(_build())
+
+def show_chart(chart, key, build):
+    plotly_chart(charts.figure_from_json(figure_json(chart, key, build)), use_container_width=True)
 
 # ----- Tab 1: Tren Penjualan -----
-with tab1:
+def sales_section():
     st.header("📊 Analisis Tren Penjualan")
     
-    # Filter orders berdasarkan tanggal
-    filtered_orders = data['orders'][(data['orders']['order_purchase_timestamp'] >= start_date) & 
-                                (data['orders']['order_purchase_timestamp'] <= end_date)]
-    
-    # Gabungkan dengan items
-    filtered_items = pd.merge(
-        filtered_orders[['order_id']],
-        data['order_items'],
-        on='order_id',
-        how='inner'
-    )
-    
-    # Filter berdasarkan kategori jika ditentukan
-    if selected_category:
-        product_ids = data['products'][data['products']['product_category_name_english'] == selected_category]['product_id'].unique()
-        filtered_items = filtered_items[filtered_items['product_id'].isin(product_ids)]
+    sales_summary, problems = load_sales_summary(data, start_date, end_date, selected_category,
+                                                 data_version)
+    if problems:
+        st.warning("Hasil kubus berbeda dengan perhitungan mentah: " + "; ".join(problems))
     
     # Metrik utama dalam 3 kolom
     col1, col2, col3 = st.columns(3)
     
     with col1:
-        total_orders = filtered_items['order_id'].nunique()
+        total_orders = sales_summary['total_orders']
         st.metric("Total Pesanan", f"{total_orders:,}")
     
     with col2:
-        total_sales = filtered_items['price'].sum()
+        total_sales = sales_summary['total_sales']
         st.metric("Total Penjualan", f"R$ {total_sales:,.2f}")
     
     with col3:
@@ -220,63 +407,137 @@ with tab1:
     # Grafik tren penjualan dari waktu ke waktu
     st.subheader("Tren Penjualan dari Waktu ke Waktu")
     
-    # Menggabungkan data pesanan dengan waktu
-    sales_over_time = pd.merge(
-        filtered_orders[['order_id', 'order_purchase_timestamp']],
-        filtered_items[['order_id', 'price']],
-        on='order_id',
-        how='inner'
-    )
-    
     # Agregasi penjualan per bulan
-    sales_over_time['month'] = sales_over_time['order_purchase_timestamp'].dt.to_period('M')
-    monthly_sales = sales_over_time.groupby(sales_over_time['month'].astype(str))['price'].sum().reset_index()
+    monthly_sales = sales_summary['monthly_sales']
+    chart_key = (start_date, end_date, selected_category, data_version)
     
-    # Plotting
-    fig = px.line(
-        monthly_sales, 
-        x='month', 
+    # Plotting (deret panjang diturunkan menjadi paling banyak charts.MAX_POINTS titik)
+    show_chart('monthly_sales', chart_key, lambda: px.line(
+        charts.downsample(monthly_sales, 'price'),
+        x='month',
         y='price',
         title='Tren Penjualan Bulanan',
         labels={'month': 'Bulan', 'price': 'Total Penjualan (R$)'}
-    )
-    
-    st.plotly_chart(fig, use_container_width=True)
+    ))
     
     # Top kategori berdasarkan penjualan
     st.subheader("Top Kategori Produk Berdasarkan Penjualan")
     
-    # Menggabungkan data item dengan produk
-    items_with_categories = pd.merge(
-        filtered_items,
-        data['products'][['product_id', 'product_category_name', 'product_category_name_english']],
-        on='product_id',
-        how='inner'
-    )
-    
-    # Agregasi berdasarkan kategori
-    cat_column = 'product_category_name_english' if 'product_category_name_english' in items_with_categories.columns else 'product_category_name'
-    category_sales = items_with_categories.groupby(cat_column).agg({
-        'price': 'sum',
-        'order_id': 'nunique'
-    }).reset_index()
+    # Agregasi berdasarkan kategori; dengan filter negara bagian, peringkat diambil dari baris
+    # negara bagian itu pada matriks kategori x negara bagian (olist/basket.py)
+    cat_column = cube.CATEGORY_COLUMN
+    category_sales = sales_summary['category_sales']
+    title = 'Top 10 Kategori Berdasarkan Penjualan'
+    market = None
+    if USE_TABLES:
+        market = load_market_basket(data, start_date, end_date, selected_category, selected_state, data_version)
+        if selected_state:
+            category_sales = market['ranking']
+            title = f'Top 10 Kategori Berdasarkan Penjualan di {selected_state}'
     
     # Sorting dan mengambil top 10
     top_categories = category_sales.sort_values('price', ascending=False).head(10)
     
     # Plotting
-    fig = px.bar(
+    top_key = (start_date, end_date, selected_category, selected_state, data_version)
+    show_chart('top_categories', top_key, lambda: px.bar(
         top_categories,
         x=cat_column,
         y='price',
-        title='Top 10 Kategori Berdasarkan Penjualan',
+        title=title,
         labels={cat_column: 'Kategori', 'price': 'Total Penjualan (R$)'}
-    )
+    ))
+    
+    # Kategori dan negara bagian yang over-index, serta kategori yang dibeli bersama
+    st.subheader("Kategori per Negara Bagian")
+    
+    if market is None:
+        st.info(f"Analisis kategori per negara bagian memakai store Parquet dan belum tersedia di backend "
+                f"{QUERY_BACKEND}.")
+        return
+    
+    st.caption(f"Indeks over-index = porsi pendapatan di negara bagian dibagi porsi nasional "
+               f"(> 1 berarti lebih laku dari rata-rata). Hanya kombinasi dengan minimal "
+               f"{basket.OVER_INDEX_MIN_ORDERS} pesanan yang ditampilkan.")
+    index_labels = {'revenue': 'Pendapatan (R$)', 'orders': 'Jumlah Pesanan', 'share': 'Porsi (%)',
+                    'index': 'Indeks'}
+    col1, col2 = st.columns(2)
     
-    st.plotly_chart(fig, use_container_width=True)
+    with col1:
+        focus = market['focus_category']
+        state_index = market['state_index']
+        if state_index is not None and len(state_index) > 0:
+            show_chart('state_over_index', top_key, lambda: px.bar(
+                state_index.head(15),
+                x='customer_state',
+                y='index',
+                title=f'Negara Bagian di mana {focus} Over-index',
+                labels={'customer_state': 'Negara Bagian', 'index': 'Indeks'}
+            ).add_hline(y=1, line_dash='dash', line_color='gray'))
+        else:
+            st.info("Tidak ada negara bagian dengan pesanan yang cukup untuk kategori ini.")
+    
+    with col2:
+        category_index = market['category_index']
+        if category_index is None:
+            st.info("Pilih negara bagian di sidebar untuk melihat kategori yang over-index di negara bagian itu.")
+        elif len(category_index) > 0:
+            st.markdown(f"**Kategori yang Over-index di {selected_state}**")
+            st.dataframe(category_index.head(10).set_index(cat_column).rename(columns=index_labels).round(2),
+                         use_container_width=True)
+        else:
+            st.info("Tidak ada kategori dengan pesanan yang cukup di negara bagian ini.")
+    
+    st.subheader("Kategori yang Sering Dibeli Bersama")
+    pairs = market['copurchase']
+    if len(pairs) > 0:
+        st.dataframe(pairs.head(15).rename(columns={'category_a': 'Kategori A', 'category_b': 'Kategori B',
+                                                    'orders': 'Jumlah Pesanan', 'lift': 'Lift'}).round(2),
+                     hide_index=True, use_container_width=True)
+        st.caption("Lift > 1: kedua kategori lebih sering muncul dalam satu pesanan daripada jika dibeli "
+                   "secara independen.")
+    else:
+        st.info("Tidak ada pesanan dengan lebih dari satu kategori dalam filter yang dipilih.")
+    
+    # Pesanan dan pelanggan unik untuk filter kategori dan negara bagian (eksak atau perkiraan HyperLogLog)
+    st.subheader("Pesanan dan Pelanggan Unik")
+    distinct = load_distinct_counts(data, start_date, end_date, selected_category, selected_state, approximate,
+                                    data_version)
+    prefix = "≈ " if approximate else ""
+    col1, col2, col3 = st.columns(3)
+    
+    with col1:
+        st.metric("Pesanan Unik", f"{prefix}{distinct['orders']:,}")
+    
+    with col2:
+        st.metric("Pelanggan Unik", f"{prefix}{distinct['customers']:,}")
+    
+    with col3:
+        orders_per_customer = distinct['orders'] / distinct['customers'] if distinct['customers'] > 0 else 0
+        st.metric("Pesanan per Pelanggan", f"{prefix}{orders_per_customer:.2f}")
+    
+    if approximate:
+        st.caption(f"Perkiraan dari sketsa HyperLogLog per (bulan, kategori, negara bagian), "
+                   f"galat standar ±{sketch.STANDARD_ERROR * 100:.1f}%.")
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        show_chart('distinct_states', top_key + (approximate,), lambda: px.bar(
+            distinct['by_state'].head(15),
+            x='customer_state',
+            y='customers',
+            title='Pelanggan Unik per Negara Bagian',
+            labels={'customer_state': 'Negara Bagian', 'customers': 'Pelanggan Unik'}
+        ))
+    
+    with col2:
+        st.markdown("**Pesanan dan Pelanggan Unik per Kategori**")
+        st.dataframe(distinct['by_category'].head(10).set_index(cat_column).rename(
+            columns={'orders': 'Pesanan Unik', 'customers': 'Pelanggan Unik'}), use_container_width=True)
 
 # ----- Tab 2: Analisis Pelanggan -----
-with tab2:
+def customer_section():
     st.header("👥 Analisis Segmentasi Pelanggan")
     
     st.info("""
@@ -288,39 +549,10 @@ with tab2:
     Analisis lengkap tersedia di notebook.ipynb.
     """)
     
-    # Filter orders berdasarkan tanggal untuk RFM
-    filtered_orders_rfm = data['orders'][
-        (data['orders']['order_purchase_timestamp'] >= start_date) & 
-        (data['orders']['order_purchase_timestamp'] <= end_date) &
-        (data['orders']['order_status'] == 'delivered')
-    ]
-    
-    # Gabungkan dengan pembayaran
-    orders_with_payments = pd.merge(
-        filtered_orders_rfm[['order_id', 'customer_id', 'order_purchase_timestamp']],
-        data['order_payments'][['order_id', 'payment_value']],
-        on='order_id',
-        how='inner'
-    )
+    # Metrik dan skor RFM per pelanggan dari mesin RFM (tersimpan di cache per rentang tanggal)
+    rfm = load_rfm(data, start_date, end_date, data_version)
     
-    if len(orders_with_payments) > 0:
-        # Hitung RFM metrics
-        # Recency
-        recency_df = orders_with_payments.groupby('customer_id')['order_purchase_timestamp'].max().reset_index()
-        recency_df['recency'] = (end_date - recency_df['order_purchase_timestamp']).dt.days
-        
-        # Frequency
-        frequency_df = orders_with_payments.groupby('customer_id')['order_id'].nunique().reset_index()
-        frequency_df.columns = ['customer_id', 'frequency']
-        
-        # Monetary
-        monetary_df = orders_with_payments.groupby('customer_id')['payment_value'].sum().reset_index()
-        monetary_df.columns = ['customer_id', 'monetary']
-        
-        # Combine
-        rfm = pd.merge(recency_df[['customer_id', 'recency']], frequency_df, on='customer_id')
-        rfm = pd.merge(rfm, monetary_df, on='customer_id')
-        
+    if len(rfm) > 0:
         # Display metrics
         col1, col2, col3 = st.columns(3)
         
@@ -336,55 +568,11 @@ with tab2:
             avg_monetary = rfm['monetary'].mean()
             st.metric("Rata-rata Monetary", f"R$ {avg_monetary:.2f}")
         
-        # Create segments - Penanganan khusus untuk recency
-        if rfm['recency'].nunique() < 5:
-            # Jika tidak cukup variasi, tetapkan nilai tengah
-            rfm['r_score'] = 3
-        else:
-            try:
-                rfm['r_score'] = pd.qcut(rfm['recency'], q=5, labels=[5, 4, 3, 2, 1], duplicates='drop')
-            except ValueError:
-                rfm['r_score'] = pd.cut(rfm['recency'], bins=5, labels=[5, 4, 3, 2, 1], duplicates='drop')
-        
-        # Penanganan untuk frequency
-        if rfm['frequency'].nunique() < 5:
-            rfm['f_score'] = 3
-        else:
-            try:
-                rfm['f_score'] = pd.qcut(rfm['frequency'].rank(method='first'), q=5, labels=[1, 2, 3, 4, 5], duplicates='drop')
-            except ValueError:
-                rfm['f_score'] = pd.cut(rfm['frequency'], bins=5, labels=[1, 2, 3, 4, 5], duplicates='drop')
-        
-        # Penanganan untuk monetary
-        if rfm['monetary'].nunique() < 5:
-            rfm['m_score'] = 3
-        else:
-            try:
-                rfm['m_score'] = pd.qcut(rfm['monetary'].rank(method='first'), q=5, labels=[1, 2, 3, 4, 5], duplicates='drop')
-            except ValueError:
-                rfm['m_score'] = pd.cut(rfm['monetary'], bins=5, labels=[1, 2, 3, 4, 5], duplicates='drop')
-        
-        # Convert score columns to numeric
-        for col in ['r_score', 'f_score', 'm_score']:
-            rfm[col] = pd.to_numeric(rfm[col], errors='coerce')
-        
-        # Calculate overall RFM score
-        rfm['rfm_score'] = rfm['r_score'] + rfm['f_score'] + rfm['m_score']
-        
-        # Create segment labels
-        rfm['segment'] = pd.cut(
-            rfm['rfm_score'],
-            bins=[0, 4, 8, 12, 15],
-            labels=['Bronze', 'Silver', 'Gold', 'Platinum'],
-            include_lowest=True
-        )
-        
         # Visualize segment distribution
-        segment_dist = rfm['segment'].value_counts().reset_index()
-        segment_dist.columns = ['segment', 'count']
+        segment_dist = analytics.segment_distribution(rfm)
         
-        fig = px.pie(
-            segment_dist, 
+        show_chart('segments', (start_date, end_date, data_version), lambda: px.pie(
+            segment_dist,
             values='count', 
             names='segment',
             title='Distribusi Segmen Pelanggan',
@@ -395,9 +583,7 @@ with tab2:
                 'Gold': '#FFD700',
                 'Platinum': '#E5E4E2'
             }
-        )
-        
-        st.plotly_chart(fig, use_container_width=True)
+        ))
         
         # Add explanation of segments
         st.subheader("Interpretasi Segmen Pelanggan")
@@ -419,53 +605,85 @@ with tab2:
         })
         
         st.table(segments_table)
+        
+        # Klaster pelanggan K-Means atas fitur RFM (olist/cluster.py)
+        st.subheader("Klaster Pelanggan (K-Means)")
+        n_clusters = st.slider("Jumlah klaster:", min_value=2, max_value=8, value=cluster.N_CLUSTERS,
+                               key='n_clusters')
+        
+        # Pusat klaster terakhir per k disimpan di sesi sebagai warm start saat rentang tanggal berubah
+        cluster_centers = st.session_state.setdefault('cluster_centers', {})
+        cluster_profiles, centers, _ = load_clusters(data, start_date, end_date, n_clusters, data_version,
+                                                     _init=cluster_centers.get(n_clusters))
+        cluster_centers[n_clusters] = centers
+        
+        col1, col2 = st.columns(2)
+        chart_key = (start_date, end_date, n_clusters, data_version)
+        
+        with col1:
+            show_chart('cluster_sizes', chart_key, lambda: px.bar(
+                cluster_profiles,
+                x='cluster',
+                y='customer_count',
+                title='Jumlah Pelanggan per Klaster',
+                labels={'cluster': 'Klaster', 'customer_count': 'Jumlah Pelanggan'},
+                color='cluster',
+                color_discrete_sequence=px.colors.qualitative.Set2
+            ).update_layout(showlegend=False))
+        
+        with col2:
+            def cluster_radar():
+                radar = cluster.radar_profiles(cluster_profiles)
+                fig = go.Figure()
+                for _, row in radar.iterrows():
+                    fig.add_trace(go.Scatterpolar(
+                        r=[row['recency'], row['frequency'], row['monetary'], row['recency']],
+                        theta=['Recency', 'Frequency', 'Monetary', 'Recency'],
+                        fill='toself',
+                        name=row['cluster']
+                    ))
+                fig.update_layout(
+                    title='Profil Klaster Pelanggan',
+                    polar=dict(radialaxis=dict(visible=True, range=[0, 1]))
+                )
+                return fig
+            
+            show_chart('cluster_radar', chart_key, cluster_radar)
+        
+        st.dataframe(cluster_profiles.rename(columns={
+            'cluster': 'Klaster',
+            'customer_count': 'Jumlah Pelanggan',
+            'recency': 'Rata-rata Recency (hari)',
+            'frequency': 'Rata-rata Frequency',
+            'monetary': 'Rata-rata Monetary (R$)',
+            'rfm_score': 'Rata-rata Skor RFM'
+        }).round(2), hide_index=True, use_container_width=True)
     else:
         st.warning("Tidak ada data yang cukup untuk analisis RFM dalam rentang waktu yang dipilih.")
 
 # ----- Tab 3: Metode Pembayaran -----
-with tab3:
+def payment_section():
     st.header("💳 Analisis Metode Pembayaran")
     
-    # Filter orders berdasarkan rentang tanggal
-    filtered_orders_payment = data['orders'][(data['orders']['order_purchase_timestamp'] >= start_date) & 
-                                         (data['orders']['order_purchase_timestamp'] <= end_date)]
-    
-    # Gabungkan dengan data pembayaran
-    payment_data = pd.merge(
-        filtered_orders_payment[['order_id']],
-        data['order_payments'],
-        on='order_id',
-        how='inner'
-    )
-    
-    # Agregasi berdasarkan jenis pembayaran
-    payment_summary = payment_data.groupby('payment_type').agg({
-        'payment_value': 'sum',
-        'order_id': 'nunique'
-    }).reset_index()
-    
-    payment_summary.columns = ['payment_type', 'total_value', 'order_count']
-    payment_summary['percentage'] = payment_summary['total_value'] / payment_summary['total_value'].sum() * 100
+    payment_summary, installment_counts, installment_values = load_payment_summary(
+        data, start_date, end_date, data_version)
     
     # Visualisasi distribusi metode pembayaran
     col1, col2 = st.columns([2, 1])
+    chart_key = (start_date, end_date, data_version)
     
     with col1:
-        fig = px.pie(
-            payment_summary, 
-            values='total_value', 
+        show_chart('payment_types', chart_key, lambda: px.pie(
+            payment_summary,
+            values='total_value',
             names='payment_type',
             title='Distribusi Metode Pembayaran',
             hole=0.4
-        )
-        
-        fig.update_traces(
-            textposition='inside', 
+        ).update_traces(
+            textposition='inside',
             textinfo='percent+label',
             hovertemplate='<b>%{label}</b><br>Value: R$%{value:,.2f}<br>Percentage: %{percent}<extra></extra>'
-        )
-        
-        st.plotly_chart(fig, use_container_width=True)
+        ))
     
     with col2:
         # Statistik pembayaran
@@ -483,80 +701,38 @@ with tab3:
     # Analisis cicilan pembayaran kartu kredit
     st.subheader("Analisis Pembayaran Cicilan")
     
-    # Filter hanya metode pembayaran credit_card
-    credit_data = payment_data[payment_data['payment_type'] == 'credit_card']
-    
-    if len(credit_data) > 0:
+    if installment_counts is not None:
         # Distribusi jumlah cicilan
-        installment_counts = credit_data['payment_installments'].value_counts().reset_index()
-        installment_counts.columns = ['installments', 'count']
-        installment_counts = installment_counts.sort_values('installments')
-        
-        fig = px.bar(
+        show_chart('installment_counts', chart_key, lambda: px.bar(
             installment_counts,
             x='installments',
             y='count',
             title='Distribusi Jumlah Cicilan (Kartu Kredit)',
             labels={'installments': 'Jumlah Cicilan', 'count': 'Jumlah Transaksi'}
-        )
-        
-        st.plotly_chart(fig, use_container_width=True)
+        ))
         
         # Rata-rata nilai pembelian berdasarkan jumlah cicilan
-        installment_values = credit_data.groupby('payment_installments')['payment_value'].mean().reset_index()
-        installment_values.columns = ['installments', 'avg_value']
-        
-        fig = px.line(
+        show_chart('installment_values', chart_key, lambda: px.line(
             installment_values,
             x='installments',
             y='avg_value',
             title='Rata-rata Nilai Pembelian Berdasarkan Jumlah Cicilan',
             labels={'installments': 'Jumlah Cicilan', 'avg_value': 'Rata-rata Nilai (R$)'},
             markers=True
-        )
-        
-        st.plotly_chart(fig, use_container_width=True)
+        ))
     else:
         st.info("Tidak ada data pembayaran kartu kredit dalam periode yang dipilih.")
 
 # ----- Tab 4: Performa Pengiriman -----
-with tab4:
+def delivery_section():
     st.header("🚚 Analisis Performa Pengiriman")
     
-    # Filter orders berdasarkan rentang tanggal dan status terkirim
-    delivery_data = data['orders'][
-        (data['orders']['order_purchase_timestamp'] >= start_date) & 
-        (data['orders']['order_purchase_timestamp'] <= end_date) &
-        (data['orders']['order_status'] == 'delivered')
-    ].copy()
-    
-    # Filter out rows with missing delivery dates
-    delivery_data = delivery_data.dropna(subset=['order_delivered_customer_date', 'order_estimated_delivery_date'])
+    delivery_data = load_delivery_data(data, start_date, end_date, data_version)
     
     if len(delivery_data) > 0:
-        # Hitung selisih waktu antara estimasi dan aktual pengiriman
-        delivery_data['delivery_difference'] = (delivery_data['order_delivered_customer_date'] - 
-                                               delivery_data['order_estimated_delivery_date']).dt.days
-        
-        # Definisi kategori ketepatan waktu
-        delivery_data['delivery_status'] = pd.cut(
-            delivery_data['delivery_difference'],
-            bins=[-float('inf'), -3, -1, 0, 2, float('inf')],
-            labels=['Very Early', 'Early', 'On Time', 'Late', 'Very Late']
-        )
-        
-        # Agregasi berdasarkan status pengiriman
-        delivery_summary = delivery_data['delivery_status'].value_counts().reset_index()
-        delivery_summary.columns = ['delivery_status', 'count']
-        
-        # Urutkan berdasarkan kategori
-        status_order = ['Very Early', 'Early', 'On Time', 'Late', 'Very Late']
-        delivery_summary['delivery_status'] = pd.Categorical(
-            delivery_summary['delivery_status'], 
-            categories=status_order, 
-            ordered=True
-        )
-        delivery_summary = delivery_summary.sort_values('delivery_status')
+        # Jumlah pesanan per status pengiriman (terurut) dan metrik rata-rata
+        delivery_metrics = analytics.delivery_summary(delivery_data)
+        delivery_summary = delivery_metrics['status_counts']
         
         # Warna untuk setiap kategori
         color_map = {
@@ -568,93 +744,318 @@ with tab4:
         }
         
         # Visualisasi distribusi status pengiriman
-        fig = px.bar(
-            delivery_summary, 
-            x='delivery_status', 
+        chart_key = (start_date, end_date, data_version)
+        show_chart('delivery_status', chart_key, lambda: px.bar(
+            delivery_summary,
+            x='delivery_status',
             y='count',
             title='Analisis Performa Pengiriman',
             color='delivery_status',
             color_discrete_map=color_map,
             labels={'delivery_status': 'Status Pengiriman', 'count': 'Jumlah Pesanan'}
-        )
-        
-        fig.update_layout(
+        ).update_layout(
             xaxis_title='Status Pengiriman',
             yaxis_title='Jumlah Pesanan'
-        )
-        
-        st.plotly_chart(fig, use_container_width=True)
+        ))
         
         # Metrik pengiriman
         col1, col2, col3 = st.columns(3)
         
         with col1:
-            # Hitung waktu pengiriman actual
-            delivery_data['actual_delivery_days'] = (delivery_data['order_delivered_customer_date'] - 
-                                                   delivery_data['order_purchase_timestamp']).dt.days
-            avg_delivery_time = delivery_data['actual_delivery_days'].mean()
+            avg_delivery_time = delivery_metrics['avg_delivery_days']
             st.metric("Rata-rata Waktu Pengiriman", f"{avg_delivery_time:.1f} hari")
         
         with col2:
-            # Hitung waktu pengiriman estimasi
-            delivery_data['estimated_delivery_days'] = (delivery_data['order_estimated_delivery_date'] - 
-                                                      delivery_data['order_purchase_timestamp']).dt.days
-            avg_estimated_time = delivery_data['estimated_delivery_days'].mean()
+            avg_estimated_time = delivery_metrics['avg_estimated_days']
             st.metric("Rata-rata Estimasi Pengiriman", f"{avg_estimated_time:.1f} hari")
         
         with col3:
             # Hitung persentase tepat waktu
-            on_time_percentage = (delivery_data['delivery_difference'] <= 0).mean() * 100
+            on_time_percentage = delivery_metrics['on_time_percentage']
             st.metric("Persentase Tepat Waktu", f"{on_time_percentage:.1f}%")
         
         # Distribusi waktu pengiriman
         st.subheader("Distribusi Waktu Pengiriman")
         
-        fig = px.histogram(
-            delivery_data,
-            x='actual_delivery_days',
-            nbins=20,
+        # Histogram dibinning di server: hanya jumlah per bin yang dikirim, bukan setiap pesanan
+        show_chart('delivery_days', chart_key, lambda: px.bar(
+            charts.histogram_bins(delivery_data['actual_delivery_days']),
+            x='bin_center',
+            y='count',
+            hover_data=['bin_start', 'bin_end'],
             title='Distribusi Waktu Pengiriman (Hari)',
-            labels={'actual_delivery_days': 'Waktu Pengiriman (Hari)'}
+            labels={'bin_center': 'Waktu Pengiriman (Hari)', 'bin_start': 'Dari (Hari)',
+                    'bin_end': 'Sampai (Hari)'}
+        ).update_layout(bargap=0))
+        
+        # SLA pengiriman per negara bagian pelanggan dan per penjual
+        state_sla, seller_sla = load_delivery_sla(data, start_date, end_date, data_version)
+        sla_columns = {
+            'orders': 'Jumlah Pesanan',
+            'late_rate': 'Terlambat (%)',
+            'avg_delivery_days': 'Rata-rata (Hari)',
+            'p50_delivery_days': 'P50 (Hari)',
+            'p90_delivery_days': 'P90 (Hari)',
+            'p95_delivery_days': 'P95 (Hari)',
+        }
+        
+        st.subheader("SLA Pengiriman per Negara Bagian")
+        
+        show_chart('state_sla', chart_key, lambda: px.bar(
+            state_sla,
+            x='customer_state',
+            y='late_rate',
+            color='p90_delivery_days',
+            color_continuous_scale='Reds',
+            title='Persentase Pesanan Terlambat per Negara Bagian',
+            labels={'customer_state': 'Negara Bagian', 'late_rate': 'Terlambat (%)',
+                    'p90_delivery_days': 'P90 (Hari)'}
+        ))
+        
+        st.dataframe(
+            state_sla.set_index('customer_state')[list(sla_columns)].rename(columns=sla_columns).round(1),
+            use_container_width=True
         )
         
-        st.plotly_chart(fig, use_container_width=True)
+        st.subheader("Penjual dengan Keterlambatan Tertinggi")
+        st.caption(f"Penjual dengan minimal {analytics.SELLER_SLA_MIN_ORDERS} pesanan terkirim "
+                   "dalam periode yang dipilih.")
+        
+        if len(seller_sla) > 0:
+            st.dataframe(
+                seller_sla.head(20).set_index('seller_id')[list(sla_columns)].rename(columns=sla_columns).round(1),
+                use_container_width=True
+            )
+        else:
+            st.info("Belum ada penjual dengan pesanan yang cukup dalam periode yang dipilih.")
     else:
         st.info("Tidak ada data pengiriman yang cukup untuk analisis dalam periode yang dipilih.")
 
-# ----- Tab 5: Analisis Geografis -----
-with tab5:
+# ----- Tab 5: Ulasan Pelanggan -----
+def review_section():
+    st.header("⭐ Analisis Ulasan Pelanggan")
+    
+    if USE_SQL:
+        st.info("Analisis ulasan memakai store Parquet dan belum tersedia di backend SQL.")
+        return
+    
+    # Semua agregat ulasan dari satu potongan tabel review_facts (olist/reviews.py)
+    reviews = load_review_summary(data, start_date, end_date, data_version)
+    review_metrics = reviews['metrics']
+    
+    if review_metrics['reviews'] == 0:
+        st.warning("Tidak ada ulasan dalam rentang waktu yang dipilih.")
+        return
+    
+    col1, col2, col3, col4 = st.columns(4)
+    
+    with col1:
+        st.metric("Rata-rata Skor", f"{review_metrics['avg_score']:.2f}")
+    
+    with col2:
+        st.metric("Skor Rendah (1-2)", f"{review_metrics['low_score_rate']:.1f}%")
+    
+    with col3:
+        st.metric("Median Waktu Respons", f"{review_metrics['p50_response_hours']:.0f} jam")
+    
+    with col4:
+        st.metric("P90 Waktu Respons", f"{review_metrics['p90_response_hours']:.0f} jam")
+    
+    # Distribusi skor per bulan pembelian
+    st.subheader("Distribusi Skor Ulasan dari Waktu ke Waktu")
+    
+    chart_key = (start_date, end_date, data_version)
+    show_chart('review_months', chart_key, lambda: px.bar(
+        reviews['monthly'],
+        x='month',
+        y='count',
+        color=reviews['monthly']['review_score'].astype(str),
+        title='Jumlah Ulasan per Skor per Bulan',
+        labels={'month': 'Bulan', 'count': 'Jumlah Ulasan', 'color': 'Skor'},
+        color_discrete_map={'1': 'red', '2': 'orange', '3': 'gold', '4': 'lightgreen', '5': 'darkgreen'},
+        category_orders={'color': ['1', '2', '3', '4', '5']}
+    ))
+    
+    # Hubungan keterlambatan pengiriman (selisih hari seperti tab Pengiriman) dengan skor
+    st.subheader("Skor Ulasan berdasarkan Status Pengiriman")
+    
+    by_delivery = reviews['by_delivery']
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        show_chart('review_delivery_scores', chart_key, lambda: px.bar(
+            by_delivery,
+            x='delivery_status',
+            y='avg_score',
+            title='Rata-rata Skor per Status Pengiriman',
+            labels={'delivery_status': 'Status Pengiriman', 'avg_score': 'Rata-rata Skor'},
+            color='avg_score',
+            color_continuous_scale='RdYlGn'
+        ))
+    
+    with col2:
+        show_chart('review_delivery_low', chart_key, lambda: px.bar(
+            by_delivery,
+            x='delivery_status',
+            y='low_score_rate',
+            title='Persentase Skor Rendah per Status Pengiriman',
+            labels={'delivery_status': 'Status Pengiriman', 'low_score_rate': 'Skor Rendah (%)'},
+            color='low_score_rate',
+            color_continuous_scale='Reds'
+        ))
+    
+    st.caption(f"Korelasi Pearson antara selisih hari pengiriman (aktual - estimasi) dan skor ulasan: "
+               f"**{review_metrics['late_correlation']:.2f}** (nilai negatif berarti makin terlambat, "
+               "makin rendah skornya).")
+    
+    score_columns = {
+        'reviews': 'Jumlah Ulasan',
+        'avg_score': 'Rata-rata Skor',
+        'low_score_rate': 'Skor Rendah (%)',
+    }
+    
+    # Skor per kategori produk dan per negara bagian pelanggan
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.subheader("Kategori dengan Skor Terendah")
+        st.dataframe(
+            reviews['by_category'].head(15).set_index('product_category_name_english')
+            .rename(columns=score_columns).round(2),
+            use_container_width=True
+        )
+    
+    with col2:
+        st.subheader("Skor per Negara Bagian")
+        st.dataframe(
+            reviews['by_state'].set_index('customer_state').rename(columns=score_columns).round(2),
+            use_container_width=True
+        )
+    
+    st.subheader("Penjual dengan Skor Terendah")
+    st.caption(f"Penjual dengan minimal {analytics.SELLER_MIN_REVIEWS} ulasan dalam periode yang dipilih.")
+    
+    if len(reviews['by_seller']) > 0:
+        st.dataframe(
+            reviews['by_seller'].head(20).set_index('seller_id').rename(columns=score_columns).round(2),
+            use_container_width=True
+        )
+    else:
+        st.info("Belum ada penjual dengan ulasan yang cukup dalam periode yang dipilih.")
+    
+    # Komentar ulasan per skor
+    st.subheader("Komentar Ulasan per Skor")
+    st.dataframe(
+        reviews['comments'].set_index('review_score').rename(columns={
+            'reviews': 'Jumlah Ulasan',
+            'comment_rate': 'Berkomentar (%)',
+            'avg_comment_length': 'Rata-rata Panjang Komentar (karakter)'
+        }).round(1),
+        use_container_width=True
+    )
+
+# ----- Tab 6: Performa Penjual -----
+def seller_section():
+    st.header("🏪 Analisis Performa Penjual")
+    
+    if USE_SQL:
+        st.info("Peringkat penjual memakai store Parquet dan belum tersedia di backend SQL.")
+        return
+    
+    # Ukuran per penjual dari seller_facts sesuai filter tanggal, kategori, dan negara bagian pelanggan
+    seller_stats = load_seller_stats(data, start_date, end_date, selected_category, selected_state, data_version)
+    
+    if len(seller_stats) == 0:
+        st.warning("Tidak ada penjualan dalam filter yang dipilih.")
+        return
+    
+    col1, col2, col3 = st.columns(3)
+    
+    with col1:
+        st.metric("Penjual Aktif", f"{len(seller_stats):,}")
+    
+    with col2:
+        st.metric("Median Pendapatan per Penjual", f"R$ {seller_stats['revenue'].median():,.2f}")
+    
+    with col3:
+        st.metric("Median Pesanan per Penjual", f"{seller_stats['orders'].median():.0f}")
+    
+    rank_metrics = {
+        'Pendapatan': 'revenue',
+        'Jumlah Pesanan': 'orders',
+        'Rata-rata Skor Ulasan': 'avg_review_score',
+        'Persentase Terlambat': 'late_rate',
+    }
+    
+    col1, col2, col3 = st.columns(3)
+    
+    with col1:
+        rank_label = st.selectbox("Urutkan berdasarkan:", list(rank_metrics), key='seller_rank_metric')
+        rank_metric = rank_metrics[rank_label]
+    
+    with col2:
+        page_size = st.selectbox("Penjual per halaman:", [10, 25, 50], index=1, key='seller_page_size')
+    
+    with col3:
+        reverse = st.checkbox("Terburuk lebih dulu", key='seller_rank_reverse')
+    
+    # Hanya halaman yang diminta yang diurutkan (seleksi parsial, lihat olist/sellers.py)
+    ranked = analytics.ranked_sellers(seller_stats, rank_metric)
+    n_pages = max((ranked + page_size - 1) // page_size, 1)
+    # Label memuat jumlah halaman sehingga halaman kembali ke 1 ketika filter mengubah jumlah penjual
+    page = st.number_input(f"Halaman (dari {n_pages}):", min_value=1, max_value=n_pages, step=1, key='seller_page')
+    leaderboard, _ = analytics.seller_leaderboard(seller_stats, data['sellers'], rank_metric, page - 1, page_size,
+                                                  reverse)
+    
+    if rank_metric in analytics.LEADERBOARD_MIN_COUNTS:
+        column, minimum = analytics.LEADERBOARD_MIN_COUNTS[rank_metric]
+        count_label = 'ulasan' if column == 'reviews' else 'pesanan terkirim'
+        st.caption(f"{ranked:,} penjual dengan minimal {minimum} {count_label} dalam filter yang dipilih.")
+    
+    if len(leaderboard) == 0:
+        st.info("Belum ada penjual dengan data yang cukup untuk metrik ini dalam filter yang dipilih.")
+        return
+    
+    chart_key = (start_date, end_date, selected_category, selected_state, rank_metric, page, page_size, reverse,
+                 data_version)
+    show_chart('seller_leaderboard', chart_key, lambda: px.bar(
+        leaderboard,
+        x='rank',
+        y=rank_metric,
+        hover_data=['seller_id', 'seller_city', 'seller_state'],
+        title=f'Peringkat Penjual berdasarkan {rank_label}',
+        labels={'rank': 'Peringkat', rank_metric: rank_label, 'seller_id': 'ID Penjual',
+                'seller_city': 'Kota', 'seller_state': 'Negara Bagian'},
+        color=rank_metric,
+        color_continuous_scale='Reds' if rank_metric == 'late_rate' else 'Blues'
+    ))
+    
+    st.dataframe(leaderboard.set_index('rank').rename(columns={
+        'seller_id': 'ID Penjual',
+        'revenue': 'Pendapatan (R$)',
+        'orders': 'Jumlah Pesanan',
+        'items': 'Jumlah Item',
+        'reviews': 'Jumlah Ulasan',
+        'avg_review_score': 'Rata-rata Skor',
+        'delivered_orders': 'Pesanan Terkirim',
+        'late_rate': 'Terlambat (%)',
+        'seller_city': 'Kota',
+        'seller_state': 'Negara Bagian'
+    }).round(2), use_container_width=True)
+
+# ----- Tab 7: Analisis Geografis -----
+def geography_section():
     st.header("🌎 Analisis Geografis")
     
-    # Distribusi pelanggan berdasarkan negara bagian
-    customer_states = data['customers']['customer_state'].value_counts().reset_index()
-    customer_states.columns = ['state', 'customer_count']
+    # Distribusi pelanggan berdasarkan negara bagian (hanya state terpilih jika ada)
+    customer_states = load_customer_states(data, selected_state, data_version)
     
-    # Filter berdasarkan state jika dipilih
-    if selected_state:
-        customer_states = customer_states[customer_states['state'] == selected_state]
-    
-    # Buat peta Brazil
-    brazil_map = folium.Map(location=[-14.235, -51.9253], zoom_start=4, tiles="CartoDB positron")
-    
-    # Tambahkan GeoJson dari Brazil
-    folium.Choropleth(
-        geo_data='https://raw.githubusercontent.com/codeforamerica/click_that_hood/master/public/data/brazil-states.geojson',
-        name='choropleth',
-        data=customer_states,
-        columns=['state', 'customer_count'],
-        key_on='feature.properties.sigla',
-        fill_color='YlOrRd',
-        fill_opacity=0.7,
-        line_opacity=0.2,
-        legend_name='Customer Count'
-    ).add_to(brazil_map)
-    
-    folium.LayerControl().add_to(brazil_map)
+    # Buat peta Brazil dari GeoJSON lokal (lihat olist/geo.py)
+    map_html = render_state_map(customer_states, selected_state, data_version, GEO_TOLERANCE)
     
     # Tampilkan peta
     st.subheader("Distribusi Pelanggan berdasarkan Negara Bagian")
-    folium_static(brazil_map)
+    components.html(map_html, width=700, height=geo.MAP_HEIGHT + 10)
     
     # Visualisasi jumlah pelanggan per negara bagian dengan grafik batang
     st.subheader("Jumlah Pelanggan per Negara Bagian")
@@ -663,34 +1064,213 @@ with tab5:
         # Sorting state berdasarkan jumlah pelanggan
         sorted_states = customer_states.sort_values('customer_count', ascending=False)
         
-        fig = px.bar(
+        show_chart('customer_states', (selected_state, data_version), lambda: px.bar(
             sorted_states,
             x='state',
             y='customer_count',
             title='Distribusi Pelanggan berdasarkan Negara Bagian',
             labels={'state': 'Negara Bagian', 'customer_count': 'Jumlah Pelanggan'},
             color='customer_count'
-        )
-        
-        fig.update_layout(xaxis={'categoryorder':'total descending'})
-        st.plotly_chart(fig, use_container_width=True)
+        ).update_layout(xaxis={'categoryorder':'total descending'}))
     else:
         # Jika state dipilih, tampilkan distribusi kota
-        city_counts = data['customers'][data['customers']['customer_state'] == selected_state]['customer_city'].value_counts().reset_index()
-        city_counts.columns = ['city', 'count']
-        top_cities = city_counts.head(10)
+        top_cities = load_top_cities(data, selected_state)
         
-        fig = px.bar(
+        show_chart('top_cities', (selected_state, data_version), lambda: px.bar(
             top_cities,
             x='city',
             y='count',
             title=f'Top 10 Kota di {selected_state} berdasarkan Jumlah Pelanggan',
             labels={'city': 'Kota', 'count': 'Jumlah Pelanggan'},
             color='count'
-        )
-        
-        fig.update_layout(xaxis={'categoryorder':'total descending'})
-        st.plotly_chart(fig, use_container_width=True)
+        ).update_layout(xaxis={'categoryorder':'total descending'}))
+    
+    # Jarak penjual-pelanggan per item dari tabel shipping_facts (olist/spatial.py)
+    st.subheader("Jarak Pengiriman dan Ongkos Kirim")
+    
+    if USE_SQL:
+        st.info("Analisis jarak pengiriman memakai store Parquet dan belum tersedia di backend SQL.")
+        return
+    
+    if 'shipping_facts' not in data:
+        st.info("Analisis jarak pengiriman membutuhkan `geolocation_dataset.csv` di folder data. Letakkan file "
+                "tersebut lalu jalankan `python -m olist.store build` untuk mengaktifkannya.")
+        return
+    
+    distance_profile, state_shipping, shipping_metrics = load_shipping_summary(
+        data, start_date, end_date, selected_state, data_version)
+    
+    if shipping_metrics['items'] == 0:
+        st.warning("Tidak ada item pesanan dalam rentang waktu yang dipilih.")
+        return
+    
+    col1, col2, col3 = st.columns(3)
+    
+    with col1:
+        st.metric("Median Jarak Penjual-Pelanggan", f"{shipping_metrics['median_distance_km']:.0f} km")
+    
+    with col2:
+        st.metric("Rata-rata Ongkos Kirim", f"R$ {shipping_metrics['avg_freight']:.2f}")
+    
+    with col3:
+        st.metric("Item dengan Geolokasi", f"{shipping_metrics['located_percentage']:.1f}%")
+    
+    # Rata-rata per negara bagian pelanggan di peta
+    map_metrics = {
+        'Rata-rata Jarak (km)': 'avg_distance_km',
+        'Rata-rata Ongkos Kirim (R$)': 'avg_freight',
+        'Rata-rata Lama Pengiriman (hari)': 'avg_delivery_days',
+    }
+    map_metric = st.radio("Tampilkan di peta:", list(map_metrics), horizontal=True, key='shipping_map_metric')
+    map_html = render_shipping_map(state_shipping, map_metrics[map_metric], map_metric, start_date, end_date,
+                                   data_version, GEO_TOLERANCE)
+    components.html(map_html, width=700, height=geo.MAP_HEIGHT + 10)
+    
+    # Hubungan jarak dengan ongkos kirim dan lama pengiriman (per kelompok 100 km)
+    col1, col2 = st.columns(2)
+    chart_key = (start_date, end_date, selected_state, data_version)
+    
+    with col1:
+        show_chart('distance_freight', chart_key, lambda: px.line(
+            distance_profile,
+            x='distance_km',
+            y='avg_freight',
+            title='Ongkos Kirim berdasarkan Jarak',
+            labels={'distance_km': 'Jarak (km)', 'avg_freight': 'Rata-rata Ongkos Kirim (R$)'},
+            markers=True
+        ))
+    
+    with col2:
+        show_chart('distance_days', chart_key, lambda: px.line(
+            distance_profile,
+            x='distance_km',
+            y='avg_delivery_days',
+            title='Lama Pengiriman berdasarkan Jarak',
+            labels={'distance_km': 'Jarak (km)', 'avg_delivery_days': 'Rata-rata Lama Pengiriman (hari)'},
+            markers=True
+        ))
+    
+    # Pencarian penjual dalam radius dari prefiks CEP memakai indeks grid
+    st.subheader("Penjual dalam Radius")
+    seller_locations, seller_grid = load_seller_index(data, data_version)
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        zip_prefix = st.number_input("Prefiks CEP (5 digit):", min_value=1000, max_value=99999,
+                                     value=load_common_zip(data, selected_state, data_version), step=1)
+    
+    with col2:
+        radius_km = st.slider("Radius (km):", min_value=10, max_value=500, value=100, step=10)
+    
+    nearby_sellers = analytics.sellers_near_zip(seller_locations, seller_grid, data['geolocation'],
+                                                zip_prefix, radius_km)
+    if nearby_sellers is None:
+        st.warning(f"Prefiks CEP {zip_prefix} tidak ditemukan di data geolokasi.")
+    else:
+        st.write(f"**{len(nearby_sellers)}** penjual dalam radius {radius_km} km dari CEP {zip_prefix:05d}.")
+        st.dataframe(nearby_sellers.head(50).rename(columns={
+            'seller_id': 'ID Penjual',
+            'seller_city': 'Kota',
+            'seller_state': 'Negara Bagian',
+            'distance_km': 'Jarak (km)'
+        }).round(1), hide_index=True, use_container_width=True)
+
+# ----- Tab 8: Pola Pembelian -----
+def pattern_section():
+    st.header("🕒 Pola Waktu Pembelian")
+    
+    if USE_SQL:
+        st.info("Pola waktu pembelian memakai store Parquet dan belum tersedia di backend SQL.")
+        return
+    
+    # Heatmap hari x jam dari histogram per jam yang dibangun sekali per versi data (olist/patterns.py)
+    heatmap = load_purchase_patterns(data, start_date, end_date, selected_category, selected_state, data_version)
+    
+    if heatmap['order_count'].sum() == 0:
+        st.warning("Tidak ada pesanan dalam filter yang dipilih.")
+        return
+    
+    busiest = int(heatmap['order_count'].to_numpy().argmax())
+    by_weekday = heatmap.groupby('weekday')[['order_count', 'revenue']].sum()
+    by_weekday.index = patterns.WEEKDAYS
+    by_hour = heatmap.groupby('hour')[['order_count', 'revenue']].sum()
+    
+    col1, col2, col3 = st.columns(3)
+    
+    with col1:
+        st.metric("Waktu Tersibuk",
+                  f"{patterns.WEEKDAYS[busiest // patterns.HOURS]} {busiest % patterns.HOURS:02d}:00")
+    
+    with col2:
+        st.metric("Hari Tersibuk", by_weekday['order_count'].idxmax())
+    
+    with col3:
+        st.metric("Jam Tersibuk", f"{by_hour['order_count'].idxmax():02d}:00")
+    
+    measure = st.radio("Ukuran:", ["Jumlah Pesanan", "Pendapatan"], horizontal=True, key='pattern_measure')
+    column = 'order_count' if measure == "Jumlah Pesanan" else 'revenue'
+    label = 'Jumlah Pesanan' if column == 'order_count' else 'Pendapatan (R$)'
+    chart_key = (start_date, end_date, selected_category, selected_state, column, data_version)
+    
+    st.subheader("Hari dalam Seminggu x Jam")
+    show_chart('purchase_heatmap', chart_key, lambda: px.imshow(
+        patterns.heatmap_matrix(heatmap, column),
+        aspect='auto',
+        color_continuous_scale='Blues',
+        labels={'x': 'Jam', 'y': 'Hari', 'color': label},
+        title=f'{measure} per Hari dan Jam Pembelian'
+    ))
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        show_chart('purchase_weekday', chart_key, lambda: px.bar(
+            by_weekday.rename_axis('weekday').reset_index(),
+            x='weekday',
+            y=column,
+            title=f'{measure} per Hari',
+            labels={'weekday': 'Hari', column: label}
+        ))
+    
+    with col2:
+        show_chart('purchase_hour', chart_key, lambda: px.bar(
+            by_hour.reset_index(),
+            x='hour',
+            y=column,
+            title=f'{measure} per Jam',
+            labels={'hour': 'Jam', column: label}
+        ))
+
+# Daftar bagian dashboard: label navigasi -> fungsi render
+SECTIONS = {
+    "📊 Tren Penjualan": sales_section,
+    "👥 Analisis Pelanggan": customer_section,
+    "💳 Metode Pembayaran": payment_section,
+    "🚚 Performa Pengiriman": delivery_section,
+    "⭐ Ulasan Pelanggan": review_section,
+    "🏪 Performa Penjual": seller_section,
+    "🌎 Analisis Geografis": geography_section,
+    "🕒 Pola Pembelian": pattern_section,
+}
+
+# Backend streaming hanya menghitung penjualan, RFM, dan pembayaran; bagian lain butuh tabel penuh
+if USE_STREAM:
+    SECTIONS = {label: section for label, section in SECTIONS.items()
+                if section in (sales_section, customer_section, payment_section)}
+    st.caption("Backend streaming: hanya Tren Penjualan, Analisis Pelanggan, dan Metode Pembayaran yang tersedia. "
+               "Jalankan dengan backend pandas atau SQL untuk bagian lainnya.")
+
+if LAZY_SECTIONS:
+    # Hanya bagian yang dipilih yang dihitung; st.tabs selalu menjalankan isi semua tab
+    selected_section = st.radio("Bagian", list(SECTIONS), horizontal=True, key='section',
+                                label_visibility='collapsed')
+    with instrument.stage(SECTIONS[selected_section].__name__):
+        SECTIONS[selected_section]()
+else:
+    for tab, section in zip(st.tabs(list(SECTIONS)), SECTIONS.values()):
+        with tab, instrument.stage(section.__name__):
+            section()
 
 # Tampilkan informasi tentang notebook analisis
 st.markdown("---")
@@ -711,4 +1291,29 @@ st.markdown("""
 <div style="text-align: center">
     <p>Olist E-commerce Analytics Dashboard | Dibuat dengan Streamlit</p>
 </div>
-""", unsafe_allow_html=True)
\ No newline at end of file
+""", unsafe_allow_html=True)
+
+# Panel debug instrumentasi (OLIST_INSTRUMENT=1): tahap-tahap rerun ini, juga ditulis ke log JSON lines
+rerun_record = instrument.end_run()
+if rerun_record is not None:
+    with st.sidebar.expander("🔧 Instrumentasi Rerun"):
+        st.metric("Waktu Rerun", f"{rerun_record['seconds'] * 1000:.0f} ms")
+        if rerun_record['peak_mb'] is not None:
+            st.metric("Puncak Alokasi", f"{rerun_record['peak_mb']:.1f} MB")
+        st.dataframe(instrument.stage_frame(rerun_record).rename(columns={
+            'stage': 'Tahap',
+            'parent': 'Induk',
+            'seconds': 'Detik',
+            'rows_in': 'Baris Masuk',
+            'rows_out': 'Baris Keluar',
+            'alloc_mb': 'Alokasi (MB)',
+            'peak_mb': 'Puncak (MB)'
+        }).round(4), hide_index=True, use_container_width=True)
+        if 'profile' in rerun_record:
+            st.caption(f"Profil cProfile rerun ini: {rerun_record['profile_path']}")
+            st.dataframe(pd.DataFrame(rerun_record['profile']).round(4), hide_index=True, use_container_width=True)
+        if RESULT_CACHE and USE_TABLES:
+            cache_stats = results.process_stats()
+            st.caption(f"Cache hasil proses ini: {cache_stats['hits']} hit, {cache_stats['misses']} miss "
+                       f"(hit rate {cache_stats['hit_rate']:.1f}%)")
+        st.caption(f"Log: {instrument.INSTRUMENT_LOG}")
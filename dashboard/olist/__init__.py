@@ -0,0 +1 @@
+"""Modul pendukung dashboard Olist: pemuatan data, penyimpanan, dan benchmark."""
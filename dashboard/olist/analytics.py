@@ -0,0 +1,469 @@
+"""Inti analitik dashboard Olist tanpa ketergantungan Streamlit.
+
+Setiap fungsi menerima tabel dari ``store.load_tables`` (tabel fakta terurut
+berdasarkan waktu pembelian) dan mengembalikan DataFrame/nilai yang siap
+ditampilkan. Dashboard membungkus fungsi-fungsi ini dengan ``st.cache_data``;
+notebook dan skrip lain bisa mengimpornya langsung.
+
+Hitung semua metrik untuk satu rentang tanggal sekaligus dan simpan hasilnya:
+
+    cd dashboard
+    python -m olist.analytics --start 2018-01-01 --end 2018-08-31
+    python -m olist.analytics --category health_beauty --state SP --profile
+
+Hasil ditulis ke ``processed_data/results/<nama>/`` sebagai file Parquet per
+tabel ditambah ``summary.json`` berisi metrik skalar dan waktu komputasi.
+"""
+import argparse
+import cProfile
+import json
+import pstats
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from . import basket, cluster, cube, index, sketch, spatial
+from . import delivery as delivery_engine
+from . import patterns as pattern_engine
+from . import reviews as review_engine
+from . import sellers as seller_engine
+from . import rfm as rfm_engine
+from .config import PROCESSED_DIR
+
+RESULTS_DIR_NAME = 'results'
+
+# Penjual dengan pesanan lebih sedikit dari ini tidak masuk tabel SLA per penjual
+SELLER_SLA_MIN_ORDERS = 20
+
+# Penjual dengan ulasan lebih sedikit dari ini tidak masuk tabel skor per penjual
+SELLER_MIN_REVIEWS = 20
+
+# Metrik rasio papan peringkat penjual hanya memeringkat penjual dengan data cukup
+LEADERBOARD_MIN_COUNTS = {
+    'avg_review_score': ('reviews', SELLER_MIN_REVIEWS),
+    'late_rate': ('delivered_orders', SELLER_SLA_MIN_ORDERS),
+}
+LEADERBOARD_PAGE_SIZE = 25
+
+# Preset rentang tanggal di sidebar dashboard -> jumlah hari sebelum tanggal terakhir (None = semua data)
+DATE_PRESETS = {
+    'Semua Data': None,
+    'Tahun Terakhir': 365,
+    '6 Bulan Terakhir': 180,
+    '3 Bulan Terakhir': 90,
+}
+
+
+def preset_range(preset, min_date, max_date):
+    # (start_date, end_date) untuk preset tanggal relatif terhadap tanggal terakhir data
+    days = DATE_PRESETS[preset]
+    if days is None:
+        return min_date, max_date
+    return max_date - pd.Timedelta(days=days), max_date
+
+
+def rows_in_range(frame, start_date, end_date):
+    # Potongan baris tabel terurut waktu untuk rentang tanggal
+    return frame.iloc[index.date_slice(frame[index.TIMESTAMP_COLUMN].values, start_date, end_date)]
+
+
+def sales_summary(order_facts, sales_cube, start_date, end_date, category=None, use_cube=True, check=False):
+    # Mengembalikan (summary, problems); problems berisi perbedaan kubus vs mentah jika check=True
+    rows = index.date_slice(order_facts[index.TIMESTAMP_COLUMN].values, start_date, end_date)
+    problems = []
+
+    # Ringkasan penjualan dari kubus agregat (slice-and-sum), bulan yang terpotong rentang tanggal
+    # dihitung dari baris mentah sehingga hasilnya tetap eksak
+    if use_cube:
+        summary = cube.sales_summary_from_cube(sales_cube, order_facts, rows, category)
+
+    if not use_cube or check:
+        # Jalur mentah: potongan tabel fakta sesuai tanggal, hanya baris yang memiliki item
+        raw_summary = cube.sales_summary_from_items(cube.filter_items(order_facts.iloc[rows], category))
+        if not use_cube:
+            summary = raw_summary
+        else:
+            problems = cube.compare_summaries(summary, raw_summary)
+
+    return summary, problems
+
+
+def purchase_histogram(order_facts):
+    # Histogram pesanan per (jam, kategori, negara bagian), dibangun sekali per versi data
+    return pattern_engine.build_purchase_histogram(order_facts)
+
+
+def purchase_patterns(histogram, order_facts, start_date, end_date, category=None, state=None):
+    # Jumlah pesanan dan pendapatan per (hari dalam seminggu, jam) untuk satu kombinasi filter
+    return pattern_engine.purchase_heatmap(histogram, order_facts, start_date, end_date, category, state)
+
+
+def copurchase_pairs(order_facts):
+    # Pasangan kategori setiap pesanan multi-kategori, dibangun sekali per versi data
+    return basket.build_copurchase_pairs(order_facts)
+
+
+def market_basket(histogram, pairs, order_facts, start_date, end_date, category=None, state=None):
+    # Peringkat kategori per negara bagian, indeks over-index, dan pasangan kategori yang dibeli bersama
+    # dari matriks sparse kategori x negara bagian untuk rentang tanggal. Tanpa filter kategori,
+    # negara bagian over-index ditampilkan untuk kategori terlaris.
+    matrix = basket.category_state_matrix(histogram, order_facts, start_date, end_date)
+    ranking = basket.state_ranking(matrix, state, category)
+    focus = category
+    if focus is None:
+        overall = basket.state_ranking(matrix)
+        focus = overall[cube.CATEGORY_COLUMN].iloc[0] if len(overall) else None
+    return {
+        'ranking': ranking,
+        'category_index': basket.categories_over_index(matrix, state) if state is not None else None,
+        'focus_category': focus,
+        'state_index': basket.states_over_index(matrix, focus) if focus is not None else None,
+        'copurchase': basket.copurchase(pairs, matrix, start_date, end_date, state),
+    }
+
+
+def distinct_sketches(order_facts):
+    # Sketsa HyperLogLog pesanan dan pelanggan per (bulan, kategori, negara bagian), dibangun sekali per versi data
+    return sketch.build_distinct_sketches(order_facts)
+
+
+def distinct_counts(order_facts, start_date, end_date, category=None, state=None, sketches=None):
+    # Pesanan dan pelanggan unik untuk satu kombinasi filter, beserta rinciannya per kategori (hanya filter
+    # negara bagian) dan per negara bagian (hanya filter kategori). Eksak (nunique atas baris) jika
+    # sketches None, perkiraan HyperLogLog dari sketsa jika diberikan.
+    if sketches is None:
+        rows = rows_in_range(order_facts, start_date, end_date)
+        total = sketch.distinct_from_items(cube.filter_items(rows, category, state))
+        by_category = sketch.distinct_from_items(cube.filter_items(rows, state=state), 'category')
+        by_state = sketch.distinct_from_items(cube.filter_items(rows, category), 'state')
+    else:
+        total, by_category, by_state = sketch.distinct_breakdowns(sketches, start_date, end_date, category, state)
+    return {
+        'orders': int(round(total['orders'][0])),
+        'customers': int(round(total['customers'][0])),
+        'by_category': sketch.distinct_frame(cube.CATEGORY_COLUMN, order_facts[cube.CATEGORY_COLUMN].cat.categories,
+                                             by_category),
+        'by_state': sketch.distinct_frame('customer_state', order_facts['customer_state'].cat.categories, by_state),
+    }
+
+
+def customer_rfm(order_facts, start_date, end_date):
+    rfm_orders = rfm_engine.select_rfm_orders(rows_in_range(order_facts, start_date, end_date))
+    return rfm_engine.compute_rfm(rfm_orders, end_date)
+
+
+def segment_distribution(rfm):
+    segment_dist = rfm['segment'].value_counts().reset_index()
+    segment_dist.columns = ['segment', 'count']
+    return segment_dist
+
+
+def customer_clusters(rfm, n_clusters=cluster.N_CLUSTERS, init=None):
+    # Mengembalikan (profil per klaster, pusat klaster terurut, info fit); pusat bisa diberikan
+    # kembali sebagai init untuk warm start pada rentang tanggal lain
+    labels, centers, info = cluster.cluster_customers(rfm, n_clusters, init)
+    return cluster.cluster_profiles(rfm, labels), centers, info
+
+
+def payment_summary(payment_facts, start_date, end_date):
+    # Mengembalikan (ringkasan per metode, distribusi cicilan, rata-rata nilai per cicilan);
+    # dua yang terakhir None jika tidak ada pembayaran kartu kredit
+    payment_data = rows_in_range(payment_facts, start_date, end_date)
+
+    # Agregasi berdasarkan jenis pembayaran
+    summary = payment_data.groupby('payment_type', observed=True).agg({
+        'payment_value': 'sum',
+        'order_id': 'nunique'
+    }).reset_index()
+
+    summary.columns = ['payment_type', 'total_value', 'order_count']
+    summary['percentage'] = summary['total_value'] / summary['total_value'].sum() * 100
+
+    # Filter hanya metode pembayaran credit_card
+    credit_data = payment_data[payment_data['payment_type'] == 'credit_card']
+    if len(credit_data) == 0:
+        return summary, None, None
+
+    # Distribusi jumlah cicilan
+    installment_counts = credit_data['payment_installments'].value_counts().reset_index()
+    installment_counts.columns = ['installments', 'count']
+    installment_counts = installment_counts.sort_values('installments')
+
+    # Rata-rata nilai pembelian berdasarkan jumlah cicilan
+    installment_values = credit_data.groupby('payment_installments')['payment_value'].mean().reset_index()
+    installment_values.columns = ['installments', 'avg_value']
+
+    return summary, installment_counts, installment_values
+
+
+def delivery_data(delivery_facts, start_date, end_date):
+    # Pesanan terkirim dalam rentang tanggal beserta selisih dan lama pengiriman (hari, int16),
+    # satu baris per pesanan
+    rows = rows_in_range(delivery_facts, start_date, end_date)
+    rows = rows[rows['order_first_row']]
+    return rows[['delivery_difference', 'actual_delivery_days', 'estimated_delivery_days']]
+
+
+def delivery_summary(deliveries):
+    # Jumlah pesanan per status (urut dari paling awal) dan metrik rata-rata
+    return {
+        'status_counts': delivery_engine.status_counts(deliveries['delivery_difference'].to_numpy()),
+        'avg_delivery_days': deliveries['actual_delivery_days'].mean(),
+        'avg_estimated_days': deliveries['estimated_delivery_days'].mean(),
+        'on_time_percentage': (deliveries['delivery_difference'] <= 0).mean() * 100,
+    }
+
+
+def delivery_sla(delivery_facts, start_date, end_date, min_seller_orders=SELLER_SLA_MIN_ORDERS):
+    # Statistik SLA pengiriman per negara bagian pelanggan dan per penjual: (per_state, per_seller)
+    rows = rows_in_range(delivery_facts, start_date, end_date)
+    per_state = delivery_engine.sla_stats(rows[rows['order_first_row']], 'customer_state')
+    per_seller = delivery_engine.sla_stats(rows, 'seller_id', min_orders=min_seller_orders)
+    return per_state, per_seller
+
+
+def review_scores(orders, order_reviews, start_date, end_date):
+    # Jumlah ulasan per skor untuk pesanan dalam rentang tanggal (orders terurut waktu)
+    order_ids = rows_in_range(orders, start_date, end_date)['order_id']
+    scores = order_reviews.loc[order_reviews['order_id'].isin(order_ids), 'review_score']
+    counts = scores.value_counts().sort_index().reset_index()
+    counts.columns = ['review_score', 'count']
+    return counts
+
+
+def shipping_summary(shipping_facts, start_date, end_date, state=None):
+    # Mengembalikan (profil ongkos kirim dan lama pengiriman per kelompok jarak, statistik per
+    # negara bagian pelanggan, metrik ringkas). Filter negara bagian hanya berlaku untuk profil
+    # dan metrik; tabel per negara bagian selalu berisi semua negara bagian.
+    rows = rows_in_range(shipping_facts, start_date, end_date)
+    per_state = spatial.state_distances(rows)
+    if state:
+        rows = rows[rows['customer_state'] == state]
+    located = rows['distance_km'].notna()
+    metrics = {
+        'items': len(rows),
+        'located_percentage': located.mean() * 100 if len(rows) else float('nan'),
+        'median_distance_km': rows['distance_km'].median(),
+        'avg_freight': rows['freight_value'].mean(),
+    }
+    return spatial.distance_profile(rows), per_state, metrics
+
+
+def seller_index(sellers, geolocation):
+    # Lokasi penjual (centroid CEP) beserta indeks grid-nya untuk pencarian radius
+    locations = spatial.seller_locations(sellers, geolocation)
+    return locations, spatial.build_grid(locations['lat'], locations['lng'])
+
+
+def sellers_near_zip(locations, grid, geolocation, zip_prefix, radius_km):
+    # Penjual dalam radius_km dari centroid prefiks CEP; None jika prefiks tidak punya geolokasi
+    lat, lng = spatial.zip_coordinates(geolocation, [zip_prefix])
+    if np.isnan(lat[0]):
+        return None
+    return spatial.sellers_within(locations, grid, lat[0], lng[0], radius_km)
+
+
+def review_summary(review_facts, start_date, end_date, min_seller_reviews=SELLER_MIN_REVIEWS):
+    # Semua agregat tab Ulasan untuk satu rentang tanggal dari potongan review_facts:
+    # dict berisi frame per bulan/kategori/penjual/negara bagian/status pengiriman/skor dan metrik
+    rows = rows_in_range(review_facts, start_date, end_date)
+    by_delivery, late_correlation = review_engine.delivery_scores(rows)
+    return {
+        'metrics': {**review_engine.review_metrics(rows), 'late_correlation': late_correlation},
+        'monthly': review_engine.monthly_scores(rows),
+        'by_category': review_engine.group_scores(rows, 'product_category_name_english', 'category_first_row'),
+        'by_seller': review_engine.group_scores(rows, 'seller_id', 'seller_first_row', min_reviews=min_seller_reviews),
+        'by_state': review_engine.group_scores(rows, 'customer_state', 'review_first_row'),
+        'by_delivery': by_delivery,
+        'comments': review_engine.comment_lengths(rows),
+    }
+
+
+def seller_stats(seller_facts, start_date, end_date, category=None, state=None):
+    # Ukuran per penjual (pendapatan, pesanan, skor ulasan, keterlambatan) untuk satu kombinasi filter
+    return seller_engine.seller_stats(rows_in_range(seller_facts, start_date, end_date), category, state)
+
+
+def ranked_sellers(stats, metric):
+    # Jumlah penjual yang diperingkat untuk metrik ini (untuk jumlah halaman)
+    values = seller_engine.rank_values(stats, metric, LEADERBOARD_MIN_COUNTS.get(metric))
+    return int((~np.isnan(values)).sum())
+
+
+def seller_leaderboard(stats, sellers, metric='revenue', page=0, page_size=LEADERBOARD_PAGE_SIZE, reverse=False):
+    # Mengembalikan (satu halaman peringkat beserta kota/negara bagian penjual, jumlah penjual
+    # yang diperingkat untuk metrik ini)
+    board, ranked = seller_engine.leaderboard_page(stats, metric, page, page_size, reverse,
+                                                   LEADERBOARD_MIN_COUNTS.get(metric))
+    board = pd.merge(board, sellers[['seller_id', 'seller_city', 'seller_state']].drop_duplicates('seller_id'),
+                     on='seller_id', how='left')
+    return board, ranked
+
+
+def customer_states(customers, state=None):
+    # Jumlah pelanggan per negara bagian (seluruh data, tidak dipengaruhi rentang tanggal)
+    counts = customers['customer_state'].value_counts().reset_index()
+    counts.columns = ['state', 'customer_count']
+    if state:
+        counts = counts[counts['state'] == state]
+    return counts
+
+
+def top_cities(customers, state, n=10):
+    # customer_city categorical: value_counts biasa juga mengembalikan kota negara bagian lain dengan
+    # jumlah 0, jadi hanya kota yang muncul di negara bagian ini yang dihitung
+    cities = customers[customers['customer_state'] == state]['customer_city']
+    if isinstance(cities.dtype, pd.CategoricalDtype):
+        cities = cities.cat.remove_unused_categories().astype(object)
+    city_counts = cities.value_counts().reset_index()
+    city_counts.columns = ['city', 'count']
+    return city_counts[city_counts['count'] > 0].head(n)
+
+
+def compute_all(tables, start_date, end_date, category=None, state=None, use_cube=True, approximate=False):
+    # Semua metrik dashboard untuk satu kombinasi filter. Mengembalikan (frames, scalars, timings).
+    frames, scalars, timings = {}, {}, {}
+
+    def timed(name, fn, *args, **kwargs):
+        start = time.perf_counter()
+        result = fn(*args, **kwargs)
+        timings[name] = time.perf_counter() - start
+        return result
+
+    sales, _ = timed('sales', sales_summary, tables['order_facts'], tables['sales_cube'],
+                     start_date, end_date, category, use_cube=use_cube)
+    frames['sales_monthly'] = sales['monthly_sales']
+    frames['sales_by_category'] = sales['category_sales']
+    scalars['total_orders'] = int(sales['total_orders'])
+    scalars['total_sales'] = float(sales['total_sales'])
+
+    histogram = timed('purchase_histogram', purchase_histogram, tables['order_facts'])
+    frames['purchase_heatmap'] = timed('patterns', purchase_patterns, histogram, tables['order_facts'],
+                                       start_date, end_date, category, state)
+    pairs = timed('copurchase_pairs', copurchase_pairs, tables['order_facts'])
+    market = timed('basket', market_basket, histogram, pairs, tables['order_facts'], start_date, end_date,
+                   category, state)
+    frames['category_ranking'] = market['ranking']
+    frames['copurchase'] = market['copurchase']
+    for name in ['category_index', 'state_index']:
+        if market[name] is not None:
+            frames[f'over_{name}'] = market[name]
+
+    sketches = timed('distinct_sketches', distinct_sketches, tables['order_facts']) if approximate else None
+    distinct = timed('distinct', distinct_counts, tables['order_facts'], start_date, end_date, category, state,
+                     sketches)
+    scalars['distinct_orders'] = distinct['orders']
+    scalars['distinct_customers'] = distinct['customers']
+    frames['distinct_by_category'] = distinct['by_category']
+    frames['distinct_by_state'] = distinct['by_state']
+
+    rfm = timed('rfm', customer_rfm, tables['order_facts'], start_date, end_date)
+    frames['rfm'] = rfm
+    if len(rfm) > 0:
+        frames['rfm_segments'] = segment_distribution(rfm)
+        for col in ['recency', 'frequency', 'monetary']:
+            scalars[f'avg_{col}'] = float(rfm[col].mean())
+        frames['cluster_profiles'], _, _ = timed('clusters', customer_clusters, rfm)
+
+    payments, installment_counts, installment_values = timed(
+        'payments', payment_summary, tables['payment_facts'], start_date, end_date)
+    frames['payment_methods'] = payments
+    if installment_counts is not None:
+        frames['installment_counts'] = installment_counts
+        frames['installment_values'] = installment_values
+
+    deliveries = timed('delivery', delivery_data, tables['delivery_facts'], start_date, end_date)
+    if len(deliveries) > 0:
+        delivery = delivery_summary(deliveries)
+        frames['delivery_status'] = delivery.pop('status_counts')
+        scalars.update({key: float(value) for key, value in delivery.items()})
+    frames['delivery_sla_state'], frames['delivery_sla_seller'] = timed(
+        'delivery_sla', delivery_sla, tables['delivery_facts'], start_date, end_date)
+
+    frames['review_scores'] = timed('reviews', review_scores, tables['orders'], tables['order_reviews'],
+                                    start_date, end_date)
+    reviews = timed('review_summary', review_summary, tables['review_facts'], start_date, end_date)
+    scalars.update({f'review_{key}': float(value) for key, value in reviews.pop('metrics').items()})
+    frames.update({f'reviews_{name}': frame for name, frame in reviews.items()})
+
+    stats = timed('sellers', seller_stats, tables['seller_facts'], start_date, end_date, category, state)
+    frames['seller_leaderboard'], _ = seller_leaderboard(stats, tables['sellers'], page_size=100)
+
+    # shipping_facts hanya ada jika geolocation_dataset.csv tersedia (lihat store.OPTIONAL_SOURCES)
+    if 'shipping_facts' in tables:
+        frames['shipping_distance'], frames['shipping_by_state'], shipping = timed(
+            'shipping', shipping_summary, tables['shipping_facts'], start_date, end_date, state)
+        scalars.update({f'shipping_{key}': float(value) for key, value in shipping.items()})
+
+    frames['customer_states'] = timed('geography', customer_states, tables['customers'], state)
+    if state:
+        frames['top_cities'] = top_cities(tables['customers'], state)
+
+    return frames, scalars, timings
+
+
+def write_results(out_dir, frames, scalars, timings, params):
+    out_dir.mkdir(parents=True, exist_ok=True)
+    for name, frame in frames.items():
+        frame.to_parquet(out_dir / f'{name}.parquet', engine='pyarrow', index=False)
+    with open(out_dir / 'summary.json', 'w') as f:
+        json.dump({'params': params, 'metrics': scalars, 'timings': timings}, f, indent=2)
+
+
+def result_name(version, start_date, end_date, category, state):
+    parts = [version, start_date.strftime('%Y%m%d'), end_date.strftime('%Y%m%d'), category or 'all', state or 'all']
+    return '_'.join(parts)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m olist.analytics',
+                                     description='Hitung semua metrik dashboard untuk satu rentang tanggal.')
+    parser.add_argument('--start', help='Tanggal mulai (YYYY-MM-DD), default awal data')
+    parser.add_argument('--end', help='Tanggal akhir (YYYY-MM-DD), default akhir data')
+    parser.add_argument('--category', help='Kategori produk (nama bahasa Inggris)')
+    parser.add_argument('--state', help='Kode negara bagian pelanggan, misalnya SP')
+    parser.add_argument('--out', help='Direktori hasil, default processed_data/results/<versi>_<filter>')
+    parser.add_argument('--raw', action='store_true', help='Hitung penjualan dari baris mentah, bukan kubus')
+    parser.add_argument('--approximate', action='store_true',
+                        help='Hitung pesanan dan pelanggan unik dari sketsa HyperLogLog, bukan nunique eksak')
+    parser.add_argument('--profile', action='store_true', help='Tampilkan 20 fungsi terlama (cProfile)')
+    args = parser.parse_args(argv)
+
+    from . import store
+
+    start = time.perf_counter()
+    tables, version, source = store.load_tables()
+    load_seconds = time.perf_counter() - start
+
+    timestamps = tables['orders'][index.TIMESTAMP_COLUMN]
+    start_date = pd.Timestamp(args.start) if args.start else timestamps.min()
+    end_date = pd.Timestamp(args.end) if args.end else timestamps.max()
+
+    profiler = cProfile.Profile() if args.profile else None
+    if profiler:
+        profiler.enable()
+    frames, scalars, timings = compute_all(tables, start_date, end_date, args.category, args.state,
+                                           use_cube=not args.raw, approximate=args.approximate)
+    if profiler:
+        profiler.disable()
+
+    out_dir = Path(args.out) if args.out else (
+        PROCESSED_DIR / RESULTS_DIR_NAME / result_name(version, start_date, end_date, args.category, args.state))
+    params = {'version': version, 'source': source, 'start_date': str(start_date), 'end_date': str(end_date),
+              'category': args.category, 'state': args.state, 'use_cube': not args.raw,
+              'approximate': args.approximate}
+    write_results(out_dir, frames, scalars, timings, params)
+
+    print(f'Data versi {version} dimuat dari {source} dalam {load_seconds:.2f} detik')
+    for name, seconds in timings.items():
+        print(f'  {name:<12} {seconds * 1000:>10.1f} ms')
+    print(f'Hasil ({len(frames)} tabel) ditulis ke {out_dir}')
+
+    if profiler:
+        pstats.Stats(profiler).sort_stats('cumulative').print_stats(20)
+
+
+if __name__ == '__main__':
+    main()
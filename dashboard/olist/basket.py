@@ -0,0 +1,264 @@
+"""Matriks penjualan kategori x negara bagian dan kategori yang dibeli bersama.
+
+Matriks untuk satu rentang tanggal dijumlahkan dari sel histogram per jam
+``olist.patterns`` (dibangun sekali per versi data, jam tepi dari baris
+mentah) dengan satu ``np.bincount`` atas kode ``negara bagian * (C + 1) +
+kategori``, lalu disimpan dalam format CSR (compressed sparse row): baris
+negara bagian, kolom kategori, dan hanya sel yang terisi. Peringkat kategori
+satu negara bagian adalah satu potongan baris ``indptr[s]:indptr[s + 1]``,
+bukan filter pelanggan lalu merge pesanan-item-produk per negara bagian
+seperti ``analyze_state_categories`` di notebook. Kolom rollup (semua
+kategori) menyimpan jumlah pesanan unik per negara bagian.
+
+Pasangan kategori yang dibeli bersama adalah elemen di atas diagonal
+B^T B, dengan B matriks biner pesanan x kategori. Hampir semua pesanan hanya
+berisi satu kategori, jadi B^T B dihitung dengan membangkitkan pasangan
+(i < j) dari entri tak nol B untuk pesanan multi-kategori saja, sekali per
+versi data, terurut menurut waktu pesanan. Filter tanggal dan negara bagian
+menjadi potongan ``searchsorted`` dan mask, lalu jumlah pesanan per pasangan
+dihitung dengan ``np.bincount`` atas kode ``i * C + j``.
+"""
+import numpy as np
+import pandas as pd
+
+from .cube import CATEGORY_COLUMN
+from .index import TIMESTAMP_COLUMN, date_slice
+from .patterns import histogram_range, to_cents, value_code
+
+# Sel kategori x negara bagian dengan pesanan lebih sedikit dari ini tidak masuk indeks over-index
+OVER_INDEX_MIN_ORDERS = 10
+
+
+def category_state_matrix(histogram, order_facts, start_date, end_date):
+    # Matriks CSR negara bagian x kategori (pendapatan dalam sen dan jumlah pesanan unik) untuk
+    # rentang tanggal, beserta total per negara bagian dari sel rollup
+    categories, states = histogram['categories'], histogram['states']
+    width = len(categories) + 1
+    cells, edge_rows = histogram_range(histogram, order_facts, start_date, end_date)
+
+    # Sel dan baris tepi tanpa kategori atau negara bagian (kode -1) tidak masuk matriks
+    category, state = histogram['category'][cells], histogram['state'][cells]
+    keep = (category >= 0) & (state >= 0)
+    codes = state[keep].astype(np.int64) * width + category[keep]
+    size = len(states) * width
+    orders = np.bincount(codes, weights=histogram['orders'][cells][keep], minlength=size).astype(np.int64)
+    cents = np.bincount(codes, weights=histogram['cents'][cells][keep], minlength=size).astype(np.int64)
+
+    edge_category = order_facts[CATEGORY_COLUMN].array.codes[edge_rows]
+    edge_state = order_facts['customer_state'].array.codes[edge_rows]
+    valid_state = edge_state >= 0
+    edge_orders = pd.Series(order_facts['order_id'].iloc[edge_rows].array)
+    rollup = np.full(len(edge_rows), len(categories))
+    for column_codes, per_order in ((edge_category, edge_category >= 0),
+                                    (rollup, np.ones(len(edge_rows), dtype=bool))):
+        # Satu pesanan dihitung sekali per (kategori, negara bagian); kolom rollup sekali per negara bagian
+        rows = valid_state & per_order
+        codes = edge_state[rows].astype(np.int64) * width + column_codes[rows]
+        first = ~pd.DataFrame({'order': edge_orders[rows].to_numpy(), 'code': codes}).duplicated().to_numpy()
+        orders += np.bincount(codes[first], minlength=size)
+        cents += np.bincount(codes, weights=to_cents(order_facts['price'].to_numpy()[edge_rows][rows]),
+                             minlength=size).astype(np.int64)
+
+    orders, cents = orders.reshape(len(states), width), cents.reshape(len(states), width)
+    rows, columns = np.nonzero(orders[:, :-1])
+    return {
+        'indptr': np.concatenate([[0], np.cumsum(np.bincount(rows, minlength=len(states)))]),
+        'indices': columns,
+        'orders': orders[rows, columns],
+        'cents': cents[rows, columns],
+        'state_orders': orders[:, -1],
+        'state_cents': cents[:, -1],
+        'categories': categories,
+        'states': states,
+    }
+
+
+def state_row(matrix, state):
+    # Potongan CSR satu negara bagian (kosong jika tidak dikenal)
+    code = value_code(matrix['states'], state)
+    if code >= len(matrix['states']):
+        return slice(0, 0)
+    return slice(matrix['indptr'][code], matrix['indptr'][code + 1])
+
+
+def category_totals(matrix):
+    # Jumlah pesanan dan pendapatan (sen) per kategori di semua negara bagian. Satu pesanan hanya
+    # punya satu negara bagian, jadi jumlah pesanan unik per kategori aditif antar-baris.
+    size = len(matrix['categories'])
+    return (np.bincount(matrix['indices'], weights=matrix['orders'], minlength=size).astype(np.int64),
+            np.bincount(matrix['indices'], weights=matrix['cents'], minlength=size).astype(np.int64))
+
+
+def state_ranking(matrix, state=None, category=None):
+    # Penjualan per kategori di satu negara bagian (atau semua), dengan kolom seperti
+    # category_sales pada ringkasan penjualan, terurut menurut pendapatan
+    if state is None:
+        orders, cents = category_totals(matrix)
+        columns = np.flatnonzero(orders)
+        orders, cents = orders[columns], cents[columns]
+    else:
+        row = state_row(matrix, state)
+        columns, orders, cents = matrix['indices'][row], matrix['orders'][row], matrix['cents'][row]
+    ranking = pd.DataFrame({
+        CATEGORY_COLUMN: matrix['categories'][columns],
+        'price': cents / 100,
+        'order_id': orders,
+    })
+    if category is not None:
+        ranking = ranking[ranking[CATEGORY_COLUMN] == category]
+    return ranking.sort_values(['price', CATEGORY_COLUMN], ascending=[False, True], ignore_index=True)
+
+
+def index_frame(label_column, labels, orders, cents, shares, national_share, min_orders):
+    # Indeks over-index = porsi pendapatan / porsi nasional (1 = sama dengan rata-rata nasional)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        frame = pd.DataFrame({
+            label_column: labels,
+            'revenue': cents / 100,
+            'orders': orders,
+            'share': shares * 100,
+            'index': shares / national_share,
+        })
+    frame = frame[frame['orders'] >= min_orders]
+    return frame.sort_values(['index', label_column], ascending=[False, True], ignore_index=True)
+
+
+def categories_over_index(matrix, state, min_orders=OVER_INDEX_MIN_ORDERS):
+    # Kategori dengan porsi pendapatan di negara bagian ini dibanding porsinya secara nasional
+    row = state_row(matrix, state)
+    columns, orders, cents = matrix['indices'][row], matrix['orders'][row], matrix['cents'][row]
+    _, category_cents = category_totals(matrix)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        shares = cents / cents.sum()
+        national_share = category_cents[columns] / category_cents.sum()
+    return index_frame(CATEGORY_COLUMN, matrix['categories'][columns], orders, cents, shares, national_share,
+                       min_orders)
+
+
+def states_over_index(matrix, category, min_orders=OVER_INDEX_MIN_ORDERS):
+    # Negara bagian dengan porsi pendapatan kategori ini dibanding porsinya secara nasional
+    entries = np.flatnonzero(matrix['indices'] == value_code(matrix['categories'], category))
+    row_states = np.repeat(np.arange(len(matrix['states'])), np.diff(matrix['indptr']))
+    state_cents = np.bincount(row_states, weights=matrix['cents'], minlength=len(matrix['states']))
+    states, orders, cents = row_states[entries], matrix['orders'][entries], matrix['cents'][entries]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        shares = cents / state_cents[states]
+        national_share = cents.sum() / matrix['cents'].sum()
+    return index_frame('customer_state', matrix['states'][states], orders, cents, shares, national_share,
+                       min_orders)
+
+
+def build_copurchase_pairs(order_facts):
+    # Pasangan kategori (i < j) setiap pesanan yang berisi lebih dari satu kategori, terurut menurut
+    # waktu pesanan, beserta kode negara bagian pelanggannya
+    items = order_facts[order_facts['has_item']]
+    category = items[CATEGORY_COLUMN].array.codes
+    items, category = items[category >= 0], category[category >= 0].astype(np.int64)
+    size = len(items[CATEGORY_COLUMN].cat.categories)
+
+    # Entri tak nol B (pesanan, kategori) terurut menurut pesanan lalu kategori
+    keys, first = np.unique(pd.factorize(items['order_id'])[0].astype(np.int64) * size + category,
+                            return_index=True)
+    owner, category = keys // size, keys % size
+    starts = np.flatnonzero(np.r_[True, owner[1:] != owner[:-1]])
+    lengths = np.diff(np.r_[starts, len(keys)])
+
+    # Setiap entri dipasangkan dengan entri sesudahnya di pesanan yang sama
+    after = np.repeat(starts + lengths, lengths) - np.arange(len(keys)) - 1
+    left = np.repeat(np.arange(len(keys)), after)
+    right = left + 1 + np.arange(len(left)) - np.repeat(np.cumsum(after) - after, after)
+
+    timestamps = items[TIMESTAMP_COLUMN].to_numpy()[first[left]]
+    by_time = np.argsort(timestamps, kind='stable')
+    return {
+        'timestamp': timestamps[by_time],
+        'state': items['customer_state'].array.codes[first[left]][by_time].astype(np.int16),
+        'first': category[left][by_time].astype(np.int16),
+        'second': category[right][by_time].astype(np.int16),
+        'categories': items[CATEGORY_COLUMN].cat.categories,
+        'states': items['customer_state'].cat.categories,
+    }
+
+
+def copurchase(pairs, matrix, start_date, end_date, state=None):
+    # Jumlah pesanan per pasangan kategori yang dibeli bersama dalam rentang tanggal (dan negara bagian),
+    # dengan lift = P(a dan b) / (P(a) P(b)) terhadap pesanan pada matriks filter yang sama
+    rows = date_slice(pairs['timestamp'], start_date, end_date)
+    first, second = pairs['first'][rows], pairs['second'][rows]
+    size = len(pairs['categories'])
+    if state is None:
+        category_orders, _ = category_totals(matrix)
+        total_orders = matrix['state_orders'].sum()
+    else:
+        code = value_code(pairs['states'], state)
+        mask = pairs['state'][rows] == code
+        first, second = first[mask], second[mask]
+        row = state_row(matrix, state)
+        category_orders = np.zeros(size, dtype=np.int64)
+        category_orders[matrix['indices'][row]] = matrix['orders'][row]
+        total_orders = matrix['state_orders'][code] if code < len(matrix['states']) else 0
+
+    counts = np.bincount(first.astype(np.int64) * size + second, minlength=size * size)
+    codes = np.flatnonzero(counts)
+    a, b = codes // size, codes % size
+    with np.errstate(divide='ignore', invalid='ignore'):
+        lift = counts[codes] * total_orders / (category_orders[a] * category_orders[b])
+    pairs_frame = pd.DataFrame({
+        'category_a': pairs['categories'][a],
+        'category_b': pairs['categories'][b],
+        'orders': counts[codes],
+        'lift': lift,
+    })
+    return pairs_frame.sort_values(['orders', 'category_a', 'category_b'], ascending=[False, True, True],
+                                   ignore_index=True)
+
+
+def state_matrix_from_items(filtered_items):
+    # Jalur mentah (acuan): groupby negara bagian x kategori atas baris item order_facts
+    return (filtered_items.groupby(['customer_state', CATEGORY_COLUMN], observed=True)
+            .agg(orders=('order_id', 'nunique'), revenue=('price', 'sum'))
+            .reset_index())
+
+
+def copurchase_from_items(filtered_items):
+    # Jalur mentah (acuan): self-merge pasangan (pesanan, kategori) unik per pesanan
+    entries = filtered_items[['order_id', CATEGORY_COLUMN]].dropna().drop_duplicates()
+    entries[CATEGORY_COLUMN] = entries[CATEGORY_COLUMN].astype(str)
+    merged = pd.merge(entries, entries, on='order_id', suffixes=('_a', '_b'))
+    merged = merged[merged[f'{CATEGORY_COLUMN}_a'] < merged[f'{CATEGORY_COLUMN}_b']]
+    return (merged.groupby([f'{CATEGORY_COLUMN}_a', f'{CATEGORY_COLUMN}_b']).size()
+            .rename('orders').reset_index()
+            .set_axis(['category_a', 'category_b', 'orders'], axis=1))
+
+
+def matrix_frame(matrix):
+    # Sel tak nol matriks CSR sebagai frame (negara bagian, kategori, pesanan, pendapatan)
+    states = np.repeat(np.arange(len(matrix['states'])), np.diff(matrix['indptr']))
+    return pd.DataFrame({
+        'customer_state': matrix['states'][states],
+        CATEGORY_COLUMN: matrix['categories'][matrix['indices']],
+        'orders': matrix['orders'],
+        'revenue': matrix['cents'] / 100,
+    })
+
+
+def compare_basket(matrix, pairs_frame, raw_matrix, raw_pairs):
+    # Daftar perbedaan antara matriks/pasangan dari struktur sparse dan jalur mentah (kosong jika identik)
+    problems = []
+    keys = ['customer_state', CATEGORY_COLUMN]
+    left = matrix_frame(matrix).astype({col: str for col in keys}).sort_values(keys, ignore_index=True)
+    right = raw_matrix.astype({col: str for col in keys}).sort_values(keys, ignore_index=True)
+    if len(left) != len(right) or not (left[keys] == right[keys]).all().all():
+        problems.append('category_state_matrix: sel berbeda')
+    elif not np.array_equal(left['orders'].to_numpy(), right['orders'].to_numpy()):
+        problems.append('category_state_matrix.orders: jumlah pesanan berbeda')
+    elif not np.allclose(left['revenue'].to_numpy(), right['revenue'].to_numpy(), rtol=1e-9, atol=0.005):
+        problems.append('category_state_matrix.revenue: pendapatan berbeda')
+
+    pair_keys = ['category_a', 'category_b']
+    left = pairs_frame[pair_keys + ['orders']].astype({col: str for col in pair_keys})
+    left = left.sort_values(pair_keys, ignore_index=True)
+    right = raw_pairs.sort_values(pair_keys, ignore_index=True)
+    if not left.equals(right.astype(left.dtypes.to_dict())):
+        problems.append('copurchase: pasangan kategori berbeda')
+    return problems
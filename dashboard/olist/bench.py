@@ -0,0 +1,669 @@
+"""Benchmark dashboard: pemuatan data, payload peta dan grafik, jalur analisis cepat vs mentah, dan skala data.
+
+    cd dashboard
+    python -m olist.bench load --repeat 3
+    python -m olist.bench map
+    python -m olist.bench charts
+    python -m olist.bench patterns
+    python -m olist.bench basket
+    python -m olist.bench distinct --scales 1 5 10
+    python -m olist.bench scale --scales 1 5 10 --out bench-report.json
+    python -m olist.bench stream --scales 1 5 10 --chunk-size 100000
+
+Setiap percobaan ``load`` dijalankan di proses baru agar waktu cold-load dan
+peak RSS tidak dipengaruhi cache milik proses sebelumnya. ``map`` mengukur
+ukuran HTML peta choropleth yang dikirim ke browser untuk beberapa toleransi
+penyederhanaan geometri (0 = geometri lokal tanpa penyederhanaan tambahan).
+``charts`` membandingkan ukuran spesifikasi JSON dan waktu build grafik Plotly
+dari data mentah dengan payload ringkas ``olist.charts`` (histogram yang sudah
+dibinning, deret waktu yang diturunkan) dan dengan cache hit (JSON tersimpan).
+``patterns`` membandingkan heatmap hari x jam dari histogram ``olist.patterns``
+dengan ekstraksi ``.dt`` dan groupby mentah untuk setiap preset tanggal dan
+filter, termasuk apakah hasil keduanya cocok. ``basket`` membandingkan peringkat
+kategori per negara bagian dari matriks sparse ``olist.basket`` (satu potongan
+baris) dengan merge pesanan-item-produk per negara bagian seperti di notebook,
+serta pasangan kategori yang dibeli bersama dengan self-merge mentah.
+``distinct`` membandingkan jumlah pesanan dan pelanggan unik dari sketsa
+HyperLogLog ``olist.sketch`` dengan ``nunique`` eksak pada dataset sintetis
+beberapa skala, untuk setiap preset tanggal dan filter: waktu, percepatan, dan
+galat relatif perkiraannya, per kueri dan untuk bagian Pesanan dan Pelanggan
+Unik secara utuh (total serta rincian per kategori dan per negara bagian,
+seperti yang dihitung dashboard).
+``scale`` membuat dataset sintetis (``olist.synth``) pada beberapa kelipatan
+ukuran lalu mengukur setiap tahap analisis di proses terpisah, sehingga titik
+di mana waktu atau memori tidak lagi tumbuh linear mudah terlihat.
+``stream`` membandingkan jalur ingest streaming (``olist.stream``) dengan
+jalur in-memory pada dataset sintetis yang sama: waktu, peak RSS, dan apakah
+hasil keduanya cocok.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+PACKAGE_PARENT = Path(__file__).resolve().parents[1]
+
+# Kode yang dijalankan di proses anak untuk setiap jalur pemuatan.
+# Import dilakukan sebelum timer agar yang terukur hanya proses pemuatan data.
+LOAD_SNIPPETS = {
+    'baseline': 'pass',
+    'csv': 'store.load_csv_tables()',
+    'store': 'store.load_store_tables()',
+}
+
+# Tahap yang diukur oleh ``scale``: (persiapan di luar timer, kode yang diukur).
+# Tahap analisis memuat tabel dari store terlebih dahulu, jadi store_build harus lebih dulu.
+ANALYSIS_SETUP = (
+    'from olist import analytics\n'
+    'tables = store.load_store_tables()\n'
+    'timestamps = tables["orders"]["order_purchase_timestamp"]\n'
+    'start_date, end_date = timestamps.min(), timestamps.max()'
+)
+SCALE_STAGES = {
+    'csv_load': ('', 'store.load_csv_tables()'),
+    'store_build': ('', 'store.build_store()'),
+    'store_load': ('', 'store.load_store_tables()'),
+    'sales_cube': (ANALYSIS_SETUP, 'analytics.sales_summary(tables["order_facts"], tables["sales_cube"], '
+                                   'start_date, end_date)'),
+    'sales_raw': (ANALYSIS_SETUP, 'analytics.sales_summary(tables["order_facts"], tables["sales_cube"], '
+                                  'start_date, end_date, use_cube=False)'),
+    'rfm': (ANALYSIS_SETUP, 'analytics.customer_rfm(tables["order_facts"], start_date, end_date)'),
+    'clusters': (ANALYSIS_SETUP + '\nrfm = analytics.customer_rfm(tables["order_facts"], start_date, end_date)',
+                 'analytics.customer_clusters(rfm)'),
+    'payments': (ANALYSIS_SETUP, 'analytics.payment_summary(tables["payment_facts"], start_date, end_date)'),
+    'delivery': (ANALYSIS_SETUP, 'analytics.delivery_summary(analytics.delivery_data(tables["delivery_facts"], '
+                                 'start_date, end_date))'),
+    'delivery_sla': (ANALYSIS_SETUP, 'analytics.delivery_sla(tables["delivery_facts"], start_date, end_date)'),
+    'reviews': (ANALYSIS_SETUP, 'analytics.review_summary(tables["review_facts"], start_date, end_date)'),
+    'sellers': (ANALYSIS_SETUP, 'analytics.seller_leaderboard(analytics.seller_stats(tables["seller_facts"], '
+                                'start_date, end_date), tables["sellers"])'),
+    'shipping': (ANALYSIS_SETUP, 'analytics.shipping_summary(tables["shipping_facts"], start_date, end_date)'),
+    'geography': (ANALYSIS_SETUP, 'analytics.customer_states(tables["customers"])'),
+    'distinct_exact': (ANALYSIS_SETUP, 'analytics.distinct_counts(tables["order_facts"], start_date, end_date)'),
+    'distinct_hll': (ANALYSIS_SETUP + '\nsketches = analytics.distinct_sketches(tables["order_facts"])',
+                     'analytics.distinct_counts(tables["order_facts"], start_date, end_date, sketches=sketches)'),
+}
+
+# Jalur yang dibandingkan oleh ``stream``, keduanya untuk seluruh rentang tanggal
+STREAM_SNIPPETS = {
+    'memory': ('from olist import analytics',
+               'tables = store.load_csv_tables()\n'
+               'timestamps = tables["orders"]["order_purchase_timestamp"]\n'
+               'analytics.compute_all(tables, timestamps.min(), timestamps.max(), use_cube=False)'),
+    'stream': ('from olist import stream', 'stream.stream_summary(chunk_size={chunk_size})'),
+}
+
+# Peak RSS diambil dari VmHWM (Linux) karena ru_maxrss ikut mewarisi puncak proses induk
+# yang menjalankan fork/exec, misalnya setelah induk membuat dataset sintetis
+CHILD_TEMPLATE = '''
+import json, resource, time
+import pandas, pyarrow
+from olist import store
+
+def peak_rss_mb():
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+{setup}
+rss_before = peak_rss_mb()
+start = time.perf_counter()
+{snippet}
+elapsed = time.perf_counter() - start
+peak = peak_rss_mb()
+print(json.dumps({{'seconds': elapsed, 'peak_rss_mb': peak, 'stage_rss_mb': peak - rss_before}}))
+'''
+
+
+def run_child(snippet, setup='', env=None):
+    result = subprocess.run(
+        [sys.executable, '-c', CHILD_TEMPLATE.format(setup=setup, snippet=snippet)],
+        cwd=PACKAGE_PARENT, capture_output=True, text=True, check=True,
+        env=None if env is None else {**os.environ, **env}
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def bench_load(repeat=3):
+    from . import store
+
+    if store.store_status() not in ('fresh', 'pending'):
+        store.build_store()
+
+    report = {}
+    for mode, snippet in LOAD_SNIPPETS.items():
+        runs = [run_child(snippet) for _ in range(repeat)]
+        report[mode] = {
+            'seconds': statistics.median(run['seconds'] for run in runs),
+            'peak_rss_mb': max(run['peak_rss_mb'] for run in runs),
+        }
+    return report
+
+
+def bench_map(tolerances, repeat=3):
+    from . import geo, store
+
+    tables, _, _ = store.load_tables()
+    customer_states = tables['customers']['customer_state'].value_counts().reset_index()
+    customer_states.columns = ['state', 'customer_count']
+
+    report = {}
+    for tolerance in tolerances:
+        geojson = geo.load_state_geojson(tolerance)
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            html = geo.state_choropleth_html(customer_states, geojson, offline=False)
+            timings.append(time.perf_counter() - start)
+        report[tolerance] = {
+            'html_kb': len(html.encode()) / 1024,
+            'offline_html_kb': len(geo.inline_assets(html).encode()) / 1024,
+            'render_ms': statistics.median(timings) * 1000,
+        }
+    return report
+
+
+def timed_ms(fn, repeat):
+    # (hasil, median waktu dalam ms) dari repeat kali pemanggilan
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - start)
+    return result, statistics.median(timings) * 1000
+
+
+def bench_charts(repeat=3):
+    import plotly.express as px
+    import plotly.io as pio
+
+    from . import analytics, charts, store
+
+    tables, _, _ = store.load_tables()
+    deliveries = analytics.delivery_data(tables['delivery_facts'], '1900-01-01', '2100-01-01')
+    orders = tables['order_facts']
+    hourly_sales = (orders.set_index(orders['order_purchase_timestamp'].dt.floor('h'))['price']
+                    .groupby(level=0).sum().rename_axis('hour').reset_index())
+
+    # Grafik -> (figure dari data mentah, figure dari payload ringkas)
+    figures = {
+        'delivery_histogram': (
+            lambda: px.histogram(deliveries, x='actual_delivery_days', nbins=charts.HISTOGRAM_BINS),
+            lambda: px.bar(charts.histogram_bins(deliveries['actual_delivery_days']), x='bin_center', y='count')
+                    .update_layout(bargap=0),
+        ),
+        'hourly_sales': (
+            lambda: px.line(hourly_sales, x='hour', y='price'),
+            lambda: px.line(charts.downsample(hourly_sales, 'price'), x='hour', y='price'),
+        ),
+    }
+
+    report = {}
+    for name, (raw, payload) in figures.items():
+        raw_spec, raw_ms = timed_ms(lambda: charts.figure_json(raw()), repeat)
+        spec, payload_ms = timed_ms(lambda: charts.figure_json(payload()), repeat)
+        # Cache hit: JSON tersimpan -> Figure tanpa validasi -> JSON yang dikirim st.plotly_chart
+        _, hit_ms = timed_ms(lambda: pio.to_json(charts.figure_from_json(spec), validate=False), repeat)
+        report[name] = {
+            'rows': len(deliveries) if name == 'delivery_histogram' else len(hourly_sales),
+            'raw_kb': len(raw_spec.encode()) / 1024,
+            'raw_ms': raw_ms,
+            'payload_kb': len(spec.encode()) / 1024,
+            'payload_ms': payload_ms,
+            'cache_hit_ms': hit_ms,
+        }
+    return report
+
+
+def bench_patterns(repeat=3):
+    from . import analytics, cube, index, patterns, store
+
+    tables, _, _ = store.load_tables()
+    order_facts = tables['order_facts']
+    histogram, build_ms = timed_ms(lambda: analytics.purchase_histogram(order_facts), 1)
+    timestamps = tables['orders']['order_purchase_timestamp']
+    category = order_facts[cube.CATEGORY_COLUMN].value_counts().index[0]
+    state = order_facts['customer_state'].value_counts().index[0]
+
+    runs = []
+    for preset in analytics.DATE_PRESETS:
+        start_date, end_date = analytics.preset_range(preset, timestamps.min(), timestamps.max())
+        rows = index.date_slice(order_facts['order_purchase_timestamp'].values, start_date, end_date)
+        for selected_category, selected_state in [(None, None), (category, None), (None, state), (category, state)]:
+            heatmap, histogram_ms = timed_ms(lambda: analytics.purchase_patterns(
+                histogram, order_facts, start_date, end_date, selected_category, selected_state), repeat)
+            raw, raw_ms = timed_ms(lambda: patterns.heatmap_from_items(
+                cube.filter_items(order_facts.iloc[rows], selected_category, selected_state)), repeat)
+            runs.append({
+                'preset': preset,
+                'category': selected_category,
+                'state': selected_state,
+                'histogram_ms': histogram_ms,
+                'raw_ms': raw_ms,
+                'match': not patterns.compare_heatmaps(heatmap, raw),
+            })
+    return {
+        'rows': len(order_facts),
+        'cells': len(histogram['hour']),
+        'histogram_mb': patterns.histogram_nbytes(histogram) / 1024 / 1024,
+        'build_ms': build_ms,
+        'runs': runs,
+    }
+
+
+def notebook_state_categories(tables, state):
+    # Peringkat kategori satu negara bagian seperti analyze_state_categories di notebook
+    import pandas as pd
+
+    customers = tables['customers']
+    state_customers = customers[customers['customer_state'] == state]['customer_id'].unique()
+    state_orders = tables['orders'][tables['orders']['customer_id'].isin(state_customers)]
+    order_items = pd.merge(state_orders[['order_id']], tables['order_items'][['order_id', 'product_id', 'price']],
+                           on='order_id', how='inner')
+    order_products = pd.merge(order_items, tables['products'], on='product_id', how='inner')
+    summary = (order_products.groupby('product_category_name_english', observed=True)
+               .agg({'price': 'sum', 'order_id': 'nunique'}).reset_index())
+    return summary.sort_values(['price', 'product_category_name_english'], ascending=[False, True],
+                               ignore_index=True)
+
+
+def bench_basket(repeat=3):
+    import numpy as np
+
+    from . import analytics, basket, cube, index, store
+
+    tables, _, _ = store.load_tables()
+    order_facts = tables['order_facts']
+    timestamps = tables['orders']['order_purchase_timestamp']
+    start_date, end_date = timestamps.min(), timestamps.max()
+    histogram, histogram_ms = timed_ms(lambda: analytics.purchase_histogram(order_facts), 1)
+    pairs, pairs_ms = timed_ms(lambda: analytics.copurchase_pairs(order_facts), 1)
+    matrix, matrix_ms = timed_ms(lambda: basket.category_state_matrix(histogram, order_facts, start_date, end_date),
+                                 repeat)
+
+    states = []
+    for state in order_facts['customer_state'].cat.categories:
+        ranking, lookup_ms = timed_ms(lambda: basket.state_ranking(matrix, state), repeat)
+        notebook, notebook_ms = timed_ms(lambda: notebook_state_categories(tables, state), repeat)
+        states.append({
+            'state': state,
+            'lookup_ms': lookup_ms,
+            'notebook_ms': notebook_ms,
+            'match': (len(ranking) == len(notebook) and
+                      np.array_equal(ranking['order_id'].to_numpy(), notebook['order_id'].to_numpy()) and
+                      np.allclose(ranking['price'].to_numpy(), notebook['price'].to_numpy())),
+        })
+
+    rows = index.date_slice(order_facts['order_purchase_timestamp'].values, start_date, end_date)
+    items = cube.filter_items(order_facts.iloc[rows])
+    copurchase, copurchase_ms = timed_ms(lambda: basket.copurchase(pairs, matrix, start_date, end_date), repeat)
+    raw_pairs, raw_ms = timed_ms(lambda: basket.copurchase_from_items(items), repeat)
+    problems = basket.compare_basket(matrix, copurchase, basket.state_matrix_from_items(items), raw_pairs)
+    return {
+        'rows': len(order_facts),
+        'matrix_cells': len(matrix['indices']),
+        'pairs': len(pairs['first']),
+        'histogram_build_ms': histogram_ms,
+        'pairs_build_ms': pairs_ms,
+        'matrix_ms': matrix_ms,
+        'copurchase_ms': copurchase_ms,
+        'copurchase_raw_ms': raw_ms,
+        'states': states,
+        'problems': problems,
+    }
+
+
+def distinct_runs(tables, repeat):
+    # Waktu sketsa vs eksak per kueri dan untuk bagian dashboard utuh pada satu dataset
+    from . import analytics, cube, index, sketch
+
+    order_facts = tables['order_facts']
+    sketches, build_ms = timed_ms(lambda: analytics.distinct_sketches(order_facts), 1)
+    timestamps = tables['orders']['order_purchase_timestamp']
+    category = order_facts[cube.CATEGORY_COLUMN].value_counts().index[0]
+    state = order_facts['customer_state'].value_counts().index[0]
+
+    # (kategori, negara bagian, rincian); rincian per kategori/negara bagian mengabaikan filter dimensi itu
+    queries = [(selected_category, selected_state, None)
+               for selected_category in [None, category] for selected_state in [None, state]]
+    queries += [(None, selected_state, 'category') for selected_state in [None, state]]
+    queries += [(selected_category, None, 'state') for selected_category in [None, category]]
+
+    runs = []
+    for preset in analytics.DATE_PRESETS:
+        start_date, end_date = analytics.preset_range(preset, timestamps.min(), timestamps.max())
+        rows = order_facts.iloc[index.date_slice(order_facts['order_purchase_timestamp'].values, start_date, end_date)]
+        for selected_category, selected_state, by in queries:
+            estimates, sketch_ms = timed_ms(lambda: sketch.distinct_estimates(
+                sketches, start_date, end_date, selected_category, selected_state, by), repeat)
+            exact, exact_ms = timed_ms(lambda: sketch.distinct_from_items(
+                cube.filter_items(rows, selected_category, selected_state), by), repeat)
+            errors = sketch.relative_errors(estimates, exact)
+            runs.append({
+                'preset': preset,
+                'category': selected_category,
+                'state': selected_state,
+                'by': by,
+                'sketch_ms': sketch_ms,
+                'exact_ms': exact_ms,
+                'max_error': {measure: float(values.max()) if len(values) else 0.0
+                              for measure, values in errors.items()},
+            })
+
+    # Bagian dashboard utuh: analytics.distinct_counts (total + rincian per kategori dan per negara bagian)
+    sections = []
+    for preset in analytics.DATE_PRESETS:
+        start_date, end_date = analytics.preset_range(preset, timestamps.min(), timestamps.max())
+        for selected_category, selected_state, _ in queries[:4]:
+            _, sketch_ms = timed_ms(lambda: analytics.distinct_counts(
+                order_facts, start_date, end_date, selected_category, selected_state, sketches), repeat)
+            _, exact_ms = timed_ms(lambda: analytics.distinct_counts(
+                order_facts, start_date, end_date, selected_category, selected_state), repeat)
+            sections.append({'preset': preset, 'category': selected_category, 'state': selected_state,
+                             'sketch_ms': sketch_ms, 'exact_ms': exact_ms})
+    return {
+        'rows': len(order_facts),
+        'orders': len(tables['orders']),
+        'cells': len(sketches['orders']['month']),
+        'sketch_mb': sketch.sketches_nbytes(sketches) / 1024 / 1024,
+        'build_ms': build_ms,
+        'standard_error': sketch.STANDARD_ERROR,
+        'runs': runs,
+        'sections': sections,
+        'presets': distinct_presets(runs, sections),
+    }
+
+
+def distinct_presets(runs, sections):
+    # Ringkasan per preset tanggal: percepatan terkecil dan median (eksak / sketsa) serta galat terbesar
+    summary = {}
+    for preset in dict.fromkeys(run['preset'] for run in runs):
+        query = [run['exact_ms'] / run['sketch_ms'] for run in runs if run['preset'] == preset]
+        section = [run['exact_ms'] / run['sketch_ms'] for run in sections if run['preset'] == preset]
+        summary[preset] = {
+            'query_speedup_min': min(query),
+            'query_speedup_median': statistics.median(query),
+            'section_speedup_min': min(section),
+            'section_speedup_median': statistics.median(section),
+            'max_error': max(max(run['max_error'].values()) for run in runs if run['preset'] == preset),
+        }
+    return summary
+
+
+def bench_distinct(scales, data_root, repeat=3, seed=0):
+    # Sketsa HyperLogLog vs nunique eksak pada dataset sintetis beberapa skala (store dibangun jika perlu)
+    from . import store
+
+    report = {'meta': bench_meta(repeat, seed), 'scales': []}
+    for scale in scales:
+        data_dir, store_dir, _ = scale_dataset(data_root, scale, seed)
+        if store.store_status(data_dir, store_dir) not in ('fresh', 'pending'):
+            store.build_store(data_dir, store_dir)
+        tables, _, _ = store.load_tables(data_dir, store_dir)
+        report['scales'].append({'scale': scale, **distinct_runs(tables, repeat)})
+        del tables
+    return report
+
+
+def scale_dataset(data_root, scale, seed=0):
+    # Dataset sintetis untuk satu skala, dipakai ulang jika sudah pernah dibuat.
+    # Mengembalikan (data_dir, store_dir, detik pembuatan).
+    from . import synth
+
+    scale_dir = data_root / f'scale-{scale:g}'
+    data_dir, store_dir = scale_dir / 'data', scale_dir / 'store'
+    start = time.perf_counter()
+    if not all((data_dir / filename).exists() for filename in synth.SOURCE_FILES.values()):
+        synth.generate(data_dir, scale, seed)
+    return data_dir, store_dir, time.perf_counter() - start
+
+
+def bench_meta(repeat, seed):
+    import numpy as np
+    import pandas as pd
+    import pyarrow
+
+    return {
+        'created_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'numpy': np.__version__,
+        'pyarrow': pyarrow.__version__,
+        'machine': platform.machine(),
+        'cpu_count': os.cpu_count(),
+        'repeat': repeat,
+        'seed': seed,
+    }
+
+
+def bench_scale(scales, data_root, repeat=1, seed=0):
+    report = {'meta': bench_meta(repeat, seed), 'scales': []}
+    for scale in scales:
+        data_dir, store_dir, generate_seconds = scale_dataset(data_root, scale, seed)
+        env = {'OLIST_DATA_DIR': str(data_dir), 'OLIST_PROCESSED_DIR': str(store_dir)}
+        stages = {}
+        for stage, (setup, snippet) in SCALE_STAGES.items():
+            runs = [run_child(snippet, setup, env) for _ in range(repeat)]
+            stages[stage] = {
+                'seconds': statistics.median(run['seconds'] for run in runs),
+                'peak_rss_mb': max(run['peak_rss_mb'] for run in runs),
+                'stage_rss_mb': max(run['stage_rss_mb'] for run in runs),
+            }
+
+        with open(store_dir / 'manifest.json') as f:
+            rows = json.load(f)['rows']
+        # Waktu per juta pesanan: konstan jika tahap tumbuh linear terhadap ukuran data
+        for result in stages.values():
+            result['ms_per_1m_orders'] = result['seconds'] * 1000 / rows['orders'] * 1_000_000
+        report['scales'].append({'scale': scale, 'rows': rows, 'generate_seconds': generate_seconds,
+                                 'stages': stages})
+    return report
+
+
+def bench_stream(scales, data_root, chunk_size, repeat=1, seed=0, check=True):
+    # Jalur in-memory vs streaming per skala; check=True membandingkan hasil keduanya di proses ini
+    # untuk seluruh rentang tanggal dan untuk satu rentang sebagian dengan filter kategori teratas
+    from . import store, stream
+
+    report = {'meta': {**bench_meta(repeat, seed), 'chunk_size': chunk_size}, 'scales': []}
+    for scale in scales:
+        data_dir, store_dir, _ = scale_dataset(data_root, scale, seed)
+        env = {'OLIST_DATA_DIR': str(data_dir), 'OLIST_PROCESSED_DIR': str(store_dir)}
+        paths = {}
+        for path, (setup, snippet) in STREAM_SNIPPETS.items():
+            runs = [run_child(snippet.format(chunk_size=chunk_size), setup, env) for _ in range(repeat)]
+            paths[path] = {
+                'seconds': statistics.median(run['seconds'] for run in runs),
+                'peak_rss_mb': max(run['peak_rss_mb'] for run in runs),
+            }
+        entry = {'scale': scale, 'paths': paths}
+
+        if check:
+            tables = store.load_csv_tables(data_dir)
+            timestamps = tables['orders']['order_purchase_timestamp']
+            first, last = timestamps.min(), timestamps.max()
+            category = tables['order_facts']['product_category_name_english'].value_counts().index[0]
+            problems = []
+            for start_date, end_date, filter_category in [(first, last, None),
+                                                          (first + (last - first) / 3, last, category)]:
+                frames, scalars, _, _ = stream.stream_summary(start_date, end_date, filter_category,
+                                                              chunk_size, data_dir)
+                problems += stream.compare_with_tables(frames, scalars, tables, start_date, end_date,
+                                                       filter_category)
+            entry['orders'] = len(tables['orders'])
+            entry['match'] = not problems
+            entry['problems'] = problems
+            del tables
+        report['scales'].append(entry)
+    return report
+
+
+def print_stream_report(report):
+    print(f'{"scale":<8}{"path":<10}{"time (s)":>12}{"peak RSS (MB)":>16}{"match":>8}')
+    for entry in report['scales']:
+        match = {True: 'ya', False: 'TIDAK'}.get(entry.get('match'), '-')
+        for path, result in entry['paths'].items():
+            print(f'{entry["scale"]:<8g}{path:<10}{result["seconds"]:>12.3f}{result["peak_rss_mb"]:>16.1f}{match:>8}')
+        for problem in entry.get('problems', []):
+            print(f'  {problem}')
+
+
+def print_scale_report(report):
+    print(f'{"scale":<8}{"stage":<14}{"time (s)":>12}{"ms/1M orders":>14}{"peak RSS (MB)":>16}{"stage RSS (MB)":>16}')
+    for entry in report['scales']:
+        for stage, result in entry['stages'].items():
+            print(f'{entry["scale"]:<8g}{stage:<14}{result["seconds"]:>12.3f}{result["ms_per_1m_orders"]:>14.1f}'
+                  f'{result["peak_rss_mb"]:>16.1f}{result["stage_rss_mb"]:>16.1f}')
+
+
+def print_map_report(report):
+    print(f'{"tolerance":<10}{"HTML (KB)":>12}{"offline (KB)":>14}{"render (ms)":>14}')
+    for tolerance, result in report.items():
+        print(f'{tolerance:<10}{result["html_kb"]:>12.1f}{result["offline_html_kb"]:>14.1f}'
+              f'{result["render_ms"]:>14.1f}')
+
+
+def print_charts_report(report):
+    print(f'{"chart":<20}{"rows":>8}{"raw (KB)":>10}{"raw (ms)":>10}{"payload (KB)":>14}{"payload (ms)":>14}'
+          f'{"cache hit (ms)":>16}')
+    for name, result in report.items():
+        print(f'{name:<20}{result["rows"]:>8}{result["raw_kb"]:>10.1f}{result["raw_ms"]:>10.1f}'
+              f'{result["payload_kb"]:>14.1f}{result["payload_ms"]:>14.1f}{result["cache_hit_ms"]:>16.1f}')
+
+
+def print_patterns_report(report):
+    print(f'Histogram: {report["cells"]:,} sel dari {report["rows"]:,} baris order_facts, '
+          f'{report["histogram_mb"]:.1f} MB, dibangun dalam {report["build_ms"]:.1f} ms')
+    print(f'{"preset":<18}{"category":<24}{"state":<8}{"histogram (ms)":>16}{"raw (ms)":>10}{"match":>7}')
+    for run in report['runs']:
+        print(f'{run["preset"]:<18}{run["category"] or "all":<24}{run["state"] or "all":<8}'
+              f'{run["histogram_ms"]:>16.2f}{run["raw_ms"]:>10.2f}{"ya" if run["match"] else "TIDAK":>7}')
+
+
+def print_basket_report(report):
+    print(f'{report["rows"]:,} baris order_facts: histogram {report["histogram_build_ms"]:.1f} ms, '
+          f'{report["pairs"]:,} pasangan kategori {report["pairs_build_ms"]:.1f} ms (sekali per versi data)')
+    print(f'Matriks kategori x negara bagian ({report["matrix_cells"]:,} sel terisi): {report["matrix_ms"]:.2f} ms; '
+          f'pasangan kategori {report["copurchase_ms"]:.2f} ms (self-merge mentah {report["copurchase_raw_ms"]:.2f} ms)')
+    print(f'{"state":<8}{"row lookup (ms)":>16}{"notebook merge (ms)":>21}{"match":>7}')
+    for run in report['states']:
+        print(f'{run["state"]:<8}{run["lookup_ms"]:>16.2f}{run["notebook_ms"]:>21.2f}'
+              f'{"ya" if run["match"] else "TIDAK":>7}')
+    for problem in report['problems']:
+        print(f'  {problem}')
+
+
+def print_distinct_report(report):
+    # Percepatan = waktu eksak / waktu sketsa: per kueri (8 kombinasi filter dan rincian) dan untuk bagian
+    # Pesanan dan Pelanggan Unik utuh (4 kombinasi filter); detail setiap kueri ada di laporan JSON
+    for entry in report['scales']:
+        print(f'Skala {entry["scale"]:g}: {entry["orders"]:,} pesanan, sketsa {entry["cells"]:,} sel '
+              f'{entry["sketch_mb"]:.1f} MB dibangun dalam {entry["build_ms"]:.0f} ms '
+              f'(galat standar {entry["standard_error"] * 100:.1f}%)')
+        print(f'  {"preset":<18}{"kueri min":>10}{"median":>8}{"bagian min":>12}{"median":>8}{"galat maks":>12}')
+        for preset, summary in entry['presets'].items():
+            print(f'  {preset:<18}{summary["query_speedup_min"]:>9.1f}x{summary["query_speedup_median"]:>7.1f}x'
+                  f'{summary["section_speedup_min"]:>11.1f}x{summary["section_speedup_median"]:>7.1f}x'
+                  f'{summary["max_error"] * 100:>11.2f}%')
+
+
+def print_load_report(report):
+    print(f'{"mode":<10}{"cold load (s)":>16}{"peak RSS (MB)":>16}')
+    for mode, result in report.items():
+        print(f'{mode:<10}{result["seconds"]:>16.3f}{result["peak_rss_mb"]:>16.1f}')
+    if 'csv' in report and 'store' in report:
+        speedup = report['csv']['seconds'] / report['store']['seconds']
+        print(f'Store {speedup:.1f}x lebih cepat dari CSV')
+
+
+def add_command(subparsers, name, help, repeat=3, scales=None):
+    # Subperintah dengan opsi bersama semua benchmark; dengan `scales`, benchmark berjalan pada
+    # dataset sintetis beberapa skala (--scales, --data-root, --seed)
+    command = subparsers.add_parser(name, help=help)
+    if scales:
+        command.add_argument('--scales', type=float, nargs='+', default=scales,
+                             help=f'Kelipatan ukuran dataset publik Olist (default: {" ".join(map(str, scales))})')
+        command.add_argument('--data-root', help='Direktori dataset sintetis, default processed_data/bench')
+        command.add_argument('--seed', type=int, default=0)
+    command.add_argument('--repeat', type=int, default=repeat)
+    command.add_argument('--out', help='Tulis laporan JSON ke file ini')
+    command.add_argument('--json', action='store_true', help='Cetak hasil sebagai JSON')
+    return command
+
+
+def write_report(report, args, print_report, ok=True):
+    # Laporan ke --out dan ke layar (JSON atau tabel); keluar dengan status 1 jika hasil tidak cocok
+    if args.out:
+        with open(args.out, 'w') as f:
+            json.dump(report, f, indent=2)
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+    if not ok:
+        sys.exit(1)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m olist.bench', description='Benchmark dashboard Olist.')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    add_command(subparsers, 'load', 'Bandingkan cold-load CSV dan store Parquet')
+    map_parser = add_command(subparsers, 'map', 'Ukur payload HTML peta choropleth per toleransi')
+    map_parser.add_argument('--tolerance', type=float, nargs='+', default=None,
+                            help='Toleransi penyederhanaan dalam derajat (default: 0 dan OLIST_GEO_TOLERANCE)')
+    add_command(subparsers, 'charts', 'Ukur payload dan waktu build grafik Plotly')
+    add_command(subparsers, 'patterns', 'Bandingkan heatmap dari histogram dengan groupby mentah')
+    add_command(subparsers, 'basket', 'Bandingkan peringkat kategori per negara bagian dari matriks sparse '
+                                      'dengan merge ala notebook')
+    add_command(subparsers, 'distinct', 'Bandingkan hitungan unik dari sketsa HyperLogLog dengan nunique eksak '
+                                        'pada dataset sintetis', scales=[1, 5, 10])
+    add_command(subparsers, 'scale', 'Ukur setiap tahap analisis pada dataset sintetis', repeat=1,
+                scales=[1, 5, 10])
+    stream_parser = add_command(subparsers, 'stream', 'Bandingkan jalur ingest streaming dengan in-memory',
+                                repeat=1, scales=[1, 5])
+    stream_parser.add_argument('--chunk-size', type=int, default=None,
+                               help='Jumlah baris CSV per potongan (default OLIST_STREAM_CHUNK_SIZE)')
+    stream_parser.add_argument('--no-check', action='store_true',
+                               help='Lewati pemeriksaan hasil (butuh memori sebesar jalur in-memory)')
+
+    args = parser.parse_args(argv)
+
+    from .config import GEO_TOLERANCE, PROCESSED_DIR, STREAM_CHUNK_SIZE
+
+    data_root = Path(args.data_root) if getattr(args, 'data_root', None) else PROCESSED_DIR / 'bench'
+    # Subperintah -> (jalankan benchmark, cetak laporan, apakah hasil cocok)
+    commands = {
+        'load': (lambda: bench_load(args.repeat), print_load_report, None),
+        'map': (lambda: bench_map(args.tolerance or sorted({0.0, GEO_TOLERANCE}), args.repeat),
+                print_map_report, None),
+        'charts': (lambda: bench_charts(args.repeat), print_charts_report, None),
+        'patterns': (lambda: bench_patterns(args.repeat), print_patterns_report,
+                     lambda report: all(run['match'] for run in report['runs'])),
+        'basket': (lambda: bench_basket(args.repeat), print_basket_report,
+                   lambda report: not report['problems'] and all(run['match'] for run in report['states'])),
+        'distinct': (lambda: bench_distinct(args.scales, data_root, args.repeat, args.seed),
+                     print_distinct_report, None),
+        'scale': (lambda: bench_scale(args.scales, data_root, args.repeat, args.seed), print_scale_report, None),
+        'stream': (lambda: bench_stream(args.scales, data_root, args.chunk_size or STREAM_CHUNK_SIZE, args.repeat,
+                                        args.seed, check=not args.no_check),
+                   print_stream_report,
+                   lambda report: all(entry.get('match') is not False for entry in report['scales'])),
+    }
+    run, print_report, check = commands[args.command]
+    report = run()
+    write_report(report, args, print_report, check is None or check(report))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,94 @@
+"""Payload grafik Plotly yang ringkas untuk dashboard.
+
+Plotly Express menyalin setiap baris input ke spesifikasi JSON yang dikirim ke
+browser. Modul ini meringkas data di server sebelum figure dibangun:
+histogram dibinning dengan NumPy sehingga yang dikirim hanya jumlah per bin
+(bukan setiap nilai mentah), dan deret waktu yang panjang diturunkan menjadi
+paling banyak ``MAX_POINTS`` titik dengan mempertahankan nilai minimum dan
+maksimum setiap kelompok sehingga puncak dan lembah tetap terlihat.
+
+``figure_json`` menserialisasi figure menjadi JSON. Dashboard menyimpan hasilnya
+di cache per status filter, sehingga figure yang tidak berubah tidak dibangun
+ulang dan spesifikasinya identik byte per byte antar-rerun; Streamlit lalu
+mengirimnya sebagai referensi hash, bukan pesan penuh (lihat
+``dashboard/.streamlit/config.toml``).
+"""
+import json
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+import plotly.io as pio
+
+# Batas jumlah titik deret waktu yang dikirim ke browser
+MAX_POINTS = 500
+
+HISTOGRAM_BINS = 20
+
+# Kelipatan lebar bin "bulat" (x 10^k), seperti auto-bin plotly.js
+NICE_STEPS = (1, 2, 2.5, 5, 10)
+
+
+def nice_width(span, nbins):
+    # Lebar bin bulat terkecil yang membagi span menjadi paling banyak nbins bin
+    raw = span / max(nbins, 1)
+    if not raw > 0:
+        return 1.0
+    magnitude = 10.0 ** np.floor(np.log10(raw))
+    for step in NICE_STEPS:
+        if raw <= step * magnitude:
+            return step * magnitude
+    return 10 * magnitude
+
+
+def histogram_bins(values, nbins=HISTOGRAM_BINS):
+    # Jumlah nilai per bin berlebar sama (NaN dibuang) dari satu np.bincount. Batas bin adalah
+    # kelipatan lebar bin; nilai bulat selalu memakai lebar bin bulat (minimal 1).
+    values = np.asarray(values, dtype=np.float64)
+    values = values[~np.isnan(values)]
+    columns = ['bin_start', 'bin_end', 'bin_center', 'count']
+    if len(values) == 0:
+        return pd.DataFrame(columns=columns)
+
+    low, high = values.min(), values.max()
+    width = nice_width(high - low, nbins)
+    if np.all(values == np.round(values)):
+        width = max(np.ceil(width), 1.0)
+    start = np.floor(low / width) * width
+    codes = ((values - start) // width).astype(np.int64)
+    counts = np.bincount(codes)
+    edges = np.round(start + np.arange(len(counts) + 1) * width, 10)
+    return pd.DataFrame({
+        'bin_start': edges[:-1],
+        'bin_end': edges[1:],
+        'bin_center': edges[:-1] + width / 2,
+        'count': counts,
+    })
+
+
+def downsample(frame, y, max_points=MAX_POINTS):
+    # Paling banyak max_points baris dari frame yang terurut menurut sumbu x: baris dibagi menjadi
+    # max_points / 2 kelompok berurutan dan setiap kelompok menyimpan baris dengan y minimum dan
+    # maksimumnya; baris pertama dan terakhir selalu disimpan
+    n = len(frame)
+    if n <= max_points:
+        return frame
+    buckets = max(max_points // 2, 1)
+    groups = np.arange(n) * buckets // n
+    # NaN diurutkan terakhir oleh lexsort, jadi hanya muncul sebagai maksimum kelompok yang semuanya NaN
+    order = np.lexsort((frame[y].to_numpy(np.float64), groups))
+    starts = np.searchsorted(groups, np.arange(buckets))
+    ends = np.append(starts[1:], n) - 1
+    keep = np.unique(np.concatenate([order[starts], order[ends], [0, n - 1]]))
+    return frame.iloc[keep]
+
+
+def figure_json(fig):
+    # Spesifikasi JSON figure (tanpa validasi ulang; figure Plotly Express sudah valid)
+    return pio.to_json(fig, validate=False)
+
+
+def figure_from_json(spec):
+    # Figure dari spesifikasi figure_json tanpa validasi ulang: st.plotly_chart memvalidasi ulang
+    # setiap dict (~5-10 ms per grafik), tetapi tidak objek Figure
+    return go.Figure(json.loads(spec), _validate=False)
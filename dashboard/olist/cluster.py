@@ -0,0 +1,137 @@
+"""Klasterisasi pelanggan (K-Means mini-batch) atas metrik RFM dengan NumPy.
+
+Pengganti ``create_customer_clusters`` di notebook tanpa dependensi ML:
+fitur recency (dibalik, makin baru makin besar), frequency, dan monetary
+diskalakan ke [0, 1], lalu dikelompokkan dengan K-Means mini-batch (Sculley,
+2010): setiap iterasi hanya menugaskan satu batch acak ke pusat terdekat dan
+menggeser pusat dengan laju belajar 1/jumlah titik per pusat, sehingga waktu
+fit tidak bergantung pada jumlah pelanggan. Penugasan akhir semua pelanggan
+adalah satu perkalian matriks (jarak kuadrat via ``|x|^2 - 2 x.c + |c|^2``).
+
+Pusat dari fit sebelumnya (misalnya rentang tanggal lain) bisa dipakai sebagai
+titik awal (warm start) sehingga fit berhenti setelah sedikit iterasi. Klaster
+selalu diurutkan dari nilai fitur terendah ke tertinggi agar label stabil
+antar-fit.
+"""
+import numpy as np
+import pandas as pd
+
+N_CLUSTERS = 4
+
+# Nama klaster dari notebook untuk k=4, urut dari nilai terendah ke tertinggi
+CLUSTER_NAMES = ['Dormant Customers', 'Risk to Lose', 'Promising Customers', 'Loyal Customers']
+
+BATCH_SIZE = 2048
+MAX_ITER = 100
+# Iterasi berhenti jika total pergeseran pusat (kuadrat, skala [0, 1]) di bawah nilai ini
+TOL = 1e-6
+# Sampel untuk inisialisasi k-means++ (fit dingin)
+INIT_SAMPLE = 10_000
+SEED = 0
+
+
+def cluster_features(rfm):
+    # Matriks fitur (n, 3) dalam [0, 1]: recency dibalik, frequency dan monetary dengan log1p
+    # karena distribusinya sangat miring (min-max langsung menumpuk hampir semua pelanggan di 0)
+    recency = rfm['recency'].to_numpy(np.float64)
+    features = np.column_stack([
+        recency.max() - recency,
+        np.log1p(rfm['frequency'].to_numpy(np.float64)),
+        np.log1p(rfm['monetary'].to_numpy(np.float64)),
+    ])
+    low, high = features.min(axis=0), features.max(axis=0)
+    span = np.where(high > low, high - low, 1.0)
+    return (features - low) / span
+
+
+def nearest(X, centers):
+    # Indeks pusat terdekat dan jarak kuadratnya untuk setiap baris X
+    distances = (X * X).sum(axis=1)[:, None] - 2 * X @ centers.T + (centers * centers).sum(axis=1)[None, :]
+    labels = distances.argmin(axis=1)
+    return labels, np.maximum(distances[np.arange(len(X)), labels], 0)
+
+
+def kmeans_plus_plus(X, k, rng):
+    # Inisialisasi k-means++ pada sampel: pusat berikutnya dipilih dengan peluang sebanding jarak kuadrat
+    sample = X[rng.choice(len(X), min(len(X), INIT_SAMPLE), replace=False)]
+    centers = [sample[rng.integers(len(sample))]]
+    closest = ((sample - centers[0]) ** 2).sum(axis=1)
+    for _ in range(1, k):
+        total = closest.sum()
+        if total == 0:
+            break
+        centers.append(sample[rng.choice(len(sample), p=closest / total)])
+        closest = np.minimum(closest, ((sample - centers[-1]) ** 2).sum(axis=1))
+    return np.array(centers)
+
+
+def fit(X, k=N_CLUSTERS, init=None, batch_size=BATCH_SIZE, max_iter=MAX_ITER, tol=TOL, seed=SEED):
+    # Pusat klaster (k, d) dengan K-Means mini-batch. init: pusat awal (k, d) untuk warm start atau None.
+    # Mengembalikan (centers, n_iter); k bisa lebih kecil jika titik unik kurang dari k.
+    rng = np.random.default_rng(seed)
+    warm = init is not None
+    centers = np.array(init, dtype=np.float64) if warm else kmeans_plus_plus(X, k, rng)
+    k = len(centers)
+
+    # Pusat warm start diberi bobot awal satu batch per pusat agar tidak langsung tertimpa batch pertama
+    counts = np.full(k, float(batch_size) if warm else 0.0)
+    n_iter = 0
+    for n_iter in range(1, max_iter + 1):
+        batch = X[rng.integers(0, len(X), min(batch_size, len(X)))]
+        labels, _ = nearest(batch, centers)
+        batch_counts = np.bincount(labels, minlength=k).astype(np.float64)
+        batch_sums = np.stack([np.bincount(labels, weights=batch[:, j], minlength=k)
+                               for j in range(X.shape[1])], axis=1)
+
+        # c <- c + (jumlah batch - n_batch * c) / n_total: rata-rata berjalan per pusat
+        counts += batch_counts
+        moved = batch_counts > 0
+        step = (batch_sums[moved] - batch_counts[moved, None] * centers[moved]) / counts[moved, None]
+        centers[moved] += step
+        if (step * step).sum() < tol:
+            break
+    return centers, n_iter
+
+
+def order_centers(centers):
+    # Pusat diurutkan berdasarkan jumlah fitur (nilai pelanggan) dari rendah ke tinggi
+    return centers[np.argsort(centers.sum(axis=1), kind='stable')]
+
+
+def cluster_names(k):
+    if k == len(CLUSTER_NAMES):
+        return list(CLUSTER_NAMES)
+    return [f'Cluster {i + 1}' for i in range(k)]
+
+
+def cluster_customers(rfm, k=N_CLUSTERS, init=None):
+    # Mengembalikan (labels, centers, info): label klaster per pelanggan (Categorical terurut
+    # sesuai baris rfm), pusat terurut untuk warm start berikutnya, dan info fit
+    X = cluster_features(rfm)
+    warm = init is not None and init.shape == (k, X.shape[1])
+    centers, n_iter = fit(X, k, init if warm else None)
+    centers = order_centers(centers)
+    codes, distances = nearest(X, centers)
+    labels = pd.Categorical.from_codes(codes, categories=cluster_names(len(centers)), ordered=True)
+    info = {'n_iter': n_iter, 'inertia': float(distances.sum()), 'warm_start': warm}
+    return labels, centers, info
+
+
+def cluster_profiles(rfm, labels):
+    # Rata-rata metrik RFM dan jumlah pelanggan per klaster (klaster kosong tidak ditampilkan)
+    profiles = rfm[['recency', 'frequency', 'monetary', 'rfm_score']].groupby(
+        labels, observed=True).mean().reset_index(names='cluster')
+    profiles.insert(1, 'customer_count', pd.Series(labels).value_counts(sort=False)
+                    .loc[profiles['cluster']].to_numpy())
+    return profiles
+
+
+def radar_profiles(profiles):
+    # Profil dinormalisasi ke [0, 1] per metrik untuk radar chart; recency dibalik (makin baru makin tinggi)
+    result = profiles[['cluster']].copy()
+    for col in ['recency', 'frequency', 'monetary']:
+        values = profiles[col]
+        span = values.max() - values.min()
+        result[col] = (values - values.min()) / span if span > 0 else 1.0
+    result['recency'] = 1 - result['recency']
+    return result
@@ -0,0 +1,58 @@
+import os
+from pathlib import Path
+
+# Direktori root repositori (dashboard/olist/config.py -> root)
+ROOT_DIR = Path(__file__).resolve().parents[2]
+
+# Lokasi data mentah dan data hasil proses, bisa diganti lewat environment variable
+DATA_DIR = Path(os.getenv('OLIST_DATA_DIR', ROOT_DIR / 'data'))
+PROCESSED_DIR = Path(os.getenv('OLIST_PROCESSED_DIR', ROOT_DIR / 'processed_data'))
+
+# Tab Tren Penjualan memakai kubus agregat (OLIST_USE_CUBE=0 untuk jalur mentah);
+# OLIST_CHECK_CUBE=1 membandingkan hasil kubus dengan perhitungan mentah di setiap rerun
+USE_CUBE = os.getenv('OLIST_USE_CUBE', '1') != '0'
+CHECK_CUBE = os.getenv('OLIST_CHECK_CUBE', '0') == '1'
+
+# Batas negara bagian Brasil yang disertakan di repositori (tanpa akses jaringan), dan toleransi
+# penyederhanaan geometri dalam derajat (0 = tanpa penyederhanaan)
+GEOJSON_PATH = Path(__file__).resolve().parent / 'assets' / 'brazil_states.geojson'
+GEO_TOLERANCE = float(os.getenv('OLIST_GEO_TOLERANCE', '0.02'))
+
+# Leaflet dan d3 disisipkan dari assets/ ke HTML peta sehingga peta tidak bergantung pada CDN;
+# OLIST_MAP_OFFLINE=0 memuat keduanya dari CDN (HTML peta lebih kecil, butuh internet di browser)
+MAP_OFFLINE = os.getenv('OLIST_MAP_OFFLINE', '1') == '1'
+
+# Dashboard hanya menjalankan bagian analisis yang sedang dibuka (OLIST_LAZY_SECTIONS=0 untuk
+# kembali ke st.tabs yang menjalankan semua bagian di setiap rerun)
+LAZY_SECTIONS = os.getenv('OLIST_LAZY_SECTIONS', '1') != '0'
+
+# Kolom ID dimuat sebagai categorical dengan kamus bersama per entitas (kunci integer padat);
+# OLIST_COMPACT_IDS=0 mengembalikannya sebagai string biasa
+COMPACT_IDS = os.getenv('OLIST_COMPACT_IDS', '1') != '0'
+
+# Jumlah baris CSV per potongan pada jalur ingest streaming (olist.stream)
+STREAM_CHUNK_SIZE = int(os.getenv('OLIST_STREAM_CHUNK_SIZE', '100000'))
+
+# Backend kueri dashboard: 'pandas' (tabel in-memory, implementasi acuan), 'duckdb', atau 'sqlite'
+# (basis data lokal dari `python -m olist.sql build`, lihat olist/sql.py), atau 'stream' (CSV dibaca
+# per potongan untuk setiap filter tanpa memuat tabel penuh, lihat olist/stream.py)
+QUERY_BACKEND = os.getenv('OLIST_QUERY_BACKEND', 'pandas')
+
+# Instrumentasi per rerun (olist/instrument.py): OLIST_INSTRUMENT=1 mencatat waktu, baris, dan memori
+# setiap tahap ke panel debug sidebar dan log JSON lines; OLIST_PROFILE_EVERY=N menjalankan cProfile
+# untuk satu dari setiap N rerun (0 = tidak pernah)
+INSTRUMENT = os.getenv('OLIST_INSTRUMENT', '0') == '1'
+INSTRUMENT_MEMORY = os.getenv('OLIST_INSTRUMENT_MEMORY', '1') != '0'
+INSTRUMENT_LOG = Path(os.getenv('OLIST_INSTRUMENT_LOG', PROCESSED_DIR / 'logs' / 'reruns.jsonl'))
+PROFILE_EVERY = int(os.getenv('OLIST_PROFILE_EVERY', '0'))
+
+# Cache hasil bersama di disk untuk semua worker/replika dashboard (olist/results.py): OLIST_RESULT_CACHE=1
+# mengaktifkannya; ukuran totalnya dibatasi OLIST_RESULT_CACHE_MB (entri yang paling lama tidak dipakai
+# dibuang lebih dulu)
+RESULT_CACHE = os.getenv('OLIST_RESULT_CACHE', '0') == '1'
+RESULT_CACHE_DIR = Path(os.getenv('OLIST_RESULT_CACHE_DIR', PROCESSED_DIR / 'result_cache'))
+RESULT_CACHE_MB = float(os.getenv('OLIST_RESULT_CACHE_MB', '512'))
+
+# Jumlah pesanan dan pelanggan unik di tab Tren Penjualan: eksak (nunique) atau perkiraan dari sketsa
+# HyperLogLog (olist/sketch.py). OLIST_APPROX_DISTINCT=1 membuat perkiraan menjadi pilihan awal sakelar sidebar.
+APPROX_DISTINCT = os.getenv('OLIST_APPROX_DISTINCT', '0') == '1'
@@ -0,0 +1,156 @@
+"""Kubus agregat penjualan untuk KPI dan grafik tab Tren Penjualan.
+
+Kubus berbutir (bulan pembelian, kategori, negara bagian pelanggan, metode
+pembayaran utama) dengan ukuran aditif: total pendapatan, jumlah item, dan
+jumlah pesanan. Baris rollup dengan kategori ``ALL_CATEGORIES`` menyimpan
+jumlah pesanan unik lintas kategori, karena satu pesanan bisa berisi item dari
+beberapa kategori sehingga jumlah pesanan per kategori tidak bisa dijumlahkan.
+
+Bulan yang hanya sebagian tercakup rentang tanggal dihitung dari baris mentah
+``order_facts`` (yang sudah terurut berdasarkan waktu), lalu digabung dengan
+sel kubus bulan-bulan penuh. Hasilnya sama dengan perhitungan mentah; ukuran
+yang tidak bisa dijawab kubus (misalnya pelanggan unik) tetap memakai jalur
+mentah.
+"""
+import numpy as np
+import pandas as pd
+
+ALL_CATEGORIES = '__all__'
+
+CATEGORY_COLUMN = 'product_category_name_english'
+DIMENSIONS = ['purchase_month', CATEGORY_COLUMN, 'customer_state', 'order_payment_type']
+
+
+def aggregate_cells(items):
+    # Agregasi item ke sel kubus, termasuk baris rollup semua kategori
+    measures = {
+        'revenue': ('price', 'sum'),
+        'item_count': ('price', 'size'),
+        'order_count': ('order_id', 'nunique'),
+    }
+    per_category = items.groupby(DIMENSIONS, observed=True, dropna=False).agg(**measures).reset_index()
+
+    rollup_dims = [dim for dim in DIMENSIONS if dim != CATEGORY_COLUMN]
+    rollup = items.groupby(rollup_dims, observed=True, dropna=False).agg(**measures).reset_index()
+    rollup[CATEGORY_COLUMN] = ALL_CATEGORIES
+
+    cells = pd.concat([per_category, rollup[per_category.columns]], ignore_index=True)
+    cells['purchase_month'] = cells['purchase_month'].astype(str)
+    return cells
+
+
+def build_sales_cube(order_facts):
+    return aggregate_cells(order_facts[order_facts['has_item']])
+
+
+def split_date_range(order_facts, rows):
+    # Pecah potongan baris rentang tanggal (hasil index.date_slice) menjadi bulan penuh
+    # (dijawab kubus) dan potongan baris mentah di tepi rentang
+    timestamps = order_facts['order_purchase_timestamp'].values
+    lo, hi = rows.start, rows.stop
+
+    months = order_facts['purchase_month'].cat.categories
+    month_starts = np.searchsorted(timestamps, pd.to_datetime(months).values, side='left')
+    month_ends = np.append(month_starts[1:], len(timestamps))
+
+    is_full = (month_starts >= lo) & (month_ends <= hi) & (month_ends > month_starts)
+    if not is_full.any():
+        return [], [order_facts.iloc[lo:hi]]
+
+    first_full = month_starts[is_full][0]
+    last_full = month_ends[is_full][-1]
+    edges = [order_facts.iloc[lo:first_full], order_facts.iloc[last_full:hi]]
+    return list(months[is_full]), edges
+
+
+def filter_items(items, category=None, state=None):
+    items = items[items['has_item']]
+    if category is not None:
+        items = items[items[CATEGORY_COLUMN] == category]
+    if state is not None:
+        items = items[items['customer_state'] == state]
+    return items
+
+
+def sales_summary_from_cube(cube, order_facts, rows, category=None, state=None):
+    months, edges = split_date_range(order_facts, rows)
+
+    cells = cube[cube['purchase_month'].isin(months)]
+    if state is not None:
+        cells = cells[cells['customer_state'] == state]
+    total_cells = cells[cells[CATEGORY_COLUMN] == (ALL_CATEGORIES if category is None else category)]
+    category_cells = cells[cells[CATEGORY_COLUMN] != ALL_CATEGORIES]
+    if category is not None:
+        category_cells = total_cells
+
+    monthly_sales = total_cells.groupby('purchase_month', observed=True)['revenue'].sum().reset_index()
+    monthly_sales.columns = ['month', 'price']
+
+    category_sales = category_cells.groupby(CATEGORY_COLUMN, observed=True).agg(
+        price=('revenue', 'sum'),
+        order_id=('order_count', 'sum')
+    ).reset_index()
+
+    summary = {
+        'total_orders': int(total_cells['order_count'].sum()),
+        'total_sales': total_cells['revenue'].sum(),
+        'monthly_sales': monthly_sales,
+        'category_sales': category_sales,
+    }
+
+    # Potongan tepi dihitung mentah lalu dijumlahkan; pesanan di bulan berbeda saling lepas
+    # sehingga jumlah pesanan unik tetap aditif
+    edge_items = pd.concat(edges)
+    edge_items = filter_items(edge_items, category, state)
+    if len(edge_items) > 0:
+        edge_summary = sales_summary_from_items(edge_items)
+        summary['total_orders'] += edge_summary['total_orders']
+        summary['total_sales'] += edge_summary['total_sales']
+        summary['monthly_sales'] = (pd.concat([summary['monthly_sales'], edge_summary['monthly_sales']])
+                                    .sort_values('month', ignore_index=True))
+        summary['category_sales'] = (pd.concat([summary['category_sales'], edge_summary['category_sales']])
+                                     .groupby(CATEGORY_COLUMN, observed=True, as_index=False).sum())
+    return summary
+
+
+def sales_summary_from_items(filtered_items):
+    # Jalur mentah: filtered_items adalah baris order_facts yang sudah difilter
+    total_orders = filtered_items['order_id'].nunique()
+    total_sales = filtered_items['price'].sum()
+
+    monthly_sales = filtered_items.groupby('purchase_month', observed=True)['price'].sum().reset_index()
+    monthly_sales.columns = ['month', 'price']
+    monthly_sales['month'] = monthly_sales['month'].astype(str)
+
+    category_sales = filtered_items.groupby(CATEGORY_COLUMN, observed=True).agg({
+        'price': 'sum',
+        'order_id': 'nunique'
+    }).reset_index()
+
+    return {
+        'total_orders': total_orders,
+        'total_sales': total_sales,
+        'monthly_sales': monthly_sales,
+        'category_sales': category_sales,
+    }
+
+
+def compare_summaries(cube_summary, raw_summary):
+    # Daftar perbedaan antara hasil kubus dan hasil mentah (kosong jika identik)
+    problems = []
+    if cube_summary['total_orders'] != raw_summary['total_orders']:
+        problems.append(f"total_orders: {cube_summary['total_orders']} != {raw_summary['total_orders']}")
+    if not np.isclose(cube_summary['total_sales'], raw_summary['total_sales']):
+        problems.append(f"total_sales: {cube_summary['total_sales']} != {raw_summary['total_sales']}")
+
+    for key in ['monthly_sales', 'category_sales']:
+        left, right = cube_summary[key], raw_summary[key]
+        first_col = left.columns[0]
+        merged = pd.merge(left, right, on=first_col, how='outer', suffixes=('_cube', '_raw'), indicator=True)
+        if (merged['_merge'] != 'both').any():
+            problems.append(f'{key}: baris tidak cocok pada kolom {first_col}')
+            continue
+        for col in left.columns[1:]:
+            if not np.allclose(merged[f'{col}_cube'], merged[f'{col}_raw']):
+                problems.append(f'{key}.{col}: nilai berbeda')
+    return problems
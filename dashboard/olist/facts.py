@@ -0,0 +1,104 @@
+"""Tabel fakta yang sudah digabung (denormalized) untuk dipakai semua tab.
+
+``order_facts`` berbutir item pesanan: setiap baris adalah satu item beserta
+atribut pesanan, pelanggan, kategori produk, total pembayaran pesanan, dan
+metode pembayaran utama pesanan. Pesanan tanpa item tetap muncul satu baris
+dengan kolom item kosong, sehingga analisis tingkat pesanan (RFM) tidak
+kehilangan data. Baris diurutkan berdasarkan waktu pembelian.
+
+``payment_facts`` berbutir baris pembayaran dengan atribut pesanan yang sama,
+untuk analisis metode pembayaran dan cicilan yang memang per transaksi.
+
+``delivery_facts`` berisi durasi pengiriman pesanan terkirim per (pesanan,
+penjual), lihat ``olist.delivery``.
+
+``shipping_facts`` berbutir item pesanan dengan jarak penjual-pelanggan,
+ongkos kirim, dan lama pengiriman, lihat ``olist.spatial``. Tabel ini hanya
+dibangun jika tabel ``geolocation`` tersedia.
+
+``review_facts`` berisi ulasan beserta penjual, kategori, dan selisih hari
+pengiriman pesanannya, lihat ``olist.reviews``.
+
+``seller_facts`` berbutir (pesanan, penjual, kategori) dengan pendapatan,
+skor ulasan, dan keterlambatan untuk papan peringkat penjual, lihat
+``olist.sellers``.
+"""
+import pandas as pd
+
+from .delivery import build_delivery_facts
+from .reviews import build_review_facts
+from .sellers import build_seller_facts
+from .spatial import build_shipping_facts
+
+ORDER_COLUMNS = ['order_id', 'customer_id', 'order_status', 'order_purchase_timestamp']
+CUSTOMER_COLUMNS = ['customer_id', 'customer_unique_id', 'customer_state', 'customer_city']
+
+
+def build_order_context(tables):
+    # Atribut pesanan + lokasi pelanggan, satu baris per pesanan
+    orders = pd.merge(
+        tables['orders'][ORDER_COLUMNS],
+        tables['customers'][CUSTOMER_COLUMNS],
+        on='customer_id',
+        how='left'
+    )
+    orders['purchase_month'] = orders['order_purchase_timestamp'].dt.strftime('%Y-%m').astype('category')
+    return orders
+
+
+def build_order_facts(tables, orders=None):
+    orders = build_order_context(tables) if orders is None else orders
+
+    payments = tables['order_payments']
+    order_payment_value = payments.groupby('order_id', observed=True)['payment_value'].sum()
+    order_payment_value.name = 'order_payment_value'
+
+    # Metode pembayaran utama: baris pembayaran dengan nilai terbesar di setiap pesanan
+    order_payment_type = (payments.sort_values('payment_value', ascending=False, kind='stable')
+                          .drop_duplicates('order_id')
+                          .set_index('order_id')['payment_type'])
+    order_payment_type.name = 'order_payment_type'
+
+    items = pd.merge(
+        tables['order_items'][['order_id', 'order_item_id', 'product_id', 'seller_id', 'price', 'freight_value']],
+        tables['products'][['product_id', 'product_category_name_english']],
+        on='product_id',
+        how='left'
+    )
+
+    facts = pd.merge(orders, items, on='order_id', how='left')
+    facts = facts.join(order_payment_value, on='order_id')
+    facts = facts.join(order_payment_type, on='order_id')
+    facts = facts.sort_values('order_purchase_timestamp', kind='stable', ignore_index=True)
+
+    # Penanda baris pertama setiap pesanan untuk agregasi tingkat pesanan
+    facts['order_first_row'] = ~facts['order_id'].duplicated()
+    facts['has_item'] = facts['order_item_id'].notna()
+    return facts
+
+
+def build_payment_facts(tables, orders=None):
+    orders = build_order_context(tables) if orders is None else orders
+    return pd.merge(
+        orders,
+        tables['order_payments'],
+        on='order_id',
+        how='inner'
+    )
+
+
+def build_fact_tables(tables):
+    orders = build_order_context(tables)
+    facts = {
+        'order_facts': build_order_facts(tables, orders),
+        'payment_facts': build_payment_facts(tables, orders),
+        'delivery_facts': build_delivery_facts(tables['orders'], orders, tables['order_items']),
+        'review_facts': build_review_facts(tables['order_reviews'], tables['orders'], orders, tables['order_items'],
+                                           tables['products']),
+        'seller_facts': build_seller_facts(tables['orders'], orders, tables['order_items'], tables['products'],
+                                           tables['order_reviews']),
+    }
+    if 'geolocation' in tables:
+        facts['shipping_facts'] = build_shipping_facts(tables['orders'], orders, tables['order_items'],
+                                                       tables['customers'], tables['sellers'], tables['geolocation'])
+    return facts
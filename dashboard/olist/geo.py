@@ -0,0 +1,147 @@
+"""Batas negara bagian Brasil untuk peta choropleth tab Analisis Geografis.
+
+GeoJSON di ``assets/brazil_states.geojson`` disertakan di repositori sehingga
+peta tetap tampil tanpa akses jaringan. Geometri dibuat dari peta kotamadya
+IBGE 1:2.500.000 yang digabung per negara bagian (laguna Lagoa dos Patos dan
+Lagoa Mirim tidak disertakan), lalu disederhanakan ringan (0.005 derajat).
+
+Saat dimuat, geometri disederhanakan lagi dengan Douglas-Peucker sesuai
+toleransi ``OLIST_GEO_TOLERANCE`` dan koordinat dibulatkan, karena seluruh
+GeoJSON ikut tertanam di HTML peta yang dikirim ke browser.
+
+Peta hanya memuat Leaflet (ditambah d3 untuk legenda choropleth); jQuery,
+Bootstrap, dan ikon bawaan folium tidak dipakai sehingga tidak ikut dimuat.
+Kedua library disisipkan langsung dari ``assets/`` sehingga peta tetap tampil
+di mesin tanpa internet dan tidak bergantung pada CDN pihak ketiga (ubin peta
+dasar tetap membutuhkan jaringan, poligon negara bagian tidak). Dengan
+``OLIST_MAP_OFFLINE=0`` keduanya dimuat dari CDN bawaan folium, sehingga HTML
+peta sekitar 300 KB lebih kecil.
+"""
+import json
+
+import folium
+import numpy as np
+
+from .config import GEO_TOLERANCE, GEOJSON_PATH, MAP_OFFLINE
+
+# Jumlah desimal koordinat (0.001 derajat ~ 110 m)
+COORD_PRECISION = 3
+
+MAP_CENTER = [-14.235, -51.9253]
+MAP_HEIGHT = 500
+
+ASSETS_DIR = GEOJSON_PATH.parent
+
+# Library yang dibutuhkan peta choropleth: URL CDN bawaan folium/branca -> salinan lokal di assets/
+LEAFLET_JS = 'https://cdn.jsdelivr.net/npm/leaflet@1.9.3/dist/leaflet.js'
+LEAFLET_CSS = 'https://cdn.jsdelivr.net/npm/leaflet@1.9.3/dist/leaflet.css'
+D3_JS = 'https://cdnjs.cloudflare.com/ajax/libs/d3/3.5.5/d3.min.js'
+OFFLINE_SCRIPTS = {LEAFLET_JS: 'leaflet.js', D3_JS: 'd3.v3.min.js'}
+OFFLINE_STYLES = {LEAFLET_CSS: 'leaflet.css'}
+
+
+def simplify_line(points, tolerance):
+    # Douglas-Peucker iteratif; titik pertama dan terakhir selalu dipertahankan
+    n = len(points)
+    keep = np.zeros(n, dtype=bool)
+    keep[[0, -1]] = True
+    stack = [(0, n - 1)]
+    while stack:
+        start, end = stack.pop()
+        if end - start < 2:
+            continue
+        a, b = points[start], points[end]
+        inner = points[start + 1:end]
+        dx, dy = b - a
+        length = np.hypot(dx, dy)
+        if length == 0:
+            # Awal dan akhir ring berimpit: pakai jarak ke titik awal
+            dist = np.hypot(inner[:, 0] - a[0], inner[:, 1] - a[1])
+        else:
+            dist = np.abs(dx * (inner[:, 1] - a[1]) - dy * (inner[:, 0] - a[0])) / length
+        i = int(np.argmax(dist))
+        if dist[i] > tolerance:
+            split = start + 1 + i
+            keep[split] = True
+            stack.append((start, split))
+            stack.append((split, end))
+    return points[keep]
+
+
+def simplify_ring(ring, tolerance):
+    # Mengembalikan None jika ring menyusut menjadi kurang dari segitiga tertutup
+    points = np.asarray(ring, dtype=np.float64)
+    if tolerance > 0:
+        points = simplify_line(points, tolerance)
+    if len(points) < 4:
+        return None
+    return np.round(points, COORD_PRECISION).tolist()
+
+
+def simplify_polygon(rings, tolerance):
+    exterior = simplify_ring(rings[0], tolerance)
+    if exterior is None:
+        return None
+    holes = [simplify_ring(ring, tolerance) for ring in rings[1:]]
+    return [exterior] + [hole for hole in holes if hole is not None]
+
+
+def simplify_geometry(geometry, tolerance):
+    if geometry['type'] == 'Polygon':
+        polygons = [geometry['coordinates']]
+    else:
+        polygons = geometry['coordinates']
+
+    simplified = [simplify_polygon(rings, tolerance) for rings in polygons]
+    simplified = [rings for rings in simplified if rings is not None]
+    if not simplified:
+        # Wilayah lebih kecil dari toleransi: pertahankan poligon terbesar tanpa penyederhanaan
+        largest = max(polygons, key=len)
+        simplified = [simplify_polygon(largest, 0)]
+
+    if len(simplified) == 1:
+        return {'type': 'Polygon', 'coordinates': simplified[0]}
+    return {'type': 'MultiPolygon', 'coordinates': simplified}
+
+
+def load_state_geojson(tolerance=GEO_TOLERANCE, path=GEOJSON_PATH):
+    with open(path, encoding='utf-8') as f:
+        geojson = json.load(f)
+    for feature in geojson['features']:
+        feature['geometry'] = simplify_geometry(feature['geometry'], tolerance)
+    return geojson
+
+
+def inline_assets(html):
+    # Ganti tautan CDN dengan isi file lokal
+    for url, filename in OFFLINE_SCRIPTS.items():
+        content = (ASSETS_DIR / filename).read_text(encoding='utf-8')
+        html = html.replace(f'<script src="{url}"></script>', f'<script>{content}</script>')
+    for url, filename in OFFLINE_STYLES.items():
+        content = (ASSETS_DIR / filename).read_text(encoding='utf-8')
+        html = html.replace(f'<link rel="stylesheet" href="{url}"/>', f'<style>{content}</style>')
+    return html
+
+
+def state_choropleth_html(customer_states, geojson, offline=MAP_OFFLINE, column='customer_count',
+                          legend_name='Customer Count'):
+    # customer_states: kolom state dan kolom nilai (default customer_count). Mengembalikan HTML
+    # lengkap peta, sama seperti yang dikirim folium_static ke browser.
+    brazil_map = folium.Map(location=MAP_CENTER, zoom_start=4, tiles="CartoDB positron")
+    brazil_map.default_js = [('leaflet', LEAFLET_JS)]
+    brazil_map.default_css = [('leaflet_css', LEAFLET_CSS)]
+    folium.Choropleth(
+        geo_data=geojson,
+        name='choropleth',
+        data=customer_states,
+        columns=['state', column],
+        key_on='feature.properties.sigla',
+        fill_color='YlOrRd',
+        fill_opacity=0.7,
+        line_opacity=0.2,
+        legend_name=legend_name
+    ).add_to(brazil_map)
+    folium.LayerControl().add_to(brazil_map)
+
+    html = folium.Figure().add_child(brazil_map).render()
+    return inline_assets(html) if offline else html
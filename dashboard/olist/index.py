@@ -0,0 +1,32 @@
+"""Indeks rentang tanggal berbasis timestamp yang terurut.
+
+Tabel-tabel di ``SORTED_TABLES`` disimpan terurut berdasarkan
+``order_purchase_timestamp``, sehingga rentang tanggal yang dipilih cukup
+diterjemahkan sekali per rerun menjadi potongan baris (slice) dengan
+``searchsorted``. Potongan ini dipakai bersama oleh semua tab dan ``iloc``
+dengan slice menghasilkan view, bukan salinan hasil boolean mask.
+"""
+import numpy as np
+
+TIMESTAMP_COLUMN = 'order_purchase_timestamp'
+
+SORTED_TABLES = ['orders', 'order_facts', 'payment_facts', 'delivery_facts', 'shipping_facts', 'review_facts',
+                 'seller_facts']
+
+
+def sort_by_timestamp(frame):
+    if frame[TIMESTAMP_COLUMN].is_monotonic_increasing:
+        return frame
+    return frame.sort_values(TIMESTAMP_COLUMN, kind='stable', ignore_index=True)
+
+
+def date_slice(timestamps, start_date, end_date):
+    # Baris dengan start_date <= timestamp <= end_date pada array timestamp terurut
+    lo = np.searchsorted(timestamps, np.datetime64(start_date), side='left')
+    hi = np.searchsorted(timestamps, np.datetime64(end_date), side='right')
+    return slice(int(lo), int(hi))
+
+
+def date_range_slices(tables, start_date, end_date, names=SORTED_TABLES):
+    return {name: date_slice(tables[name][TIMESTAMP_COLUMN].values, start_date, end_date)
+            for name in names}
@@ -0,0 +1,270 @@
+"""Instrumentasi hot path dashboard per rerun.
+
+Aktifkan dengan ``OLIST_INSTRUMENT=1``. Setiap rerun menjadi satu catatan
+berisi tahap-tahap yang dijalankan (memuat data, setiap loader analisis,
+render peta, build dan serialisasi grafik, dan setiap bagian dashboard) dengan waktu
+wall-clock, jumlah baris masuk dan keluar, memori yang dialokasikan
+(``tracemalloc``), dan tahap induknya. Catatan ditampilkan di panel debug
+sidebar dan ditambahkan ke log JSON lines (``OLIST_INSTRUMENT_LOG``, default
+``processed_data/logs/reruns.jsonl``) yang bisa diringkas lintas sesi:
+
+    cd dashboard
+    python -m olist.instrument summary [--log path] [--last 1000]
+
+Saat nonaktif, dekorator ``instrumented`` mengembalikan fungsi aslinya dan
+``stage`` hanya memeriksa satu atribut thread-local, sehingga overhead-nya
+praktis nol. ``OLIST_PROFILE_EVERY=N`` menjalankan cProfile untuk satu dari
+setiap N rerun; ringkasannya ikut masuk log dan file ``.prof`` lengkapnya
+disimpan di samping log. ``tracemalloc`` mengukur alokasi seluruh proses,
+jadi angka memori hanya akurat ketika satu sesi aktif; matikan dengan
+``OLIST_INSTRUMENT_MEMORY=0`` untuk mengurangi overhead.
+"""
+import argparse
+import cProfile
+import functools
+import inspect
+import json
+import pstats
+import threading
+import time
+import tracemalloc
+from collections.abc import Mapping
+from contextlib import contextmanager
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from . import index
+from .config import INSTRUMENT, INSTRUMENT_LOG, INSTRUMENT_MEMORY, PROFILE_EVERY
+
+# Jumlah fungsi teratas (waktu kumulatif) dari profil sampel yang disimpan di log
+PROFILE_TOP = 30
+
+MB = 1024 * 1024
+
+_local = threading.local()
+_lock = threading.Lock()
+_reruns = [0]
+
+
+def count_rows(value):
+    # Jumlah baris semua DataFrame/Series/array di dalam hasil (tuple, list, dan mapping ditelusuri);
+    # None jika hasil tidak berisi data tabel (HTML peta, elemen Streamlit, ...)
+    if isinstance(value, (pd.DataFrame, pd.Series, np.ndarray)):
+        return len(value)
+    if isinstance(value, Mapping):
+        value = list(value.values())
+    if isinstance(value, (tuple, list)):
+        counts = [count for count in map(count_rows, value) if count is not None]
+        return sum(counts) if counts else None
+    return None
+
+
+def memory_now():
+    return tracemalloc.get_traced_memory()[0] if tracemalloc.is_tracing() else 0
+
+
+def memory_peak():
+    return tracemalloc.get_traced_memory()[1] if tracemalloc.is_tracing() else 0
+
+
+def begin_run(session_id):
+    # Mulai catatan rerun untuk thread ini; None jika instrumentasi nonaktif
+    previous = getattr(_local, 'run', None)
+    if previous is not None and previous['profiler'] is not None:
+        # Rerun sebelumnya berhenti di tengah jalan (st.stop/exception)
+        previous['profiler'].disable()
+    if not INSTRUMENT:
+        _local.run = None
+        return None
+
+    if INSTRUMENT_MEMORY and not tracemalloc.is_tracing():
+        tracemalloc.start()
+    if tracemalloc.is_tracing():
+        tracemalloc.reset_peak()
+    with _lock:
+        _reruns[0] += 1
+        rerun = _reruns[0]
+
+    run = {
+        'session': session_id,
+        'rerun': rerun,
+        'started_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'stages': [],
+        'stack': [],
+        'start': time.perf_counter(),
+        'start_memory': memory_now(),
+        'peak': memory_now(),
+        'profiler': None,
+    }
+    if PROFILE_EVERY and rerun % PROFILE_EVERY == 0:
+        run['profiler'] = cProfile.Profile()
+        run['profiler'].enable()
+    _local.run = run
+    return run
+
+
+@contextmanager
+def stage(name, rows_in=None):
+    # Catat satu tahap; pemanggil boleh mengisi record['rows_out']. Tanpa rerun aktif tidak mencatat apa pun.
+    run = getattr(_local, 'run', None)
+    if run is None:
+        yield {}
+        return
+
+    # reset_peak menghapus puncak sebelumnya, jadi puncak setiap tahap diteruskan ke induknya
+    # (atau ke rerun) secara manual
+    stack = run['stack']
+    parent = stack[-1] if stack else run
+    parent['peak'] = max(parent['peak'], memory_peak())
+    record = {'stage': name, 'parent': stack[-1]['record']['stage'] if stack else None,
+              'rows_in': rows_in, 'rows_out': None}
+    start_memory = memory_now()
+    frame = {'record': record, 'peak': start_memory}
+    stack.append(frame)
+    if tracemalloc.is_tracing():
+        tracemalloc.reset_peak()
+    start = time.perf_counter()
+    try:
+        yield record
+    finally:
+        record['seconds'] = time.perf_counter() - start
+        stack.pop()
+        peak = max(memory_peak(), frame['peak'])
+        parent['peak'] = max(parent['peak'], peak)
+        tracing = tracemalloc.is_tracing()
+        record['alloc_mb'] = (memory_now() - start_memory) / MB if tracing else None
+        record['peak_mb'] = (peak - start_memory) / MB if tracing else None
+        run['stages'].append(record)
+
+
+def input_rows(signature, table, args, kwargs):
+    # Baris tabel `table` dalam rentang tanggal argumen (atau seluruh tabel); None untuk backend SQL
+    arguments = signature.bind_partial(*args, **kwargs).arguments
+    data = arguments.get('_data')
+    if not isinstance(data, Mapping) or table not in data:
+        return None
+    frame = data[table]
+    if 'start_date' in arguments and index.TIMESTAMP_COLUMN in frame.columns:
+        rows = index.date_slice(frame[index.TIMESTAMP_COLUMN].values, arguments['start_date'],
+                                arguments['end_date'])
+        return rows.stop - rows.start
+    return len(frame)
+
+
+def instrumented(name, table=None):
+    # Dekorator tahap untuk fungsi dashboard (di luar st.cache_*, sehingga cache hit juga tercatat).
+    # table: nama tabel di argumen `_data` yang dihitung sebagai baris masuk.
+    def decorate(fn):
+        if not INSTRUMENT:
+            return fn
+        signature = inspect.signature(fn) if table else None
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if getattr(_local, 'run', None) is None:
+                return fn(*args, **kwargs)
+            rows_in = input_rows(signature, table, args, kwargs) if table else None
+            with stage(name, rows_in) as record:
+                result = fn(*args, **kwargs)
+                record['rows_out'] = count_rows(result)
+            return result
+        return wrapper
+    return decorate
+
+
+def profile_summary(profiler, top=PROFILE_TOP):
+    stats = pstats.Stats(profiler).sort_stats('cumulative')
+    summary = []
+    for (filename, line, function), (_, calls, tottime, cumtime, _) in stats.stats.items():
+        summary.append({'function': f'{Path(filename).name}:{line}({function})', 'calls': calls,
+                        'tottime': tottime, 'cumtime': cumtime})
+    summary.sort(key=lambda row: row['cumtime'], reverse=True)
+    return summary[:top]
+
+
+def end_run(log_path=None):
+    # Tutup catatan rerun thread ini, tulis ke log JSON lines, dan kembalikan catatannya (None jika nonaktif)
+    run = getattr(_local, 'run', None)
+    _local.run = None
+    if run is None:
+        return None
+
+    log_path = Path(log_path or INSTRUMENT_LOG)
+    log_path.parent.mkdir(parents=True, exist_ok=True)
+    peak_mb = (max(run['peak'], memory_peak()) - run['start_memory']) / MB if tracemalloc.is_tracing() else None
+    record = {
+        'session': run['session'],
+        'rerun': run['rerun'],
+        'started_at': run['started_at'],
+        'seconds': time.perf_counter() - run['start'],
+        'peak_mb': peak_mb,
+        'stages': run['stages'],
+    }
+    profiler = run['profiler']
+    if profiler is not None:
+        profiler.disable()
+        profile_path = log_path.with_name(f'profile-{run["rerun"]:06d}.prof')
+        profiler.dump_stats(profile_path)
+        record['profile'] = profile_summary(profiler)
+        record['profile_path'] = str(profile_path)
+
+    line = json.dumps(record, default=float)
+    with _lock, open(log_path, 'a') as f:
+        f.write(line + '\n')
+    return record
+
+
+def stage_frame(record):
+    # Tahap satu rerun sebagai DataFrame (urutan selesai; tahap anak muncul sebelum induknya)
+    columns = ['stage', 'parent', 'seconds', 'rows_in', 'rows_out', 'alloc_mb', 'peak_mb']
+    return pd.DataFrame(record['stages'], columns=columns)
+
+
+def read_log(log_path=None, last=None):
+    log_path = Path(log_path or INSTRUMENT_LOG)
+    with open(log_path) as f:
+        records = [json.loads(line) for line in f if line.strip()]
+    return records[-last:] if last else records
+
+
+def summarize(records):
+    # Statistik per tahap lintas rerun: jumlah, rata-rata/p50/p95 waktu (ms), rata-rata baris dan memori
+    stages = stage_frame({'stages': [stage for record in records for stage in record['stages']]})
+    stages['ms'] = stages['seconds'] * 1000
+    summary = stages.groupby('stage').agg(
+        count=('ms', 'size'),
+        mean_ms=('ms', 'mean'),
+        p50_ms=('ms', 'median'),
+        p95_ms=('ms', lambda ms: np.percentile(ms, 95)),
+        mean_rows_in=('rows_in', 'mean'),
+        mean_rows_out=('rows_out', 'mean'),
+        mean_alloc_mb=('alloc_mb', 'mean'),
+        max_peak_mb=('peak_mb', 'max'),
+    )
+    return summary.sort_values('mean_ms', ascending=False).reset_index()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m olist.instrument',
+                                     description='Ringkas log instrumentasi dashboard (JSON lines).')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    summary_parser = subparsers.add_parser('summary', help='Statistik per tahap lintas rerun dan sesi')
+    summary_parser.add_argument('--log', help=f'File log, default {INSTRUMENT_LOG}')
+    summary_parser.add_argument('--last', type=int, help='Hanya N rerun terakhir')
+    args = parser.parse_args(argv)
+
+    records = read_log(args.log, args.last)
+    sessions = len({record['session'] for record in records})
+    seconds = np.array([record['seconds'] for record in records])
+    print(f'{len(records)} rerun dari {sessions} sesi')
+    if len(records):
+        print(f'Waktu rerun: rata-rata {seconds.mean() * 1000:.1f} ms, p50 {np.median(seconds) * 1000:.1f} ms, '
+              f'p95 {np.percentile(seconds, 95) * 1000:.1f} ms')
+    with pd.option_context('display.width', 160, 'display.max_columns', None):
+        print(summarize(records).round(2).to_string(index=False))
+
+
+if __name__ == '__main__':
+    main()
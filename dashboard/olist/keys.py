@@ -0,0 +1,113 @@
+"""Kunci surrogate integer untuk kolom ID Olist.
+
+ID Olist adalah string heksadesimal 32 karakter; sebagai objek Python setiap
+nilainya memakan ~80 byte dan setiap join atau ``nunique`` harus meng-hash
+string tersebut. Setiap entitas (pesanan, pelanggan, produk, penjual, ...)
+memakai satu kamus bersama, dan kolom ID di semua tabel dimuat sebagai
+categorical dengan kamus tersebut. Kode categorical adalah kunci integer padat
+(int32 untuk lebih dari 32 ribu nilai), sehingga join dan ``nunique`` berjalan
+pada integer, sementara ID asli tetap muncul ketika frame ditampilkan atau
+diekspor ke Parquet/CSV.
+
+Di store, kolom ID disimpan sebagai kode int32 dan kamusnya disimpan sekali
+per entitas di ``keys/<kolom>/``. Kamus store hanya bertambah di ujung (nilai
+dari delta diletakkan setelah nilai lama) agar kode yang sudah ditulis tetap
+berlaku; saat dimuat, kamus diurutkan dan kodenya dipetakan ulang sehingga
+hasilnya sama dengan jalur CSV.
+"""
+import numpy as np
+import pandas as pd
+
+KEYS_DIR_NAME = 'keys'
+
+# Kolom ID per entitas; kolom yang sama di tabel berbeda memakai kamus yang sama
+ID_COLUMNS = ['order_id', 'customer_id', 'customer_unique_id', 'product_id', 'seller_id', 'review_id']
+
+
+def unique_values(series):
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return series.cat.categories.to_numpy(object)
+    return series.dropna().unique()
+
+
+def table_values(tables, col):
+    values = [unique_values(frame[col]) for frame in tables.values() if col in frame.columns]
+    return pd.Index(np.concatenate(values)).unique() if values else None
+
+
+def entity_dtypes(tables):
+    # Kamus per entitas: gabungan nilai unik kolom ID di semua tabel, terurut
+    dtypes = {}
+    for col in ID_COLUMNS:
+        values = table_values(tables, col)
+        if values is not None:
+            dtypes[col] = pd.CategoricalDtype(values.sort_values())
+    return dtypes
+
+
+def extend_dtypes(dtypes, tables):
+    # Tambahkan nilai baru dari tables di ujung kamus store. Mengembalikan (dtypes, nilai baru per kolom).
+    extended, added = {}, {}
+    for col, dtype in dtypes.items():
+        values = table_values(tables, col)
+        new = pd.Index([], dtype=object) if values is None else values.difference(dtype.categories)
+        extended[col] = pd.CategoricalDtype(dtype.categories.append(new)) if len(new) else dtype
+        added[col] = new
+    return extended, added
+
+
+def encode_ids(tables, dtypes=None):
+    # Ubah semua kolom ID ke categorical dengan kamus bersama (in-place pada dict tables)
+    dtypes = entity_dtypes(tables) if dtypes is None else dtypes
+    for frame in tables.values():
+        for col, dtype in dtypes.items():
+            # astype dengan objek dtype yang sama tidak memvalidasi ulang kamus untuk setiap kolom
+            if col in frame.columns and frame[col].dtype != dtype:
+                frame[col] = frame[col].astype(dtype)
+    return tables
+
+
+def decode_ids(frame):
+    # Kembalikan kolom ID ke string biasa, misalnya untuk pustaka yang tidak mendukung categorical
+    for col in ID_COLUMNS:
+        if col in frame.columns and isinstance(frame[col].dtype, pd.CategoricalDtype):
+            frame[col] = frame[col].astype(object)
+    return frame
+
+
+def id_codes(series):
+    # Kunci surrogate int32 dari kolom ID categorical (-1 untuk nilai kosong)
+    return series.cat.codes.to_numpy().astype(np.int32, copy=False)
+
+
+def to_codes(frame):
+    # Salinan dangkal frame dengan kolom ID categorical diganti kode int32 (untuk ditulis ke store)
+    frame = frame.copy(deep=False)
+    for col in ID_COLUMNS:
+        if col in frame.columns and isinstance(frame[col].dtype, pd.CategoricalDtype):
+            frame[col] = id_codes(frame[col])
+    return frame
+
+
+def sorted_dtype(values):
+    # Kamus store (urutan tambah) -> (dtype terurut, peta kode store ke kode terurut atau None)
+    values = pd.Index(values)
+    if values.is_monotonic_increasing:
+        return pd.CategoricalDtype(values), None
+    order = values.argsort()
+    remap = np.empty(len(order), dtype=np.int32)
+    remap[order] = np.arange(len(order), dtype=np.int32)
+    return pd.CategoricalDtype(values[order]), remap
+
+
+def from_codes(frame, dtypes, remaps=None):
+    # Kebalikan to_codes: kode int32 dari store -> categorical dengan kamus bersama
+    for col, dtype in dtypes.items():
+        if col not in frame.columns or isinstance(frame[col].dtype, pd.CategoricalDtype):
+            continue
+        codes = frame[col].to_numpy(np.int32)
+        remap = None if remaps is None else remaps.get(col)
+        if remap is not None:
+            codes = np.where(codes >= 0, remap[codes], -1)
+        frame[col] = pd.Categorical.from_codes(codes, dtype=dtype)
+    return frame
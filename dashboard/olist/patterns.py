@@ -0,0 +1,174 @@
+"""Pola waktu pembelian (hari dalam seminggu x jam) dari histogram per jam.
+
+Histogram dibangun sekali saat data dimuat dari baris item ``order_facts``:
+satu sel per kombinasi (jam sejak epoch, kategori, negara bagian pelanggan)
+yang memiliki pesanan, dengan jumlah pesanan unik (int32) dan pendapatan
+dalam sen (int64, penjumlahannya eksak). Array padat hari x jam x kategori x
+negara bagian untuk data Olist berisi puluhan juta sel yang hampir semuanya
+nol, jadi hanya sel yang terisi yang disimpan sebagai array NumPy sejajar
+yang terurut menurut jam. Seperti kubus penjualan, sel rollup kategori
+(``ALL_CATEGORIES``) menyimpan jumlah pesanan unik lintas kategori; satu
+pesanan hanya jatuh di satu jam dan satu negara bagian, jadi jumlah pesanan
+antar-sel tetap aditif.
+
+Rentang tanggal menjadi potongan array dengan ``searchsorted``, filter
+kategori dan negara bagian menjadi satu mask atas kode integer, dan heatmap
+7 x 24 dijumlahkan dengan ``np.bincount`` tanpa ekstraksi ``.dt`` dan
+``groupby`` atas setiap pesanan. Jam di tepi rentang yang hanya sebagian
+tercakup dihitung dari baris mentah sehingga hasilnya sama dengan perhitungan
+mentah (``heatmap_from_items``).
+"""
+import numpy as np
+import pandas as pd
+
+from .cube import CATEGORY_COLUMN
+from .index import TIMESTAMP_COLUMN, date_slice
+
+WEEKDAYS = ['Senin', 'Selasa', 'Rabu', 'Kamis', 'Jumat', 'Sabtu', 'Minggu']
+HOURS = 24
+SLOTS = len(WEEKDAYS) * HOURS
+
+HOUR_NS = 3600 * 10**9
+
+# 1970-01-01 (hari ke-0 epoch) jatuh pada hari Kamis (Senin = 0)
+EPOCH_WEEKDAY = 3
+
+
+def epoch_hours(timestamps):
+    return timestamps.astype('datetime64[h]').astype(np.int64)
+
+
+def hour_slots(hours):
+    # Jam sejak epoch -> indeks sel heatmap (hari dalam seminggu * 24 + jam)
+    weekday = (hours // HOURS + EPOCH_WEEKDAY) % len(WEEKDAYS)
+    return weekday * HOURS + hours % HOURS
+
+
+def to_cents(prices):
+    return np.round(np.asarray(prices, dtype=np.float64) * 100).astype(np.int64)
+
+
+def build_purchase_histogram(order_facts):
+    # Sel terisi (jam, kategori, negara bagian) beserta sel rollup semua kategori, terurut menurut jam
+    items = order_facts[order_facts['has_item']]
+    cells = pd.DataFrame({
+        'hour': epoch_hours(items[TIMESTAMP_COLUMN].to_numpy()),
+        'category': items[CATEGORY_COLUMN].cat.codes.to_numpy(np.int16),
+        'state': items['customer_state'].cat.codes.to_numpy(np.int16),
+        'order_id': pd.factorize(items['order_id'])[0],
+        'cents': to_cents(items['price']),
+    })
+    measures = {'orders': ('order_id', 'nunique'), 'cents': ('cents', 'sum')}
+    per_category = cells.groupby(['hour', 'category', 'state'], sort=False).agg(**measures).reset_index()
+    rollup = cells.groupby(['hour', 'state'], sort=False).agg(**measures).reset_index()
+    rollup['category'] = len(items[CATEGORY_COLUMN].cat.categories)
+    merged = pd.concat([per_category, rollup[per_category.columns]], ignore_index=True)
+    merged = merged.sort_values(['hour', 'category', 'state'], ignore_index=True)
+
+    return {
+        'hour': merged['hour'].to_numpy(np.int64),
+        'category': merged['category'].to_numpy(np.int16),
+        'state': merged['state'].to_numpy(np.int16),
+        'orders': merged['orders'].to_numpy(np.int32),
+        'cents': merged['cents'].to_numpy(np.int64),
+        'categories': items[CATEGORY_COLUMN].cat.categories,
+        'states': items['customer_state'].cat.categories,
+    }
+
+
+def histogram_nbytes(histogram):
+    return sum(values.nbytes for values in histogram.values() if isinstance(values, np.ndarray))
+
+
+def value_code(values, value):
+    # Kode integer nilai filter; kode yang tidak pernah muncul di sel jika nilai tidak dikenal
+    position = values.get_indexer([value])[0]
+    return position if position >= 0 else len(values) + 1
+
+
+def heatmap_frame(orders, cents):
+    slots = np.arange(SLOTS)
+    return pd.DataFrame({
+        'weekday': slots // HOURS,
+        'hour': slots % HOURS,
+        'order_count': np.asarray(orders, dtype=np.int64),
+        'revenue': np.asarray(cents, dtype=np.float64) / 100,
+    })
+
+
+def histogram_range(histogram, order_facts, start_date, end_date):
+    # (potongan sel jam penuh, posisi baris item order_facts di jam tepi) untuk start_date <= t <= end_date.
+    # Jam tepi yang hanya sebagian tercakup dihitung pemanggil dari baris mentah.
+    start_ns, end_ns = pd.Timestamp(start_date).value, pd.Timestamp(end_date).value
+    # Jam penuh [first_hour, stop_hour): seluruh jam berada dalam rentang
+    first_hour, stop_hour = -(-start_ns // HOUR_NS), (end_ns + 1) // HOUR_NS
+
+    timestamps = order_facts[TIMESTAMP_COLUMN].values
+    rows = date_slice(timestamps, start_date, end_date)
+    if first_hour < stop_hour:
+        hours = histogram['hour']
+        cells = slice(np.searchsorted(hours, first_hour), np.searchsorted(hours, stop_hour))
+        inner = np.searchsorted(timestamps, (np.array([first_hour, stop_hour]) * HOUR_NS).astype('datetime64[ns]'))
+        edge_rows = np.r_[rows.start:max(inner[0], rows.start), min(inner[1], rows.stop):rows.stop]
+    else:
+        cells = slice(0, 0)
+        edge_rows = np.arange(rows.start, rows.stop)
+    return cells, edge_rows[order_facts['has_item'].to_numpy()[edge_rows]]
+
+
+def purchase_heatmap(histogram, order_facts, start_date, end_date, category=None, state=None):
+    # Jumlah pesanan dan pendapatan per (hari dalam seminggu, jam) untuk satu kombinasi filter,
+    # 168 baris berurutan Senin 00:00 .. Minggu 23:00
+    cells, edge_rows = histogram_range(histogram, order_facts, start_date, end_date)
+    category_code = (len(histogram['categories']) if category is None
+                     else value_code(histogram['categories'], category))
+    mask = histogram['category'][cells] == category_code
+    if state is not None:
+        mask &= histogram['state'][cells] == value_code(histogram['states'], state)
+    slots = hour_slots(histogram['hour'][cells][mask])
+    orders = np.bincount(slots, weights=histogram['orders'][cells][mask], minlength=SLOTS).astype(np.int64)
+    cents = np.bincount(slots, weights=histogram['cents'][cells][mask], minlength=SLOTS).astype(np.int64)
+
+    # Filter baris tepi dengan kode categorical (tanpa menyalin frame), lalu hitung seperti sel histogram
+    keep = np.ones(len(edge_rows), dtype=bool)
+    for column, value in ((CATEGORY_COLUMN, category), ('customer_state', state)):
+        if value is not None:
+            values = order_facts[column].array
+            keep &= values.codes[edge_rows] == value_code(values.categories, value)
+    edge_rows = edge_rows[keep]
+    if len(edge_rows) > 0:
+        first = ~order_facts['order_id'].iloc[edge_rows].duplicated().to_numpy()
+        slots = hour_slots(epoch_hours(order_facts[TIMESTAMP_COLUMN].to_numpy()[edge_rows]))
+        orders += np.bincount(slots[first], minlength=SLOTS)
+        cents += np.bincount(slots, weights=to_cents(order_facts['price'].to_numpy()[edge_rows]),
+                             minlength=SLOTS).astype(np.int64)
+    return heatmap_frame(orders, cents)
+
+
+def heatmap_from_items(filtered_items):
+    # Jalur mentah (acuan): ekstraksi .dt dan groupby atas baris order_facts yang sudah difilter
+    timestamps = filtered_items[TIMESTAMP_COLUMN]
+    grouped = filtered_items.groupby([timestamps.dt.dayofweek.rename('weekday'),
+                                      timestamps.dt.hour.rename('hour')]).agg(
+        order_count=('order_id', 'nunique'),
+        revenue=('price', 'sum'),
+    )
+    grid = pd.MultiIndex.from_product([range(len(WEEKDAYS)), range(HOURS)], names=['weekday', 'hour'])
+    grouped = grouped.reindex(grid, fill_value=0).reset_index()
+    return grouped.astype({'order_count': np.int64, 'revenue': np.float64})
+
+
+def heatmap_matrix(heatmap, column):
+    # Frame 7 x 24 (baris nama hari, kolom jam) untuk grafik heatmap
+    values = heatmap[column].to_numpy().reshape(len(WEEKDAYS), HOURS)
+    return pd.DataFrame(values, index=WEEKDAYS, columns=range(HOURS))
+
+
+def compare_heatmaps(heatmap, raw_heatmap):
+    # Daftar perbedaan antara heatmap dari histogram dan jalur mentah (kosong jika identik)
+    problems = []
+    if not np.array_equal(heatmap['order_count'].to_numpy(), raw_heatmap['order_count'].to_numpy()):
+        problems.append('purchase_heatmap.order_count: jumlah pesanan berbeda')
+    if not np.allclose(heatmap['revenue'].to_numpy(), raw_heatmap['revenue'].to_numpy(), rtol=1e-9, atol=0.005):
+        problems.append('purchase_heatmap.revenue: pendapatan berbeda')
+    return problems
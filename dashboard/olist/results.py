@@ -0,0 +1,534 @@
+"""Cache hasil bersama di disk untuk semua worker dashboard.
+
+Setiap replika Streamlit di belakang load balancer punya ``st.cache_data``
+sendiri, sehingga kombinasi filter populer (misalnya "Tahun Terakhir" dengan
+semua kategori dan negara bagian) dihitung ulang di setiap replika. Dengan
+``OLIST_RESULT_CACHE=1``, loader dashboard mengambil bundle metrik per tab dari
+direktori cache bersama (``OLIST_RESULT_CACHE_DIR``, default
+``processed_data/result_cache``) dan hanya menghitungnya sendiri saat miss:
+
+    cd dashboard
+    python -m olist.results warm [--workers 4] [--top 20]
+    python -m olist.results stats
+    python -m olist.results check [--category health_beauty --state SP]
+
+Setiap entri dialamatkan dengan hash SHA-256 dari isi kuncinya: nama bundle,
+versi data, sidik jari kode paket ``olist``, rentang tanggal, dan hanya
+dimensi filter yang dipakai bundle itu (misalnya RFM tidak bergantung pada
+kategori). Preset dan rentang kustom yang sama berbagi satu entri. Entri ditulis
+atomik (file sementara lalu ``os.replace``), jadi proses lain tidak pernah
+membaca file setengah jadi. Ukuran total dibatasi ``OLIST_RESULT_CACHE_MB``;
+entri yang paling lama tidak dipakai (mtime diperbarui saat hit) dibuang lebih
+dulu.
+
+Setiap proses mencatat hit, miss, dan kombinasi filter yang diminta ke satu
+file statistik di ``stats/``. ``warm`` dijalankan setelah ``store build`` atau
+``store append``: proses pool menghitung setiap bundle untuk preset tanggal
+tanpa filter lain ditambah kombinasi filter yang paling sering diminta, lalu
+menghapus entri versi data lama. ``stats`` meringkas hit rate semua worker, dan
+``check`` membandingkan setiap hasil dari cache dengan perhitungan langsung.
+"""
+import argparse
+import collections
+import hashlib
+import json
+import os
+import pickle
+import shutil
+import socket
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from . import analytics
+from .config import RESULT_CACHE, RESULT_CACHE_DIR, RESULT_CACHE_MB, USE_CUBE
+
+# Dinaikkan jika format entri berubah
+RESULT_FORMAT = 1
+
+STATS_DIR_NAME = 'stats'
+
+# Jarak minimum (detik) antara dua penulisan file statistik satu proses
+STATS_FLUSH_SECONDS = 5
+
+MB = 1024 * 1024
+
+
+def sales_bundle(tables, start_date, end_date, category, state):
+    return analytics.sales_summary(tables['order_facts'], tables['sales_cube'], start_date, end_date, category,
+                                   use_cube=USE_CUBE)
+
+
+def rfm_bundle(tables, start_date, end_date, category, state):
+    return analytics.customer_rfm(tables['order_facts'], start_date, end_date)
+
+
+def payments_bundle(tables, start_date, end_date, category, state):
+    return analytics.payment_summary(tables['payment_facts'], start_date, end_date)
+
+
+def delivery_sla_bundle(tables, start_date, end_date, category, state):
+    return analytics.delivery_sla(tables['delivery_facts'], start_date, end_date)
+
+
+def reviews_bundle(tables, start_date, end_date, category, state):
+    return analytics.review_summary(tables['review_facts'], start_date, end_date)
+
+
+def seller_stats_bundle(tables, start_date, end_date, category, state):
+    return analytics.seller_stats(tables['seller_facts'], start_date, end_date, category, state)
+
+
+def shipping_bundle(tables, start_date, end_date, category, state):
+    return analytics.shipping_summary(tables['shipping_facts'], start_date, end_date, state)
+
+
+# Bundle -> (fungsi, dimensi filter yang memengaruhi hasil, opsi lain yang ikut menjadi kunci)
+BUNDLES = {
+    'sales': (sales_bundle, ('category',), {'use_cube': USE_CUBE}),
+    'rfm': (rfm_bundle, (), {}),
+    'payments': (payments_bundle, (), {}),
+    'delivery_sla': (delivery_sla_bundle, (), {}),
+    'reviews': (reviews_bundle, (), {}),
+    'seller_stats': (seller_stats_bundle, ('category', 'state'), {}),
+    'shipping': (shipping_bundle, ('state',), {}),
+}
+
+# Bundle yang membaca tabel opsional: shipping_facts hanya ada jika geolocation_dataset.csv tersedia
+OPTIONAL_TABLES = {'shipping': 'shipping_facts'}
+
+
+def code_fingerprint():
+    # Hash semua modul paket olist, sehingga perubahan kode analisis otomatis membuat kunci baru
+    digest = hashlib.sha1()
+    for path in sorted(Path(__file__).resolve().parent.glob('*.py')):
+        digest.update(path.name.encode())
+        digest.update(path.read_bytes())
+    return digest.hexdigest()[:12]
+
+
+CODE_VERSION = code_fingerprint()
+
+_lock = threading.Lock()
+_stats = {'hits': 0, 'misses': 0, 'writes': 0, 'evictions': 0, 'filters': collections.Counter()}
+_flushed = [0.0]
+
+
+def timestamp_key(value):
+    return pd.Timestamp(value).isoformat()
+
+
+def result_key(name, version, start_date, end_date, category=None, state=None):
+    # Hash isi kunci satu bundle; dimensi filter yang tidak dipakai bundle tidak ikut
+    _, dims, options = BUNDLES[name]
+    filters = {'category': category, 'state': state}
+    payload = {'bundle': name, 'format': RESULT_FORMAT, 'code': CODE_VERSION, 'version': version,
+               'start': timestamp_key(start_date), 'end': timestamp_key(end_date),
+               **{dim: filters[dim] for dim in dims}, **options}
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+
+
+def entry_path(cache_dir, version, key):
+    # Entri dikelompokkan per versi data sehingga versi lama mudah dihapus setelah data diperbarui
+    return Path(cache_dir) / str(version) / f'{key}.pkl'
+
+
+def available_bundles(tables):
+    return [name for name in BUNDLES if name not in OPTIONAL_TABLES or OPTIONAL_TABLES[name] in tables]
+
+
+def compute(name, tables, start_date, end_date, category=None, state=None):
+    return BUNDLES[name][0](tables, start_date, end_date, category, state)
+
+
+def write_atomic(path, payload):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix='.tmp-')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(payload)
+        os.replace(tmp, path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+
+
+def read_entry(path):
+    # (ada, hasil). Entri yang rusak atau tidak bisa dibaca versi pustaka ini dihapus dan dianggap miss.
+    try:
+        with open(path, 'rb') as f:
+            result = pickle.load(f)
+    except FileNotFoundError:
+        return False, None
+    except Exception:
+        path.unlink(missing_ok=True)
+        return False, None
+    try:
+        os.utime(path)
+    except FileNotFoundError:
+        # Dibuang proses lain tepat setelah dibaca
+        pass
+    return True, result
+
+
+def cache_entries(cache_dir):
+    # (path, ukuran byte, mtime) semua entri di semua versi
+    entries = []
+    for path in Path(cache_dir).glob('*/*.pkl'):
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            continue
+        entries.append((path, stat.st_size, stat.st_mtime))
+    return entries
+
+
+def evict(cache_dir, max_bytes):
+    # Buang entri yang paling lama tidak dipakai sampai ukuran total <= max_bytes; mengembalikan jumlahnya
+    entries = sorted(cache_entries(cache_dir), key=lambda entry: entry[2])
+    total = sum(size for _, size, _ in entries)
+    evicted = 0
+    for path, size, _ in entries:
+        if total <= max_bytes:
+            break
+        path.unlink(missing_ok=True)
+        total -= size
+        evicted += 1
+    return evicted
+
+
+def store_entry(cache_dir, path, result, max_mb=RESULT_CACHE_MB):
+    # Tulis satu entri lalu jaga batas ukuran cache; mengembalikan jumlah entri yang dibuang
+    write_atomic(path, pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL))
+    return evict(cache_dir, max_mb * MB)
+
+
+def count(event, n=1):
+    with _lock:
+        _stats[event] += n
+
+
+def stats_path(cache_dir):
+    return Path(cache_dir) / STATS_DIR_NAME / f'{socket.gethostname()}-{os.getpid()}.json'
+
+
+def flush_stats(cache_dir, force=False):
+    # Tulis statistik kumulatif proses ini (paling sering sekali per STATS_FLUSH_SECONDS)
+    now = time.monotonic()
+    with _lock:
+        if not force and now - _flushed[0] < STATS_FLUSH_SECONDS:
+            return
+        _flushed[0] = now
+        snapshot = {**_stats, 'filters': dict(_stats['filters']), 'updated_at': time.strftime('%Y-%m-%dT%H:%M:%S')}
+    write_atomic(stats_path(cache_dir), json.dumps(snapshot).encode())
+
+
+def process_stats():
+    # Statistik proses ini sejak dimulai (tanpa kombinasi filter)
+    with _lock:
+        stats = {key: value for key, value in _stats.items() if key != 'filters'}
+    lookups = stats['hits'] + stats['misses']
+    stats['hit_rate'] = stats['hits'] / lookups * 100 if lookups else float('nan')
+    return stats
+
+
+def fetch(name, tables, version, start_date, end_date, category=None, state=None, cache_dir=None,
+          max_mb=RESULT_CACHE_MB):
+    # Bundle dari cache bersama, atau dihitung lalu disimpan saat miss. Tanpa cache_dir dan tanpa
+    # OLIST_RESULT_CACHE=1 bundle langsung dihitung.
+    if cache_dir is None:
+        if not RESULT_CACHE:
+            return compute(name, tables, start_date, end_date, category, state)
+        cache_dir = RESULT_CACHE_DIR
+
+    path = entry_path(cache_dir, version, result_key(name, version, start_date, end_date, category, state))
+    found, result = read_entry(path)
+    if found:
+        count('hits')
+    else:
+        count('misses')
+        result = compute(name, tables, start_date, end_date, category, state)
+        evicted = store_entry(cache_dir, path, result, max_mb)
+        count('writes')
+        count('evictions', evicted)
+    flush_stats(cache_dir)
+    return result
+
+
+def record_filters(preset, start_date, end_date, category=None, state=None, cache_dir=None):
+    # Catat satu permintaan dashboard sebagai bahan pemilihan kombinasi yang di-warm. Preset tanggal
+    # dicatat dengan namanya sehingga tetap berlaku setelah data diperbarui.
+    filters = {'preset': preset, 'category': category, 'state': state}
+    if preset not in analytics.DATE_PRESETS:
+        filters.update(preset=None, start=timestamp_key(start_date), end=timestamp_key(end_date))
+    with _lock:
+        _stats['filters'][json.dumps(filters, sort_keys=True)] += 1
+    flush_stats(cache_dir or RESULT_CACHE_DIR)
+
+
+def read_stats(cache_dir=None):
+    # Statistik gabungan semua proses yang pernah memakai cache ini
+    totals = {'processes': 0, 'hits': 0, 'misses': 0, 'writes': 0, 'evictions': 0, 'filters': collections.Counter()}
+    for path in sorted((Path(cache_dir or RESULT_CACHE_DIR) / STATS_DIR_NAME).glob('*.json')):
+        try:
+            with open(path) as f:
+                stats = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            continue
+        totals['processes'] += 1
+        for key in ('hits', 'misses', 'writes', 'evictions'):
+            totals[key] += stats.get(key, 0)
+        totals['filters'].update(stats.get('filters', {}))
+    lookups = totals['hits'] + totals['misses']
+    totals['hit_rate'] = totals['hits'] / lookups * 100 if lookups else float('nan')
+    return totals
+
+
+def warm_filters(cache_dir=None, top=20):
+    # Kombinasi filter yang di-warm: setiap preset tanggal tanpa filter lain, ditambah `top` kombinasi
+    # lain yang paling sering diminta dashboard
+    filters = [{'preset': preset, 'category': None, 'state': None} for preset in analytics.DATE_PRESETS]
+    popular = [json.loads(text) for text, _ in read_stats(cache_dir)['filters'].most_common()]
+    extra = [f for f in popular if f not in filters]
+    return filters + extra[:top]
+
+
+def resolve_dates(filters, min_date, max_date):
+    if filters.get('preset') in analytics.DATE_PRESETS:
+        return analytics.preset_range(filters['preset'], min_date, max_date)
+    return pd.Timestamp(filters['start']), pd.Timestamp(filters['end'])
+
+
+# Tabel dan versi data milik worker warm. Diisi proses induk sebelum pool dibuat sehingga worker
+# hasil fork memakainya tanpa memuat ulang; dengan metode spawn setiap worker memuat sendiri.
+_worker = {}
+
+
+def init_worker(data_dir, store_dir):
+    if 'tables' not in _worker:
+        from . import store
+
+        tables, version, _ = store.load_tables(data_dir, store_dir)
+        _worker.update(tables=tables, version=version)
+
+
+def warm_task(task):
+    # Hitung dan simpan satu bundle jika belum ada; mengembalikan (nama, dihitung, detik)
+    name, start_date, end_date, category, state, cache_dir, max_mb = task
+    start = time.perf_counter()
+    version = _worker['version']
+    path = entry_path(cache_dir, version, result_key(name, version, start_date, end_date, category, state))
+    if path.exists():
+        return name, False, time.perf_counter() - start
+    result = compute(name, _worker['tables'], start_date, end_date, category, state)
+    store_entry(cache_dir, path, result, max_mb)
+    return name, True, time.perf_counter() - start
+
+
+def prune_versions(cache_dir, version):
+    # Hapus entri versi data selain `version`; mengembalikan jumlah direktori versi yang dihapus
+    removed = 0
+    for path in Path(cache_dir).iterdir():
+        if path.is_dir() and path.name not in (str(version), STATS_DIR_NAME):
+            shutil.rmtree(path, ignore_errors=True)
+            removed += 1
+    return removed
+
+
+def warm(cache_dir=None, top=20, workers=None, max_mb=RESULT_CACHE_MB, prune=True, data_dir=None, store_dir=None):
+    # Hitung bundle untuk kombinasi filter umum dengan proses pool. Mengembalikan ringkasan.
+    from . import store
+
+    cache_dir = Path(cache_dir or RESULT_CACHE_DIR)
+    tables, version, source = store.load_tables(data_dir, store_dir)
+    _worker.update(tables=tables, version=version)
+    timestamps = tables['orders']['order_purchase_timestamp']
+    min_date, max_date = timestamps.min(), timestamps.max()
+
+    # Satu tugas per kunci unik: kombinasi yang hanya berbeda di dimensi yang tidak dipakai bundle
+    # (misalnya kategori untuk RFM) dihitung sekali
+    filters = warm_filters(cache_dir, top)
+    tasks = {}
+    for f in filters:
+        start_date, end_date = resolve_dates(f, min_date, max_date)
+        for name in available_bundles(tables):
+            key = result_key(name, version, start_date, end_date, f['category'], f['state'])
+            tasks.setdefault(key, (name, start_date, end_date, f['category'], f['state'], cache_dir, max_mb))
+
+    start = time.perf_counter()
+    workers = workers or min(4, os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker,
+                             initargs=(data_dir, store_dir)) as pool:
+        done = list(pool.map(warm_task, tasks.values()))
+    elapsed = time.perf_counter() - start
+
+    compute_seconds = collections.defaultdict(float)
+    for name, computed, seconds in done:
+        if computed:
+            compute_seconds[name] += seconds
+    return {
+        'version': version,
+        'source': source,
+        'filters': len(filters),
+        'entries': len(done),
+        'computed': sum(computed for _, computed, _ in done),
+        'seconds': elapsed,
+        'compute_seconds': dict(compute_seconds),
+        'pruned_versions': prune_versions(cache_dir, version) if prune else 0,
+        'evicted': evict(cache_dir, max_mb * MB),
+    }
+
+
+def compare_results(name, left, right):
+    # Daftar perbedaan antara dua hasil bundle (frame, dict, tuple/list, atau skalar; NaN dianggap sama)
+    if isinstance(left, pd.DataFrame) or isinstance(left, pd.Series):
+        if type(left) is not type(right):
+            return [f'{name}: tipe berbeda']
+        try:
+            if isinstance(left, pd.DataFrame):
+                pd.testing.assert_frame_equal(left, right)
+            else:
+                pd.testing.assert_series_equal(left, right)
+        except AssertionError as e:
+            return [f'{name}: {str(e).splitlines()[0]}']
+        return []
+    if isinstance(left, dict):
+        if not isinstance(right, dict) or list(left) != list(right):
+            return [f'{name}: kunci berbeda']
+        return [problem for key in left for problem in compare_results(f'{name}.{key}', left[key], right[key])]
+    if isinstance(left, (tuple, list)):
+        if type(left) is not type(right) or len(left) != len(right):
+            return [f'{name}: panjang berbeda']
+        return [problem for i, (a, b) in enumerate(zip(left, right))
+                for problem in compare_results(f'{name}[{i}]', a, b)]
+    if isinstance(left, (float, np.floating)) and isinstance(right, (float, np.floating)):
+        return [] if left == right or (np.isnan(left) and np.isnan(right)) else [f'{name}: {left} != {right}']
+    return [] if left == right else [f'{name}: {left!r} != {right!r}']
+
+
+def check_keys(version, start_date, end_date, category, state):
+    # Dimensi filter yang dipakai bundle (dan versi data serta rentang tanggal) harus mengubah kunci,
+    # dimensi yang tidak dipakai tidak boleh
+    problems = []
+    for name, (_, dims, _) in BUNDLES.items():
+        base = result_key(name, version, start_date, end_date)
+        for dim, value in (('category', category), ('state', state)):
+            changed = result_key(name, version, start_date, end_date, **{dim: value}) != base
+            if changed != (dim in dims):
+                problems.append(f'{name}: kunci {"tidak " if dim in dims else ""}berubah oleh {dim}')
+        if result_key(name, f'{version}-lain', start_date, end_date) == base:
+            problems.append(f'{name}: kunci tidak berubah oleh versi data')
+        if result_key(name, version, start_date, end_date - pd.Timedelta(days=1)) == base:
+            problems.append(f'{name}: kunci tidak berubah oleh rentang tanggal')
+    return problems
+
+
+def check_cache(tables, version, combos, cache_dir):
+    # Isi cache untuk semua kombinasi lebih dulu, lalu baca ulang setiap kombinasi dan bandingkan dengan
+    # perhitungan langsung: kunci yang bertabrakan atau kehilangan dimensi akan mengembalikan hasil
+    # kombinasi lain. Mengembalikan (perbedaan, jumlah pembacaan, jumlah hit).
+    for start_date, end_date, category, state in combos:
+        for name in available_bundles(tables):
+            fetch(name, tables, version, start_date, end_date, category, state, cache_dir=cache_dir)
+
+    problems = []
+    hits_before, reads = _stats['hits'], 0
+    for start_date, end_date, category, state in combos:
+        label = f'{start_date:%Y-%m-%d}..{end_date:%Y-%m-%d}/{category or "all"}/{state or "all"}'
+        for name in available_bundles(tables):
+            cached = fetch(name, tables, version, start_date, end_date, category, state, cache_dir=cache_dir)
+            direct = compute(name, tables, start_date, end_date, category, state)
+            problems += compare_results(f'{name} {label}', cached, direct)
+            reads += 1
+    return problems, reads, _stats['hits'] - hits_before
+
+
+def print_stats(cache_dir):
+    stats = read_stats(cache_dir)
+    entries = cache_entries(cache_dir)
+    versions = collections.Counter(path.parent.name for path, _, _ in entries)
+    print(f'Cache {cache_dir}: {len(entries)} entri, {sum(size for _, size, _ in entries) / MB:.1f} MB '
+          f'(batas {RESULT_CACHE_MB:.0f} MB)')
+    for version, n in versions.most_common():
+        print(f'  versi {version}: {n} entri')
+    print(f'{stats["processes"]} proses: {stats["hits"]} hit, {stats["misses"]} miss '
+          f'(hit rate {stats["hit_rate"]:.1f}%), {stats["writes"]} tulis, {stats["evictions"]} dibuang')
+    if stats['filters']:
+        print('Kombinasi filter terpopuler:')
+        for text, n in stats['filters'].most_common(10):
+            print(f'  {n:>8}  {text}')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m olist.results',
+                                     description='Cache hasil bersama untuk semua worker dashboard.')
+    parser.add_argument('--cache-dir', help=f'Direktori cache, default {RESULT_CACHE_DIR}')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    warm_parser = subparsers.add_parser('warm', help='Hitung kombinasi filter umum dengan proses pool')
+    warm_parser.add_argument('--workers', type=int, help='Jumlah proses (default min(4, CPU))')
+    warm_parser.add_argument('--top', type=int, default=20,
+                             help='Jumlah kombinasi terpopuler di luar preset tanggal (default 20)')
+    warm_parser.add_argument('--keep-old', action='store_true', help='Jangan hapus entri versi data lama')
+
+    subparsers.add_parser('stats', help='Ringkas isi cache dan hit rate semua worker')
+    subparsers.add_parser('clear', help='Hapus semua entri dan statistik')
+
+    check_parser = subparsers.add_parser('check', help='Bandingkan hasil dari cache dengan perhitungan langsung')
+    check_parser.add_argument('--category', help='Kategori untuk kombinasi uji (default kategori terlaris)')
+    check_parser.add_argument('--state', help='Negara bagian untuk kombinasi uji (default terbanyak pelanggan)')
+    args = parser.parse_args(argv)
+    cache_dir = Path(args.cache_dir) if args.cache_dir else RESULT_CACHE_DIR
+
+    if args.command == 'stats':
+        print_stats(cache_dir)
+        return
+
+    if args.command == 'clear':
+        shutil.rmtree(cache_dir, ignore_errors=True)
+        print(f'Cache {cache_dir} dikosongkan')
+        return
+
+    if args.command == 'warm':
+        report = warm(cache_dir, args.top, args.workers, prune=not args.keep_old)
+        print(f'Data versi {report["version"]} ({report["source"]}): {report["filters"]} kombinasi filter, '
+              f'{report["entries"]} entri, {report["computed"]} dihitung dalam {report["seconds"]:.2f} detik')
+        for name, seconds in report['compute_seconds'].items():
+            print(f'  {name:<14} {seconds * 1000:>10.1f} ms')
+        if report['pruned_versions'] or report['evicted']:
+            print(f'{report["pruned_versions"]} versi lama dihapus, {report["evicted"]} entri dibuang')
+        return
+
+    from . import store
+
+    tables, version, source = store.load_tables()
+    timestamps = tables['orders']['order_purchase_timestamp']
+    min_date, max_date = timestamps.min(), timestamps.max()
+    category = args.category or tables['order_facts']['product_category_name_english'].value_counts().index[0]
+    state = args.state or tables['customers']['customer_state'].value_counts().index[0]
+    combos = [(*analytics.preset_range(preset, min_date, max_date), c, s)
+              for preset in analytics.DATE_PRESETS
+              for c, s in [(None, None), (category, None), (None, state), (category, state)]]
+
+    problems = check_keys(version, min_date, max_date, category, state)
+    with tempfile.TemporaryDirectory() as tmp:
+        cache_problems, reads, hits = check_cache(tables, version, combos, tmp)
+    problems += cache_problems
+    if hits != reads:
+        problems.append(f'pembacaan ulang: {hits} hit dari {reads} (seharusnya semua hit)')
+    for problem in problems:
+        print(f'  {problem}')
+    print(f'Pemeriksaan cache hasil ({source}, {len(combos)} kombinasi x {len(BUNDLES)} bundle): '
+          f'{"semua hasil cocok dengan perhitungan langsung" if not problems else f"{len(problems)} perbedaan"}')
+    if problems:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,178 @@
+"""Mesin analisis ulasan pelanggan tervektorisasi.
+
+Bagian berat dikerjakan sekali saat tabel fakta dibangun: tanggal ulasan
+sudah diparse oleh store, lalu ``review_facts`` menyimpan setiap ulasan
+beserta waktu pembelian, bulan pembelian, negara bagian pelanggan, selisih
+hari pengiriman (aktual - estimasi, NaN jika belum terkirim), lama respons
+ulasan (jam), dan panjang komentar. Tabel ini berbutir (ulasan, penjual,
+kategori) dari item pesanannya; ``review_first_row``, ``seller_first_row``,
+dan ``category_first_row`` menandai satu baris per ulasan, per (ulasan,
+penjual), dan per (ulasan, kategori) sehingga setiap agregat menghitung ulasan
+tepat sekali. Baris diurutkan berdasarkan waktu pembelian.
+
+Filter interaktif cukup memotong tabel per rentang tanggal; semua agregat
+dihitung dengan ``np.bincount`` atas kode categorical dan skor int8.
+"""
+import numpy as np
+import pandas as pd
+
+from .delivery import STATUS_LABELS, days_between, status_codes
+
+SCORES = np.arange(1, 6)
+
+# Skor ulasan yang dianggap rendah
+LOW_SCORE = 2
+
+RESPONSE_PERCENTILES = [50, 90, 95]
+
+
+def build_review_facts(order_reviews, orders, order_context, items, products):
+    # Satu baris per (ulasan, penjual, kategori) dengan atribut yang dibutuhkan tab Ulasan
+    reviews = order_reviews[order_reviews['review_score'].notna()]
+    facts = pd.DataFrame({
+        'review_id': reviews['review_id'].array,
+        'order_id': reviews['order_id'].array,
+        'review_score': reviews['review_score'].to_numpy().astype(np.int8),
+        'response_hours': ((reviews['review_answer_timestamp'] - reviews['review_creation_date'])
+                           .dt.total_seconds() / 3600).to_numpy(np.float32),
+        'comment_length': reviews['review_comment_message'].str.len().fillna(0)
+                          .clip(upper=np.iinfo(np.int16).max).to_numpy().astype(np.int16),
+    })
+    facts = pd.merge(order_context[['order_id', 'order_purchase_timestamp', 'purchase_month', 'customer_state']],
+                     facts, on='order_id', how='inner')
+
+    # Selisih hari pengiriman (aktual - estimasi) dari pesanan terkirim, seperti delivery_facts
+    delivered = orders[
+        (orders['order_status'] == 'delivered') &
+        orders['order_delivered_customer_date'].notna() &
+        orders['order_estimated_delivery_date'].notna()
+    ]
+    delivery = pd.DataFrame({
+        'order_id': delivered['order_id'].array,
+        'delivery_difference': days_between(delivered['order_delivered_customer_date'].to_numpy(),
+                                            delivered['order_estimated_delivery_date'].to_numpy())
+                               .astype(np.float32),
+    })
+    facts = pd.merge(facts, delivery, on='order_id', how='left')
+
+    order_sellers = pd.merge(items[['order_id', 'seller_id', 'product_id']],
+                             products[['product_id', 'product_category_name_english']],
+                             on='product_id', how='left')
+    order_sellers = order_sellers.drop(columns='product_id').drop_duplicates()
+    facts = pd.merge(facts, order_sellers, on='order_id', how='left')
+    facts = facts.sort_values('order_purchase_timestamp', kind='stable', ignore_index=True)
+
+    facts['review_first_row'] = ~facts.duplicated(['review_id', 'order_id'])
+    facts['seller_first_row'] = ~facts.duplicated(['review_id', 'order_id', 'seller_id'])
+    facts['category_first_row'] = ~facts.duplicated(['review_id', 'order_id', 'product_category_name_english'])
+    return facts.drop(columns='review_id')
+
+
+def group_codes(column):
+    # Kode grup (-1 untuk nilai kosong) dan label grup dari kolom categorical atau biasa
+    if isinstance(column.dtype, pd.CategoricalDtype):
+        return column.cat.codes.to_numpy().astype(np.int64), column.cat.categories
+    codes, groups = pd.factorize(column, sort=True)
+    return codes.astype(np.int64), groups
+
+
+def score_counts(codes, scores, n_groups):
+    # Matriks (n_groups, 5) jumlah ulasan per grup dan skor dari satu np.bincount
+    keys = codes * len(SCORES) + (scores.astype(np.int64) - 1)
+    return np.bincount(keys, minlength=n_groups * len(SCORES)).reshape(n_groups, len(SCORES))
+
+
+def group_scores(rows, group_col, flag_col, min_reviews=1):
+    # Jumlah ulasan, rata-rata skor, dan persentase skor rendah per grup, terurut dari rata-rata terendah
+    rows = rows[rows[flag_col].to_numpy()]
+    codes, groups = group_codes(rows[group_col])
+    valid = codes >= 0
+    columns = [group_col, 'reviews', 'avg_score', 'low_score_rate']
+    if not valid.any():
+        return pd.DataFrame(columns=columns)
+
+    counts = score_counts(codes[valid], rows['review_score'].to_numpy()[valid], len(groups))
+    reviews = counts.sum(axis=1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        stats = pd.DataFrame({
+            group_col: np.asarray(groups),
+            'reviews': reviews,
+            'avg_score': counts @ SCORES / reviews,
+            'low_score_rate': counts[:, :LOW_SCORE].sum(axis=1) / reviews * 100,
+        })
+    stats = stats[stats['reviews'] >= max(min_reviews, 1)]
+    return stats[columns].sort_values(['avg_score', 'reviews'], ascending=[True, False], ignore_index=True)
+
+
+def monthly_scores(rows):
+    # Jumlah ulasan per (bulan pembelian, skor) dalam format panjang, bulan tanpa ulasan dibuang
+    rows = rows[rows['review_first_row'].to_numpy()]
+    codes, months = group_codes(rows['purchase_month'])
+    counts = score_counts(codes, rows['review_score'].to_numpy(), len(months))
+    present = counts.sum(axis=1) > 0
+    return pd.DataFrame({
+        'month': np.repeat(np.asarray(months)[present], len(SCORES)),
+        'review_score': np.tile(SCORES, present.sum()),
+        'count': counts[present].ravel(),
+    })
+
+
+def delivery_scores(rows):
+    # Rata-rata skor dan persentase skor rendah per status pengiriman (hanya pesanan terkirim),
+    # ditambah korelasi Pearson antara selisih hari pengiriman dan skor
+    rows = rows[rows['review_first_row'].to_numpy()]
+    difference = rows['delivery_difference'].to_numpy()
+    delivered = ~np.isnan(difference)
+    scores = rows['review_score'].to_numpy()[delivered]
+    difference = difference[delivered]
+
+    counts = score_counts(status_codes(difference), scores, len(STATUS_LABELS))
+    reviews = counts.sum(axis=1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        by_status = pd.DataFrame({
+            'delivery_status': pd.Categorical(STATUS_LABELS, categories=STATUS_LABELS, ordered=True),
+            'reviews': reviews,
+            'avg_score': counts @ SCORES / reviews,
+            'low_score_rate': counts[:, :LOW_SCORE].sum(axis=1) / reviews * 100,
+        })
+    if len(scores) > 1 and difference.std() > 0 and scores.std() > 0:
+        correlation = float(np.corrcoef(difference, scores.astype(np.float64))[0, 1])
+    else:
+        correlation = float('nan')
+    return by_status, correlation
+
+
+def review_metrics(rows):
+    # Metrik tingkat ulasan dan persentil lama respons dari satu potongan baris
+    rows = rows[rows['review_first_row'].to_numpy()]
+    scores = rows['review_score'].to_numpy()
+    response = rows['response_hours'].to_numpy()
+    response = response[~np.isnan(response)]
+    comments = rows['comment_length'].to_numpy()
+    metrics = {
+        'reviews': len(rows),
+        'avg_score': float(scores.mean()) if len(rows) else float('nan'),
+        'low_score_rate': float((scores <= LOW_SCORE).mean() * 100) if len(rows) else float('nan'),
+        'comment_rate': float((comments > 0).mean() * 100) if len(rows) else float('nan'),
+    }
+    percentiles = np.percentile(response, RESPONSE_PERCENTILES) if len(response) else \
+        [float('nan')] * len(RESPONSE_PERCENTILES)
+    for p, value in zip(RESPONSE_PERCENTILES, percentiles):
+        metrics[f'p{p}_response_hours'] = float(value)
+    return metrics
+
+
+def comment_lengths(rows):
+    # Persentase ulasan berkomentar dan rata-rata panjang komentar (yang ada) per skor
+    rows = rows[rows['review_first_row'].to_numpy()]
+    codes = rows['review_score'].to_numpy().astype(np.int64) - 1
+    length = rows['comment_length'].to_numpy()
+    reviews = np.bincount(codes, minlength=len(SCORES))
+    commented = np.bincount(codes, weights=length > 0, minlength=len(SCORES))
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return pd.DataFrame({
+            'review_score': SCORES,
+            'reviews': reviews,
+            'comment_rate': commented / reviews * 100,
+            'avg_comment_length': np.bincount(codes, weights=length, minlength=len(SCORES)) / commented,
+        })
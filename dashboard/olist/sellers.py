@@ -0,0 +1,146 @@
+"""Papan peringkat performa penjual tervektorisasi.
+
+``seller_facts`` dibangun sekali saat tabel fakta dibangun dan berbutir
+(pesanan, penjual, kategori): pendapatan dan jumlah item penjual di pesanan
+itu, jumlah dan total skor ulasan pesanan, serta status terkirim/terlambat
+pesanan. ``seller_first_row`` menandai satu baris per (pesanan, penjual)
+sehingga ukuran tingkat pesanan tidak terhitung ganda ketika semua kategori
+digabung. Baris diurutkan berdasarkan waktu pembelian.
+
+Filter tanggal cukup memotong tabel, filter kategori dan negara bagian adalah
+satu mask, lalu semua ukuran per penjual dihitung dengan ``np.bincount`` atas
+kode categorical ``seller_id``; biayanya O(baris + jumlah penjual) tanpa
+groupby. Peringkat memakai seleksi parsial (``np.partition``) untuk k baris
+teratas halaman yang diminta, bukan pengurutan semua penjual.
+"""
+import numpy as np
+import pandas as pd
+
+from .delivery import days_between
+
+# Metrik peringkat -> True jika nilai besar lebih baik
+RANK_METRICS = {
+    'revenue': True,
+    'orders': True,
+    'avg_review_score': True,
+    'late_rate': False,
+}
+
+def build_seller_facts(orders, order_context, items, products, order_reviews):
+    # Satu baris per (pesanan, penjual, kategori) dengan ukuran aditif untuk papan peringkat
+    sold = pd.merge(items[['order_id', 'seller_id', 'product_id', 'price']],
+                    products[['product_id', 'product_category_name_english']],
+                    on='product_id', how='left')
+    facts = (sold.groupby(['order_id', 'seller_id', 'product_category_name_english'],
+                          observed=True, dropna=False, sort=False)
+             .agg(revenue=('price', 'sum'), items=('price', 'size'))
+             .reset_index())
+
+    reviews = order_reviews[order_reviews['review_score'].notna()]
+    order_scores = (reviews.groupby('order_id', observed=True)['review_score']
+                    .agg(review_count='size', review_score_sum='sum')
+                    .reset_index())
+    facts = pd.merge(facts, order_scores, on='order_id', how='left')
+    facts['review_count'] = facts['review_count'].fillna(0).astype(np.int16)
+    facts['review_score_sum'] = facts['review_score_sum'].fillna(0).astype(np.int16)
+
+    delivered = orders[(orders['order_status'] == 'delivered') &
+                       orders['order_delivered_customer_date'].notna() &
+                       orders['order_estimated_delivery_date'].notna()]
+    delivery = pd.DataFrame({
+        'order_id': delivered['order_id'].array,
+        'late': days_between(delivered['order_delivered_customer_date'].to_numpy(),
+                             delivered['order_estimated_delivery_date'].to_numpy()) > 0,
+    })
+    facts = pd.merge(facts, delivery, on='order_id', how='left')
+    # Pesanan yang belum terkirim tidak punya pasangan di delivery (late NaN)
+    facts['delivered'] = facts['late'].notna()
+    facts['late'] = facts['late'].eq(True)
+
+    facts = pd.merge(order_context[['order_id', 'order_purchase_timestamp', 'customer_state']], facts,
+                     on='order_id', how='inner')
+    facts = facts.sort_values('order_purchase_timestamp', kind='stable', ignore_index=True)
+    facts['seller_first_row'] = ~facts.duplicated(['order_id', 'seller_id'])
+    return facts
+
+
+def seller_stats(rows, category=None, state=None):
+    # Ukuran per penjual (hanya penjual dengan pesanan) dari potongan baris seller_facts
+    mask = np.ones(len(rows), dtype=bool)
+    if category is not None:
+        mask &= (rows['product_category_name_english'] == category).to_numpy()
+    if state is not None:
+        mask &= (rows['customer_state'] == state).to_numpy()
+
+    sellers = rows['seller_id']
+    if isinstance(sellers.dtype, pd.CategoricalDtype):
+        codes, groups = sellers.cat.codes.to_numpy(), sellers.cat.categories
+    else:
+        codes, groups = pd.factorize(sellers, sort=True)
+    mask &= codes >= 0
+    codes = codes[mask].astype(np.int64)
+    n_groups = len(groups)
+
+    # Tanpa filter kategori, ukuran tingkat pesanan hanya dari baris pertama (pesanan, penjual);
+    # dengan filter kategori setiap baris sudah unik per (pesanan, penjual)
+    order_rows = np.ones(len(codes), dtype=bool) if category is not None else \
+        rows['seller_first_row'].to_numpy()[mask]
+
+    def total(column=None, weights=None):
+        if weights is None:
+            weights = rows[column].to_numpy()[mask]
+        return np.bincount(codes, weights=weights, minlength=n_groups)
+
+    review_count = rows['review_count'].to_numpy()[mask] * order_rows
+    delivered = rows['delivered'].to_numpy()[mask] & order_rows
+    orders = total(weights=order_rows)
+    reviews = total(weights=review_count)
+    delivered_orders = total(weights=delivered)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        stats = pd.DataFrame({
+            'seller_id': np.asarray(groups),
+            'revenue': total('revenue'),
+            'orders': orders.astype(np.int64),
+            'items': total('items').astype(np.int64),
+            'reviews': reviews.astype(np.int64),
+            'avg_review_score': total(weights=rows['review_score_sum'].to_numpy()[mask] * order_rows) / reviews,
+            'delivered_orders': delivered_orders.astype(np.int64),
+            'late_rate': total(weights=rows['late'].to_numpy()[mask] & delivered) / delivered_orders * 100,
+        })
+    return stats[orders > 0].reset_index(drop=True)
+
+
+def top_k(values, tiebreak, k, descending=True):
+    # Posisi k nilai teratas (NaN dibuang) dengan seleksi parsial O(n) lalu pengurutan kandidat
+    # saja. Nilai seri diurutkan menurut tiebreak (besar dulu) lalu posisi, sehingga halaman
+    # berurutan tidak saling tumpang tindih.
+    key = -np.asarray(values, dtype=np.float64) if descending else np.asarray(values, dtype=np.float64)
+    candidates = np.flatnonzero(~np.isnan(key))
+    if 0 < k < len(candidates):
+        kth = np.partition(key[candidates], k - 1)[k - 1]
+        candidates = candidates[key[candidates] <= kth]
+    order = np.lexsort((candidates, -np.asarray(tiebreak, dtype=np.float64)[candidates], key[candidates]))
+    return candidates[order[:k]]
+
+
+def rank_values(stats, metric, min_count=None):
+    # Nilai metrik per penjual, NaN untuk penjual yang tidak diperingkat. min_count: (kolom, minimum)
+    # agar metrik rasio hanya memeringkat penjual dengan data cukup.
+    values = stats[metric].to_numpy(np.float64)
+    if min_count is not None:
+        column, minimum = min_count
+        values = np.where(stats[column].to_numpy() >= minimum, values, np.nan)
+    return values
+
+
+def leaderboard_page(stats, metric, page, page_size, reverse=False, min_count=None):
+    # Satu halaman peringkat (kolom 'rank' dimulai dari 1) dan jumlah penjual yang diperingkat
+    values = rank_values(stats, metric, min_count)
+    ranked = int((~np.isnan(values)).sum())
+
+    descending = RANK_METRICS[metric] != reverse
+    positions = top_k(values, stats['orders'].to_numpy(), (page + 1) * page_size, descending)
+    positions = positions[page * page_size:]
+    result = stats.iloc[positions].reset_index(drop=True)
+    result.insert(0, 'rank', np.arange(page * page_size + 1, page * page_size + len(result) + 1))
+    return result, ranked
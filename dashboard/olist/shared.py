@@ -0,0 +1,41 @@
+"""Lapisan data bersama (read-only) untuk semua sesi dashboard.
+
+Dashboard memuat tabel sekali per proses dengan ``st.cache_resource``: semua
+sesi dalam satu proses server memakai data yang sama, tanpa salinan maupun
+deserialisasi di setiap rerun. Berbagi antar-proses tidak ditangani di sini;
+setiap worker/replika memuat salinannya sendiri dari store Parquet (hasil
+analisis antar-proses dibagi lewat ``olist.results``).
+
+Tabel bersama tidak pernah diserahkan langsung ke kode sesi. Dashboard
+mengaktifkan pandas Copy-on-Write, dan ``SharedTables`` mengembalikan salinan
+dangkal (``copy(deep=False)``) setiap kali tabel diakses: salinan ini memakai
+memori yang sama tanpa menyalin data, dan baru disalin ketika diubah. Karena
+itu penulisan apa pun oleh sesi (``.loc[...] = ...``, kolom baru,
+``fillna(inplace=True)``, ...) hanya mengenai salinan sesi tersebut dan tidak
+pernah mengubah tabel bersama.
+
+Fungsi di ``olist.analytics`` dan bagian-bagian dashboard tetap membuat frame
+baru untuk hasilnya dan tidak mengandalkan perubahan pada tabel masukan.
+"""
+from collections.abc import Mapping
+
+import pandas as pd
+
+
+class SharedTables(Mapping):
+    """Mapping nama tabel -> view Copy-on-Write dari DataFrame yang dipakai bersama oleh semua sesi."""
+
+    def __init__(self, tables):
+        if not pd.get_option('mode.copy_on_write'):
+            raise RuntimeError('SharedTables membutuhkan pandas Copy-on-Write '
+                               "(pd.set_option('mode.copy_on_write', True))")
+        self._tables = dict(tables)
+
+    def __getitem__(self, name):
+        return self._tables[name].copy(deep=False)
+
+    def __iter__(self):
+        return iter(self._tables)
+
+    def __len__(self):
+        return len(self._tables)
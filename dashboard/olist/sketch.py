@@ -0,0 +1,239 @@
+"""Sketsa HyperLogLog untuk jumlah pesanan dan pelanggan unik.
+
+Jumlah pesanan unik per kategori tidak bisa dijumlahkan antar-kategori, dan
+pelanggan unik tidak bisa dijumlahkan antar-bulan maupun antar-kategori
+(satu pelanggan bisa membeli berkali-kali). Jalur eksak karena itu harus
+meng-hash semua ID di baris yang terfilter (``nunique``) setiap kali filter
+berubah.
+
+Sketsa HyperLogLog bisa digabung: register gabungan dua himpunan adalah
+maksimum register masing-masing. Setiap ID di-hash sekali (64 bit) menjadi
+(register, rank) saat data dimuat, lalu untuk setiap sel (bulan, kategori,
+negara bagian) hanya disimpan rank maksimum per register yang terisi, terurut
+menurut bulan seperti histogram ``olist.patterns``. Sel rollup semua kategori
+dan semua negara bagian ikut disimpan, sehingga setiap kombinasi filter cukup
+menggabungkan satu sel per bulan. Bulan yang hanya sebagian tercakup rentang
+tanggal digabung dari (register, rank) baris mentahnya. Dengan ``PRECISION``
+12 (4096 register) galat standar perkiraan sekitar 1,6%; sel kecil memakai
+linear counting sehingga jumlah yang sangat kecil praktis eksak.
+"""
+import numpy as np
+import pandas as pd
+
+from .cube import CATEGORY_COLUMN
+from .index import TIMESTAMP_COLUMN, date_slice
+from .patterns import value_code
+
+# Jumlah bit hash untuk indeks register (4096 register). Minimal 11 agar sisa hash (64 - PRECISION bit)
+# tepat direpresentasikan float64 saat menghitung posisi bit pertama.
+PRECISION = 12
+REGISTERS = 1 << PRECISION
+STANDARD_ERROR = 1.04 / np.sqrt(REGISTERS)
+
+# Kolom ID yang dihitung -> nama ukuran
+MEASURES = {'orders': 'order_id', 'customers': 'customer_unique_id'}
+
+
+def register_ranks(ids):
+    # (register uint16, rank uint8) per baris dari hash 64-bit ID; rank 0 untuk ID kosong (tidak mengubah sketsa).
+    # Hash categorical dihitung dari kamusnya dan sama dengan hash nilai aslinya, jadi hasilnya tidak
+    # bergantung pada OLIST_COMPACT_IDS.
+    hashes = pd.util.hash_pandas_object(ids, index=False).to_numpy()
+    registers = (hashes >> np.uint64(64 - PRECISION)).astype(np.uint16)
+    rest = hashes & np.uint64((1 << (64 - PRECISION)) - 1)
+    _, bits = np.frexp(rest.astype(np.float64))
+    ranks = (64 - PRECISION + 1 - bits).astype(np.uint8)
+    ranks[ids.isna().to_numpy()] = 0
+    return registers, ranks
+
+
+def build_distinct_sketches(order_facts):
+    # Sketsa per sel (bulan, kategori, negara bagian) untuk setiap ukuran di MEASURES, termasuk sel rollup
+    # (kode kategori = jumlah kategori, kode negara bagian = jumlah negara bagian), beserta (register, rank),
+    # timestamp, dan kode kategori/negara bagian setiap baris order_facts untuk bulan tepi
+    categories = order_facts[CATEGORY_COLUMN].cat.categories
+    states = order_facts['customer_state'].cat.categories
+    has_item = order_facts['has_item'].to_numpy()
+    month = order_facts['purchase_month'].array.codes[has_item].astype(np.int64)
+    category = order_facts[CATEGORY_COLUMN].array.codes[has_item].astype(np.int64)
+    state = order_facts['customer_state'].array.codes[has_item].astype(np.int64)
+
+    # Setiap baris masuk ke sel (kategori|semua, negara bagian|semua); kode -1 (kosong) hanya masuk rollup
+    variants = [(category, state), (np.full_like(category, len(categories)), state),
+                (category, np.full_like(state, len(states))),
+                (np.full_like(category, len(categories)), np.full_like(state, len(states)))]
+    cell_keys = np.concatenate([
+        np.where((cell_category >= 0) & (cell_state >= 0),
+                 (month * (len(categories) + 1) + cell_category) * (len(states) + 1) + cell_state, -1)
+        for cell_category, cell_state in variants
+    ])
+
+    sketches = {
+        'months': order_facts['purchase_month'].cat.categories,
+        'categories': categories,
+        'states': states,
+        'timestamps': order_facts[TIMESTAMP_COLUMN].to_numpy(),
+        'has_item': has_item,
+        'row_category': order_facts[CATEGORY_COLUMN].array.codes,
+        'row_state': order_facts['customer_state'].array.codes,
+    }
+    for measure, column in MEASURES.items():
+        registers, ranks = register_ranks(order_facts[column])
+        entry_ranks = np.tile(ranks[has_item], len(variants))
+        keep = (cell_keys >= 0) & (entry_ranks > 0)
+        keys = cell_keys[keep] * REGISTERS + np.tile(registers[has_item], len(variants))[keep]
+
+        # Rank maksimum per (sel, register): urutkan menurut kunci lalu rank, ambil entri terakhir setiap kunci
+        order = np.lexsort((entry_ranks[keep], keys))
+        keys, entry_ranks = keys[order], entry_ranks[keep][order]
+        last = np.r_[keys[1:] != keys[:-1], True]
+        keys, entry_ranks = keys[last], entry_ranks[last]
+
+        cells, starts = np.unique(keys // REGISTERS, return_index=True)
+        cell_states = cells % (len(states) + 1)
+        cell_categories = cells // (len(states) + 1) % (len(categories) + 1)
+        sketches[measure] = {
+            'month': (cells // (len(states) + 1) // (len(categories) + 1)).astype(np.int16),
+            'category': cell_categories.astype(np.int16),
+            'state': cell_states.astype(np.int16),
+            'indptr': np.r_[starts, len(keys)],
+            'register': (keys % REGISTERS).astype(np.uint16),
+            'rank': entry_ranks,
+            'row_register': registers,
+            'row_rank': ranks,
+        }
+    return sketches
+
+
+def sketches_nbytes(sketches):
+    return sum(values.nbytes for measure in MEASURES for values in sketches[measure].values())
+
+
+def estimate(registers):
+    # Perkiraan kardinalitas setiap baris register (HyperLogLog dengan linear counting untuk kardinalitas kecil)
+    # 2^-rank dengan ldexp float32 (eksak untuk semua rank, jauh lebih cepat daripada tabel pencarian
+    # dengan indeks uint8), dijumlahkan dalam float64
+    registers = np.atleast_2d(registers)
+    alpha = 0.7213 / (1 + 1.079 / REGISTERS)
+    raw = alpha * REGISTERS ** 2 / np.ldexp(np.float32(1), -registers.astype(np.int8)).sum(axis=1, dtype=np.float64)
+    zeros = (registers == 0).sum(axis=1)
+    with np.errstate(divide='ignore'):
+        linear = REGISTERS * np.log(REGISTERS / zeros)
+    return np.where((raw <= 2.5 * REGISTERS) & (zeros > 0), linear, raw)
+
+
+def month_range(sketches, start_date, end_date):
+    # (kode bulan penuh [first, stop), posisi baris item order_facts di bulan tepi) untuk start_date <= t <= end_date
+    start, end = pd.Timestamp(start_date), pd.Timestamp(end_date)
+    first_month = start.to_period('M').start_time
+    if first_month < start:
+        first_month = (start.to_period('M') + 1).start_time
+    stop_month = (end + pd.Timedelta(1, 'ns')).to_period('M').start_time
+
+    timestamps = sketches['timestamps']
+    rows = date_slice(timestamps, start_date, end_date)
+    if first_month < stop_month:
+        months = sketches['months']
+        codes = (months.searchsorted(first_month.strftime('%Y-%m')), months.searchsorted(stop_month.strftime('%Y-%m')))
+        inner = np.searchsorted(timestamps, np.array([first_month, stop_month], dtype='datetime64[ns]'))
+        edge_rows = np.r_[rows.start:max(inner[0], rows.start), min(inner[1], rows.stop):rows.stop]
+    else:
+        codes = (0, 0)
+        edge_rows = np.arange(rows.start, rows.stop)
+    return codes, edge_rows[sketches['has_item'][edge_rows]]
+
+
+def distinct_estimates(sketches, start_date, end_date, category=None, state=None, by=None, span=None):
+    # Perkiraan pesanan dan pelanggan unik untuk satu kombinasi filter: dict ukuran -> array float,
+    # satu nilai (by=None) atau satu nilai per kategori/negara bagian (by='category'/'state', filter
+    # dimensi yang dikelompokkan diabaikan). span: hasil month_range untuk rentang yang sama, jika sudah ada.
+    categories, states = sketches['categories'], sketches['states']
+    category_code = len(categories) if category is None else value_code(categories, category)
+    state_code = len(states) if state is None else value_code(states, state)
+    groups = {None: 1, 'category': len(categories), 'state': len(states)}[by]
+    (first, stop), edge_rows = month_range(sketches, start_date, end_date) if span is None else span
+
+    # Baris tepi: kode kategori dan negara bagian mentah; baris dengan kode kosong (-1) hanya masuk rollup
+    row_category = sketches['row_category'][edge_rows]
+    row_state = sketches['row_state'][edge_rows]
+    row_keep = np.ones(len(edge_rows), dtype=bool)
+    row_group = np.zeros(len(edge_rows), dtype=np.int64)
+    if by == 'category':
+        row_keep &= row_category >= 0
+        row_group = row_category.astype(np.int64)
+    elif category is not None:
+        row_keep &= row_category == category_code
+    if by == 'state':
+        row_keep &= row_state >= 0
+        row_group = row_state.astype(np.int64)
+    elif state is not None:
+        row_keep &= row_state == state_code
+
+    result = {}
+    for measure in MEASURES:
+        sketch = sketches[measure]
+        cells = slice(*np.searchsorted(sketch['month'], [first, stop]))
+        cell_category, cell_state = sketch['category'][cells], sketch['state'][cells]
+        if by == 'category':
+            keep, group = (cell_category < len(categories)) & (cell_state == state_code), cell_category
+        elif by == 'state':
+            keep, group = (cell_category == category_code) & (cell_state < len(states)), cell_state
+        else:
+            keep, group = (cell_category == category_code) & (cell_state == state_code), np.zeros_like(cell_state)
+
+        # Entri sel terpilih: gabungan potongan indptr[c]:indptr[c + 1] setiap sel
+        chosen = np.flatnonzero(keep)
+        starts = sketch['indptr'][cells.start + chosen]
+        lengths = sketch['indptr'][cells.start + chosen + 1] - starts
+        entries = np.repeat(starts - np.cumsum(lengths) + lengths, lengths) + np.arange(lengths.sum())
+        slots = np.repeat(group[chosen].astype(np.int64), lengths) * REGISTERS + sketch['register'][entries]
+        registers = np.zeros(groups * REGISTERS, dtype=np.uint8)
+        np.maximum.at(registers, slots, sketch['rank'][entries])
+
+        rows = edge_rows[row_keep]
+        np.maximum.at(registers, row_group[row_keep] * REGISTERS + sketch['row_register'][rows],
+                      sketch['row_rank'][rows])
+        result[measure] = estimate(registers.reshape(groups, REGISTERS))
+    return result
+
+
+def distinct_breakdowns(sketches, start_date, end_date, category=None, state=None):
+    # (total, per kategori, per negara bagian) seperti yang ditampilkan dashboard, dengan rentang bulan
+    # dan baris tepi dihitung sekali untuk ketiganya
+    span = month_range(sketches, start_date, end_date)
+    return (distinct_estimates(sketches, start_date, end_date, category, state, span=span),
+            distinct_estimates(sketches, start_date, end_date, state=state, by='category', span=span),
+            distinct_estimates(sketches, start_date, end_date, category, by='state', span=span))
+
+
+def distinct_from_items(filtered_items, by=None):
+    # Jalur eksak (acuan): nunique atas baris item order_facts yang sudah difilter
+    if by is None:
+        return {measure: np.array([filtered_items[column].nunique()]) for measure, column in MEASURES.items()}
+    column = CATEGORY_COLUMN if by == 'category' else 'customer_state'
+    grouped = filtered_items.groupby(column, observed=False)
+    return {measure: grouped[id_column].nunique().to_numpy() for measure, id_column in MEASURES.items()}
+
+
+def distinct_frame(label_column, labels, counts):
+    # Frame (label, orders, customers) dari hasil per kelompok, tanpa kelompok kosong, terurut menurut pesanan
+    # lalu label (labels adalah kategori categorical yang sudah terurut, jadi posisi = urutan label)
+    orders = np.round(counts['orders']).astype(np.int64)
+    customers = np.round(counts['customers']).astype(np.int64)
+    present = np.flatnonzero(orders > 0)
+    present = present[np.lexsort((present, -orders[present]))]
+    return pd.DataFrame({
+        label_column: np.asarray(labels)[present],
+        'orders': orders[present],
+        'customers': customers[present],
+    })
+
+
+def relative_errors(estimates, exact):
+    # Galat relatif |perkiraan - eksak| / eksak per ukuran, hanya untuk nilai eksak > 0
+    errors = {}
+    for measure in MEASURES:
+        truth = np.asarray(exact[measure], dtype=np.float64)
+        counted = truth > 0
+        errors[measure] = np.abs(estimates[measure][counted] - truth[counted]) / truth[counted]
+    return errors
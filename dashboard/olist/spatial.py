@@ -0,0 +1,193 @@
+"""Analitik geospasial: jarak penjual-pelanggan, ongkos kirim, dan indeks grid.
+
+``geolocation_dataset.csv`` berisi lebih dari 1 juta titik dengan banyak
+duplikat per prefiks CEP. Saat store dibangun, tabel ini diringkas menjadi
+satu centroid per prefiks (``geolocation``, ~19 ribu baris; titik di luar
+kotak batas Brasil dibuang), lalu setiap item pesanan diberi jarak haversine
+antara centroid CEP penjual dan pelanggan di tabel ``shipping_facts``
+(terurut waktu pembelian, lihat ``olist.index``). Dashboard cukup memotong
+tabel ini per rentang tanggal tanpa merge 1 juta baris di setiap rerun.
+
+Pencarian "penjual dalam radius N km" memakai indeks grid: penjual
+dikelompokkan per sel lintang/bujur berukuran tetap, sehingga satu kueri hanya
+menghitung jarak ke penjual di sel yang bersinggungan dengan kotak radius.
+"""
+import numpy as np
+import pandas as pd
+
+from .delivery import days_between
+
+EARTH_RADIUS_KM = 6371.0088
+
+# Kotak batas Brasil (derajat); titik geolokasi di luar kotak ini dianggap salah
+LAT_BOUNDS = (-34.0, 5.5)
+LNG_BOUNDS = (-74.0, -34.0)
+
+# Ukuran sel indeks grid (derajat, ~55 km di lintang Brasil)
+GRID_CELL_DEGREES = 0.5
+
+# Lebar kelompok jarak untuk profil ongkos kirim dan lama pengiriman
+DISTANCE_BIN_KM = 100
+MAX_DISTANCE_KM = 3000
+
+
+def zip_centroids(geolocation):
+    # Satu centroid (rata-rata lintang/bujur) per prefiks CEP, terurut berdasarkan prefiks
+    lat, lng = geolocation['geolocation_lat'], geolocation['geolocation_lng']
+    valid = lat.between(*LAT_BOUNDS) & lng.between(*LNG_BOUNDS)
+    centroids = (geolocation[valid]
+                 .groupby('geolocation_zip_code_prefix', sort=True)[['geolocation_lat', 'geolocation_lng']]
+                 .mean()
+                 .reset_index())
+    centroids.columns = ['zip_code_prefix', 'lat', 'lng']
+    return centroids.astype({'zip_code_prefix': np.int32})
+
+
+def zip_coordinates(centroids, zip_prefixes):
+    # (lat, lng) untuk setiap prefiks CEP lewat searchsorted pada centroid terurut; NaN jika tidak ada
+    prefixes = centroids['zip_code_prefix'].to_numpy()
+    zips = np.asarray(zip_prefixes, dtype=np.int64)
+    if len(prefixes) == 0:
+        return np.full(len(zips), np.nan), np.full(len(zips), np.nan)
+    position = np.minimum(np.searchsorted(prefixes, zips), len(prefixes) - 1)
+    found = prefixes[position] == zips
+    return (np.where(found, centroids['lat'].to_numpy()[position], np.nan),
+            np.where(found, centroids['lng'].to_numpy()[position], np.nan))
+
+
+def haversine_km(lat1, lng1, lat2, lng2):
+    # Jarak lingkaran besar (km) antar pasangan titik dalam derajat, tervektorisasi
+    lat1, lng1, lat2, lng2 = (np.radians(np.asarray(x, dtype=np.float64)) for x in (lat1, lng1, lat2, lng2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lng2 - lng1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+
+def build_shipping_facts(orders, order_context, items, customers, sellers, centroids):
+    # Satu baris per item pesanan dengan jarak penjual-pelanggan (km), ongkos kirim, dan lama
+    # pengiriman pesanan (hari, NaN jika belum terkirim)
+    facts = pd.merge(
+        order_context[['order_id', 'customer_id', 'order_purchase_timestamp', 'customer_state']],
+        items[['order_id', 'seller_id', 'price', 'freight_value']],
+        on='order_id',
+        how='inner'
+    )
+
+    facts = pd.merge(facts, customers[['customer_id', 'customer_zip_code_prefix']].drop_duplicates('customer_id'),
+                     on='customer_id', how='left')
+    facts = pd.merge(facts, sellers[['seller_id', 'seller_zip_code_prefix', 'seller_state']]
+                     .drop_duplicates('seller_id'), on='seller_id', how='left')
+    customer_lat, customer_lng = zip_coordinates(
+        centroids, facts.pop('customer_zip_code_prefix').fillna(-1).to_numpy(np.int64))
+    seller_lat, seller_lng = zip_coordinates(
+        centroids, facts.pop('seller_zip_code_prefix').fillna(-1).to_numpy(np.int64))
+    facts['distance_km'] = haversine_km(seller_lat, seller_lng, customer_lat, customer_lng).astype(np.float32)
+
+    delivered = orders[(orders['order_status'] == 'delivered') & orders['order_delivered_customer_date'].notna()]
+    delivery_days = pd.DataFrame({
+        'order_id': delivered['order_id'].array,
+        'actual_delivery_days': days_between(delivered['order_delivered_customer_date'].to_numpy(),
+                                             delivered['order_purchase_timestamp'].to_numpy()).astype(np.float32),
+    })
+    facts = pd.merge(facts.drop(columns='customer_id'), delivery_days, on='order_id', how='left')
+    return facts.sort_values('order_purchase_timestamp', kind='stable', ignore_index=True)
+
+
+def distance_profile(rows, bin_km=DISTANCE_BIN_KM, max_km=MAX_DISTANCE_KM):
+    # Rata-rata ongkos kirim dan lama pengiriman per kelompok jarak (jarak >= max_km digabung ke
+    # kelompok terakhir); kelompok tanpa item dibuang
+    distance = rows['distance_km'].to_numpy(np.float64)
+    valid = ~np.isnan(distance)
+    distance = distance[valid]
+    n_bins = int(np.ceil(max_km / bin_km))
+    codes = np.minimum((distance // bin_km).astype(np.int64), n_bins - 1)
+
+    freight = rows['freight_value'].to_numpy(np.float64)[valid]
+    days = rows['actual_delivery_days'].to_numpy(np.float64)[valid]
+    delivered = ~np.isnan(days)
+    items = np.bincount(codes, minlength=n_bins)
+    delivered_items = np.bincount(codes[delivered], minlength=n_bins)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        profile = pd.DataFrame({
+            'distance_km': np.arange(n_bins) * bin_km + bin_km / 2,
+            'items': items,
+            'avg_freight': np.bincount(codes, weights=freight, minlength=n_bins) / items,
+            'freight_per_100km': np.bincount(codes, weights=freight, minlength=n_bins)
+                                 / np.bincount(codes, weights=np.maximum(distance, 1.0), minlength=n_bins) * 100,
+            'avg_delivery_days': np.bincount(codes[delivered], weights=days[delivered], minlength=n_bins)
+                                 / delivered_items,
+        })
+    return profile[profile['items'] > 0].reset_index(drop=True)
+
+
+def state_distances(rows):
+    # Rata-rata jarak, ongkos kirim, dan lama pengiriman per negara bagian pelanggan
+    rows = rows[rows['distance_km'].notna()]
+    stats = rows.groupby('customer_state', observed=True).agg(
+        items=('distance_km', 'size'),
+        avg_distance_km=('distance_km', 'mean'),
+        avg_freight=('freight_value', 'mean'),
+        avg_delivery_days=('actual_delivery_days', 'mean'),
+    ).reset_index()
+    stats.columns = ['state', 'items', 'avg_distance_km', 'avg_freight', 'avg_delivery_days']
+    return stats.sort_values('avg_distance_km', ascending=False, ignore_index=True)
+
+
+def grid_cells(lat, lng, cell_degrees):
+    return np.floor(lat / cell_degrees).astype(np.int64), np.floor(lng / cell_degrees).astype(np.int64)
+
+
+def cell_keys(rows, cols):
+    # Kunci sel tunggal yang terurut menurut (baris lintang, kolom bujur)
+    return rows * 2**32 + (cols + 2**31)
+
+
+def build_grid(lat, lng, cell_degrees=GRID_CELL_DEGREES):
+    # Indeks grid: titik diurutkan berdasarkan kunci sel, sehingga titik dalam satu sel
+    # berada dalam satu potongan kontigu yang ditemukan dengan searchsorted
+    lat, lng = np.asarray(lat, dtype=np.float64), np.asarray(lng, dtype=np.float64)
+    rows, cols = grid_cells(lat, lng, cell_degrees)
+    keys = cell_keys(rows, cols)
+    order = np.argsort(keys, kind='stable')
+    return {'keys': keys[order], 'order': order, 'lat': lat[order], 'lng': lng[order],
+            'cell_degrees': cell_degrees}
+
+
+def grid_query(grid, lat, lng, radius_km):
+    # Posisi titik (sesuai urutan input build_grid) dalam radius_km dari (lat, lng) dan jaraknya,
+    # terurut dari yang terdekat
+    cell_degrees = grid['cell_degrees']
+    lat_span = np.degrees(radius_km / EARTH_RADIUS_KM)
+    # Lebar bujur melebar mendekati kutub; dibatasi agar tetap hingga di lintang ekstrem
+    lng_span = lat_span / max(np.cos(np.radians(min(abs(lat) + lat_span, 89.0))), 1e-6)
+    row_lo, col_lo = grid_cells(np.array([lat - lat_span]), np.array([lng - lng_span]), cell_degrees)
+    row_hi, col_hi = grid_cells(np.array([lat + lat_span]), np.array([lng + lng_span]), cell_degrees)
+
+    # Setiap baris sel dalam kotak radius adalah satu rentang kunci kontigu
+    candidates = []
+    for row in range(int(row_lo[0]), int(row_hi[0]) + 1):
+        lo, hi = cell_keys(np.array([row, row]), np.array([col_lo[0], col_hi[0]]))
+        start = np.searchsorted(grid['keys'], lo, side='left')
+        stop = np.searchsorted(grid['keys'], hi, side='right')
+        candidates.append(np.arange(start, stop))
+    candidates = np.concatenate(candidates) if candidates else np.array([], dtype=np.int64)
+
+    distance = haversine_km(lat, lng, grid['lat'][candidates], grid['lng'][candidates])
+    inside = distance <= radius_km
+    candidates, distance = candidates[inside], distance[inside]
+    nearest = np.argsort(distance, kind='stable')
+    return grid['order'][candidates[nearest]], distance[nearest]
+
+
+def seller_locations(sellers, centroids):
+    # Penjual dengan koordinat centroid CEP-nya (penjual tanpa geolokasi dibuang)
+    lat, lng = zip_coordinates(centroids, sellers['seller_zip_code_prefix'].to_numpy(np.int64))
+    located = sellers[['seller_id', 'seller_city', 'seller_state']].assign(lat=lat, lng=lng)
+    return located[~np.isnan(lat)].reset_index(drop=True)
+
+
+def sellers_within(locations, grid, lat, lng, radius_km):
+    # Penjual dalam radius_km dari (lat, lng), terurut dari yang terdekat
+    positions, distance = grid_query(grid, lat, lng, radius_km)
+    nearby = locations.iloc[positions][['seller_id', 'seller_city', 'seller_state']].reset_index(drop=True)
+    nearby['distance_km'] = distance
+    return nearby
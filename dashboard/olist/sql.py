@@ -0,0 +1,519 @@
+"""Backend kueri SQL tertanam (DuckDB atau SQLite) untuk metrik dashboard.
+
+Alternatif untuk merge-filter-groupby pandas di ``olist.analytics``: tabel
+mentah dari ``data/`` (termasuk delta) dimuat sekali ke satu file basis data
+lokal, lalu setiap metrik dashboard dijalankan sebagai kueri SQL sehingga
+join, filter, dan agregasi terjadi di dalam mesin basis data dan hanya hasil
+agregat yang kecil yang masuk ke Python. ``olist.analytics`` tetap menjadi
+implementasi acuan; fungsi di sini mengembalikan frame dengan bentuk yang sama.
+
+    cd dashboard
+    python -m olist.sql build [--engine duckdb|sqlite]
+    python -m olist.sql check [--start 2018-01-01 --end 2018-08-31 --category health_beauty --state SP]
+
+DuckDB (``pip install duckdb``) mengeksekusi kueri secara kolumnar dan
+multi-thread; SQLite dari pustaka standar dipakai jika DuckDB tidak terpasang.
+Waktu disimpan sebagai detik epoch (BIGINT), tabel ``orders`` diurutkan
+berdasarkan waktu pembelian, dan ada indeks pada waktu pembelian, ``order_id``,
+dan ``customer_state``. Dashboard memakai backend ini dengan
+``OLIST_QUERY_BACKEND=duckdb`` atau ``OLIST_QUERY_BACKEND=sqlite``.
+
+Metrik yang butuh baris per pesanan (distribusi dan SLA pengiriman) diambil
+sebagai hitungan per kombinasi nilai hari (GROUP BY ... COUNT) lalu diperluas
+dengan ``np.repeat`` sehingga fungsi pandas yang sama menghasilkan angka yang
+sama. ``check`` membandingkan setiap metrik dengan jalur pandas.
+"""
+import argparse
+import sqlite3
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from . import analytics, store
+from . import delivery as delivery_engine
+from . import rfm as rfm_engine
+from .config import PROCESSED_DIR, STREAM_CHUNK_SIZE
+from .cube import CATEGORY_COLUMN, compare_summaries
+from .stream import compare_frames, read_chunks
+
+ENGINES = ['duckdb', 'sqlite']
+
+DATABASE_FILES = {'duckdb': 'olist.duckdb', 'sqlite': 'olist.sqlite'}
+
+DAY_SECONDS = 86_400
+
+# Kolom yang dimuat per tabel beserta tipe SQL-nya; purchase_month dihitung saat memuat
+TABLE_COLUMNS = {
+    'orders': {'order_id': 'TEXT', 'customer_id': 'TEXT', 'order_status': 'TEXT',
+               'order_purchase_timestamp': 'BIGINT', 'order_delivered_customer_date': 'BIGINT',
+               'order_estimated_delivery_date': 'BIGINT', 'purchase_month': 'TEXT'},
+    'customers': {'customer_id': 'TEXT', 'customer_city': 'TEXT', 'customer_state': 'TEXT'},
+    'order_items': {'order_id': 'TEXT', 'order_item_id': 'BIGINT', 'product_id': 'TEXT', 'seller_id': 'TEXT',
+                    'price': 'DOUBLE'},
+    'order_payments': {'order_id': 'TEXT', 'payment_type': 'TEXT', 'payment_installments': 'BIGINT',
+                       'payment_value': 'DOUBLE'},
+    'products': {'product_id': 'TEXT', 'product_category_name': 'TEXT'},
+    'product_category': {'product_category_name': 'TEXT', CATEGORY_COLUMN: 'TEXT'},
+}
+DERIVED_COLUMNS = ['purchase_month']
+
+INDEXES = {
+    'orders_purchase_timestamp': ('orders', 'order_purchase_timestamp'),
+    'orders_order_id': ('orders', 'order_id'),
+    'orders_customer_id': ('orders', 'customer_id'),
+    'customers_customer_id': ('customers', 'customer_id'),
+    'customers_customer_state': ('customers', 'customer_state'),
+    'order_items_order_id': ('order_items', 'order_id'),
+    'order_payments_order_id': ('order_payments', 'order_id'),
+    'products_product_id': ('products', 'product_id'),
+}
+
+IN_RANGE = 'o.order_purchase_timestamp BETWEEN ? AND ?'
+
+SALES_ITEMS = f'''
+    SELECT o.order_id, o.purchase_month, p.{CATEGORY_COLUMN} AS category, i.price
+    FROM orders o
+    JOIN order_items i ON i.order_id = o.order_id
+    LEFT JOIN products p ON p.product_id = i.product_id
+    WHERE {IN_RANGE} {{category_filter}}
+'''
+
+# Selisih hari dibulatkan ke bawah seperti Timedelta.days (detik epoch -> hari)
+DAYS = 'CAST(floor(({later} - {earlier}) * 1.0 / 86400) AS INTEGER)'
+
+DELIVERED_ORDERS = f'''
+    SELECT o.order_id, o.customer_id,
+           {DAYS.format(later='o.order_delivered_customer_date', earlier='o.order_estimated_delivery_date')}
+               AS delivery_difference,
+           {DAYS.format(later='o.order_delivered_customer_date', earlier='o.order_purchase_timestamp')}
+               AS actual_delivery_days,
+           {DAYS.format(later='o.order_estimated_delivery_date', earlier='o.order_purchase_timestamp')}
+               AS estimated_delivery_days
+    FROM orders o
+    WHERE o.order_status = 'delivered' AND o.order_delivered_customer_date IS NOT NULL
+          AND o.order_estimated_delivery_date IS NOT NULL AND {IN_RANGE}
+'''
+
+DAY_COLUMNS = ['delivery_difference', 'actual_delivery_days', 'estimated_delivery_days']
+
+
+def default_engine():
+    try:
+        import duckdb  # noqa: F401
+    except ImportError:
+        return 'sqlite'
+    return 'duckdb'
+
+
+def database_path(engine):
+    return PROCESSED_DIR / DATABASE_FILES[engine]
+
+
+def connect(engine, path=None, read_only=True):
+    path = database_path(engine) if path is None else path
+    if engine == 'duckdb':
+        import duckdb
+
+        return duckdb.connect(str(path), read_only=read_only)
+    if read_only:
+        # Satu koneksi read-only dipakai bersama oleh thread sesi dashboard
+        con = sqlite3.connect(f'file:{path}?mode=ro', uri=True, check_same_thread=False)
+    else:
+        con = sqlite3.connect(path)
+    try:
+        con.execute('SELECT floor(1.5)')
+    except sqlite3.OperationalError:
+        # SQLite tanpa fungsi matematika bawaan
+        import math
+
+        con.create_function('floor', 1, lambda x: None if x is None else math.floor(x), deterministic=True)
+    return con
+
+
+def is_duckdb(con):
+    return not isinstance(con, sqlite3.Connection)
+
+
+def query(con, sql, params=()):
+    # Hasil kueri sebagai DataFrame; DuckDB memakai cursor sendiri per kueri (aman antar-thread)
+    if is_duckdb(con):
+        return con.cursor().execute(sql, list(params)).df()
+    return pd.read_sql_query(sql, con, params=list(params))
+
+
+def epoch_range(start_date, end_date):
+    # Batas detik epoch inklusif yang setara dengan start_date <= timestamp <= end_date
+    start, end = pd.Timestamp(start_date).value, pd.Timestamp(end_date).value
+    return -(-start // 10**9), end // 10**9
+
+
+def epoch_seconds(timestamps):
+    seconds = pd.Series(timestamps.to_numpy('datetime64[s]').astype(np.int64), index=timestamps.index, dtype='Int64')
+    return seconds.mask(timestamps.isna())
+
+
+def prepare_chunk(table, chunk):
+    # Kolom tanggal CSV -> detik epoch; pesanan mendapat bulan pembelian 'YYYY-MM'
+    for col in store.DATE_COLUMNS.get(table, []):
+        if col in chunk.columns:
+            timestamps = pd.to_datetime(chunk[col], format=store.TIMESTAMP_FORMAT)
+            if col == 'order_purchase_timestamp':
+                chunk['purchase_month'] = timestamps.dt.strftime('%Y-%m')
+            chunk[col] = epoch_seconds(timestamps)
+    return chunk[list(TABLE_COLUMNS[table])]
+
+
+def insert_chunk(con, table, chunk):
+    if is_duckdb(con):
+        con.register('chunk', chunk)
+        con.execute(f'INSERT INTO {table} SELECT * FROM chunk')
+        con.unregister('chunk')
+    else:
+        chunk.to_sql(table, con, if_exists='append', index=False)
+
+
+def database_version(data_dir=None):
+    # Versi data CSV (sama dengan jalur CSV store), disimpan di tabel meta saat build
+    return store.compute_version(store.source_fingerprint(data_dir), store.delta_fingerprints(data_dir))
+
+
+def database_stamp(engine):
+    # Ukuran dan waktu modifikasi file basis data (None jika belum ada), kunci cache dashboard
+    path = database_path(engine)
+    return store.file_stat(path) if path.exists() else None
+
+
+def read_meta(con):
+    return dict(query(con, 'SELECT key, value FROM meta').itertuples(index=False))
+
+
+def database_status(engine, data_dir=None):
+    # 'missing', 'stale' (CSV atau delta berubah sejak build), atau 'fresh'
+    path = database_path(engine)
+    if not path.exists():
+        return 'missing'
+    con = connect(engine, path)
+    try:
+        version = read_meta(con).get('version')
+    finally:
+        con.close()
+    return 'fresh' if version == database_version(data_dir) else 'stale'
+
+
+def build_database(engine, data_dir=None, chunk_size=STREAM_CHUNK_SIZE):
+    # CSV dibaca per potongan (olist.stream) sehingga build tidak butuh memori sebesar dataset.
+    # File ditulis ke nama sementara lalu diganti, sehingga koneksi yang sedang terbuka tetap valid.
+    path = database_path(engine)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + '.tmp')
+    tmp_path.unlink(missing_ok=True)
+    version = database_version(data_dir)
+
+    con = connect(engine, tmp_path, read_only=False)
+    rows = {}
+    for table, columns in TABLE_COLUMNS.items():
+        staging = f'raw_{table}' if table in ('orders', 'products') else table
+        con.execute(f'CREATE TABLE {staging} ({", ".join(f"{col} {kind}" for col, kind in columns.items())})')
+        source_columns = [col for col in columns if col not in DERIVED_COLUMNS]
+        for chunk in read_chunks(table, source_columns, chunk_size, data_dir):
+            insert_chunk(con, staging, prepare_chunk(table, chunk))
+
+    # Pesanan terurut waktu pembelian (blok DuckDB bisa dilewati berdasarkan min/max); pesanan yang
+    # diperbarui delta hanya memakai baris terakhirnya. Produk digabung dengan terjemahan kategori seperti
+    # store.prepare_tables.
+    con.execute('CREATE TABLE orders AS SELECT * FROM raw_orders WHERE rowid IN '
+                '(SELECT MAX(rowid) FROM raw_orders GROUP BY order_id) ORDER BY order_purchase_timestamp')
+    con.execute(f'CREATE TABLE products AS SELECT p.product_id, c.{CATEGORY_COLUMN} FROM raw_products p '
+                'LEFT JOIN product_category c ON c.product_category_name = p.product_category_name')
+    con.execute('DROP TABLE raw_orders')
+    con.execute('DROP TABLE raw_products')
+    for name, (table, col) in INDEXES.items():
+        con.execute(f'CREATE INDEX {name} ON {table} ({col})')
+    con.execute('ANALYZE')
+
+    con.execute('CREATE TABLE meta (key TEXT, value TEXT)')
+    meta = {'version': version, 'engine': engine, 'built_at': time.strftime('%Y-%m-%dT%H:%M:%S')}
+    con.executemany('INSERT INTO meta VALUES (?, ?)', list(meta.items()))
+    for table in ['orders', 'customers', 'order_items', 'order_payments', 'products']:
+        rows[table] = int(query(con, f'SELECT COUNT(*) AS n FROM {table}')['n'].iloc[0])
+    if is_duckdb(con):
+        con.execute('CHECKPOINT')
+    else:
+        con.commit()
+        con.execute('VACUUM')
+    con.close()
+    tmp_path.replace(path)
+    return {**meta, 'rows': rows}
+
+
+def expand_counts(counts, group_col=None):
+    # Hasil GROUP BY ... COUNT(*) (kolom 'n') -> satu baris per pesanan dengan kolom hari int16.
+    # Kolom grup menjadi categorical terurut seperti kolom categorical di tabel pandas.
+    repeats = counts['n'].to_numpy(np.int64)
+    rows = pd.DataFrame({col: np.repeat(counts[col].to_numpy(np.int16), repeats)
+                         for col in DAY_COLUMNS if col in counts.columns})
+    if group_col is not None:
+        codes, groups = pd.factorize(counts[group_col], sort=True)
+        rows[group_col] = pd.Categorical.from_codes(np.repeat(codes, repeats), categories=groups)
+    return rows
+
+
+def filter_options(con):
+    # Rentang tanggal, kategori produk, dan negara bagian untuk sidebar dashboard
+    bounds = query(con, 'SELECT MIN(order_purchase_timestamp) AS lo, MAX(order_purchase_timestamp) AS hi '
+                        'FROM orders')
+    return {
+        'min_date': pd.Timestamp(int(bounds['lo'].iloc[0]), unit='s'),
+        'max_date': pd.Timestamp(int(bounds['hi'].iloc[0]), unit='s'),
+        'categories': query(con, f'SELECT DISTINCT {CATEGORY_COLUMN} AS c FROM products '
+                                 f'WHERE {CATEGORY_COLUMN} IS NOT NULL ORDER BY 1')['c'].tolist(),
+        'states': query(con, 'SELECT DISTINCT customer_state AS s FROM customers '
+                             'WHERE customer_state IS NOT NULL ORDER BY 1')['s'].tolist(),
+    }
+
+
+def sales_summary(con, start_date, end_date, category=None):
+    # Sama dengan cube.sales_summary_from_items pada baris order_facts yang sudah difilter
+    params = list(epoch_range(start_date, end_date))
+    category_filter = ''
+    if category is not None:
+        category_filter = f'AND p.{CATEGORY_COLUMN} = ?'
+        params.append(category)
+    items = SALES_ITEMS.format(category_filter=category_filter)
+
+    totals = query(con, f'SELECT COUNT(DISTINCT order_id) AS orders, COALESCE(SUM(price), 0) AS sales '
+                        f'FROM ({items}) t', params)
+    monthly_sales = query(con, f'SELECT purchase_month AS month, SUM(price) AS price FROM ({items}) t '
+                               'GROUP BY purchase_month ORDER BY purchase_month', params)
+    category_sales = query(con, f'SELECT category AS {CATEGORY_COLUMN}, SUM(price) AS price, '
+                                f'COUNT(DISTINCT order_id) AS order_id FROM ({items}) t '
+                                'WHERE category IS NOT NULL GROUP BY category ORDER BY category', params)
+    return {
+        'total_orders': int(totals['orders'].iloc[0]),
+        'total_sales': float(totals['sales'].iloc[0]),
+        'monthly_sales': monthly_sales,
+        'category_sales': category_sales,
+    }
+
+
+def rfm_inputs(con, start_date, end_date):
+    # Metrik RFM per pelanggan (recency, frequency, monetary) dari pesanan terkirim yang memiliki
+    # pembayaran, seperti rfm.compute_rfm sebelum pemberian skor
+    start, end = epoch_range(start_date, end_date)
+    rfm = query(con, f'''
+        WITH order_rows AS (
+            SELECT o.order_id, o.customer_id, o.order_purchase_timestamp AS purchased,
+                   SUM(p.payment_value) AS order_payment_value
+            FROM orders o
+            JOIN order_payments p ON p.order_id = o.order_id
+            WHERE o.order_status = 'delivered' AND {IN_RANGE}
+            GROUP BY o.order_id, o.customer_id, o.order_purchase_timestamp
+        )
+        SELECT r.customer_id, {DAYS.format(later='?', earlier='MAX(r.purchased)')} AS recency,
+               COUNT(*) AS frequency, SUM(r.order_payment_value) AS monetary,
+               MAX(c.customer_state) AS customer_state
+        FROM order_rows r
+        LEFT JOIN customers c ON c.customer_id = r.customer_id
+        GROUP BY r.customer_id
+        ORDER BY r.customer_id
+    ''', [start, end, pd.Timestamp(end_date).value / 10**9])
+    return rfm.astype({'recency': np.int32, 'frequency': np.int32, 'monetary': np.float64})
+
+
+def customer_rfm(con, start_date, end_date):
+    return rfm_engine.score_rfm(rfm_inputs(con, start_date, end_date))
+
+
+def payment_summary(con, start_date, end_date):
+    # Mengembalikan (ringkasan per metode, distribusi cicilan, rata-rata nilai per cicilan)
+    # seperti analytics.payment_summary
+    params = epoch_range(start_date, end_date)
+    payments = f'SELECT p.* FROM orders o JOIN order_payments p ON p.order_id = o.order_id WHERE {IN_RANGE}'
+    summary = query(con, f'SELECT payment_type, SUM(payment_value) AS total_value, '
+                         f'COUNT(DISTINCT order_id) AS order_count FROM ({payments}) t '
+                         'WHERE payment_type IS NOT NULL GROUP BY payment_type ORDER BY payment_type', params)
+    summary['percentage'] = summary['total_value'] / summary['total_value'].sum() * 100
+
+    installments = query(con, f'SELECT payment_installments AS installments, COUNT(*) AS count, '
+                              f'AVG(payment_value) AS avg_value FROM ({payments}) t '
+                              "WHERE payment_type = 'credit_card' AND payment_installments IS NOT NULL "
+                              'GROUP BY payment_installments ORDER BY payment_installments', params)
+    if len(installments) == 0:
+        return summary, None, None
+    return summary, installments[['installments', 'count']], installments[['installments', 'avg_value']]
+
+
+def delivery_data(con, start_date, end_date):
+    # Baris per pesanan terkirim (kolom hari int16) seperti analytics.delivery_data, dibangun dari
+    # hitungan per kombinasi nilai hari; urutan baris tidak sama tetapi semua agregatnya sama
+    counts = query(con, f'SELECT {", ".join(DAY_COLUMNS)}, COUNT(*) AS n FROM ({DELIVERED_ORDERS}) d '
+                        f'GROUP BY {", ".join(DAY_COLUMNS)}', epoch_range(start_date, end_date))
+    return expand_counts(counts)
+
+
+def delivery_sla(con, start_date, end_date, min_seller_orders=analytics.SELLER_SLA_MIN_ORDERS):
+    # Statistik SLA per negara bagian dan per penjual seperti analytics.delivery_sla
+    params = epoch_range(start_date, end_date)
+    state_counts = query(con, f'''
+        SELECT c.customer_state, d.delivery_difference, d.actual_delivery_days, COUNT(*) AS n
+        FROM ({DELIVERED_ORDERS}) d
+        LEFT JOIN customers c ON c.customer_id = d.customer_id
+        GROUP BY c.customer_state, d.delivery_difference, d.actual_delivery_days
+    ''', params)
+    # Baris (pesanan, penjual): satu pesanan dihitung sekali per penjual
+    seller_counts = query(con, f'''
+        SELECT i.seller_id, d.delivery_difference, d.actual_delivery_days, COUNT(DISTINCT i.order_id) AS n
+        FROM ({DELIVERED_ORDERS}) d
+        JOIN order_items i ON i.order_id = d.order_id
+        GROUP BY i.seller_id, d.delivery_difference, d.actual_delivery_days
+    ''', params)
+    per_state = delivery_engine.sla_stats(expand_counts(state_counts, 'customer_state'), 'customer_state')
+    per_seller = delivery_engine.sla_stats(expand_counts(seller_counts, 'seller_id'), 'seller_id',
+                                           min_orders=min_seller_orders)
+    return per_state, per_seller
+
+
+def customer_states(con, state=None):
+    # Jumlah pelanggan per negara bagian (seluruh data), seperti analytics.customer_states
+    state_filter, params = ('AND customer_state = ?', [state]) if state else ('', [])
+    return query(con, 'SELECT customer_state AS state, COUNT(*) AS customer_count FROM customers '
+                      f'WHERE customer_state IS NOT NULL {state_filter} '
+                      'GROUP BY customer_state ORDER BY customer_count DESC, state', params)
+
+
+def top_cities(con, state, n=10):
+    return query(con, 'SELECT customer_city AS city, COUNT(*) AS count FROM customers WHERE customer_state = ? '
+                      'GROUP BY customer_city ORDER BY count DESC, city LIMIT ?', [state, n])
+
+
+def compare_ranked(name, left, right, key, value):
+    # Daftar peringkat (misalnya top-N): nilai harus sama per posisi, dan kunci yang nilainya di atas
+    # nilai terakhir harus sama (urutan kunci dengan nilai seri boleh berbeda)
+    left, right = left.reset_index(drop=True), right.reset_index(drop=True)
+    if not np.array_equal(left[value].to_numpy(), right[value].to_numpy()):
+        return [f'{name}.{value}: nilai berbeda']
+    if len(left) == 0:
+        return []
+    above = left[value] > left[value].iloc[-1]
+    if set(left.loc[above, key].astype(str)) != set(right.loc[above, key].astype(str)):
+        return [f'{name}.{key}: urutan berbeda']
+    return []
+
+
+def compare_with_pandas(con, tables, start_date, end_date, category=None, state=None):
+    # Bandingkan setiap metrik dashboard dari backend SQL dengan jalur pandas (olist.analytics).
+    # Mengembalikan daftar perbedaan (kosong jika semua cocok).
+    problems = []
+    memory_sales, _ = analytics.sales_summary(tables['order_facts'], tables['sales_cube'], start_date, end_date,
+                                              category, use_cube=False)
+    sales = sales_summary(con, start_date, end_date, category)
+    problems += compare_summaries(sales, memory_sales)
+    problems += compare_frames('sales_monthly', sales['monthly_sales'], memory_sales['monthly_sales'], ['month'])
+    problems += compare_frames('sales_by_category', sales['category_sales'], memory_sales['category_sales'],
+                               [CATEGORY_COLUMN, 'order_id'])
+
+    rfm_columns = ['customer_id', 'recency', 'frequency', 'customer_state']
+    memory_rfm = analytics.customer_rfm(tables['order_facts'], start_date, end_date)
+    rfm = customer_rfm(con, start_date, end_date)
+    problems += compare_frames('rfm', rfm, memory_rfm, rfm_columns, ['monetary'])
+    if len(rfm) == len(memory_rfm):
+        # Skor M memakai peringkat nilai monetary; jumlah desimal dengan urutan penjumlahan berbeda
+        # bisa memecah nilai seri secara berbeda, jadi hanya perbedaan lebih dari 0,1% yang dilaporkan
+        moved = (rfm[['r_score', 'f_score', 'm_score']].to_numpy() !=
+                 memory_rfm[['r_score', 'f_score', 'm_score']].to_numpy()).any(axis=1).mean()
+        if moved > 0.001:
+            problems.append(f'rfm: skor berbeda untuk {moved:.2%} pelanggan')
+
+    summary, counts, values = analytics.payment_summary(tables['payment_facts'], start_date, end_date)
+    sql_summary, sql_counts, sql_values = payment_summary(con, start_date, end_date)
+    problems += compare_frames('payment_methods', sql_summary, summary, ['payment_type', 'order_count'],
+                               ['total_value', 'percentage'])
+    problems += compare_frames('installment_counts', sql_counts, counts, ['installments', 'count'])
+    problems += compare_frames('installment_values', sql_values, values, ['installments'], ['avg_value'])
+
+    memory_deliveries = analytics.delivery_data(tables['delivery_facts'], start_date, end_date)
+    deliveries = delivery_data(con, start_date, end_date)
+    problems += compare_frames('delivery_rows', deliveries.sort_values(DAY_COLUMNS),
+                               memory_deliveries.sort_values(DAY_COLUMNS), DAY_COLUMNS)
+    if len(deliveries) > 0 and len(memory_deliveries) > 0:
+        delivery, memory_delivery = analytics.delivery_summary(deliveries), analytics.delivery_summary(memory_deliveries)
+        problems += compare_frames('delivery_status', delivery.pop('status_counts'),
+                                   memory_delivery.pop('status_counts'), ['delivery_status', 'count'])
+        problems += [f'delivery.{key}: nilai berbeda' for key in delivery
+                     if not np.isclose(delivery[key], memory_delivery[key])]
+
+    sla_columns = ['orders', 'late_rate', 'on_time_rate', 'avg_delivery_days'] + \
+                  [f'p{p}_delivery_days' for p in delivery_engine.SLA_PERCENTILES]
+    for name, sql_sla, memory_sla, key in zip(
+            ['delivery_sla_state', 'delivery_sla_seller'],
+            delivery_sla(con, start_date, end_date),
+            analytics.delivery_sla(tables['delivery_facts'], start_date, end_date),
+            ['customer_state', 'seller_id']):
+        problems += compare_frames(name, sql_sla, memory_sla, [key, 'orders'], sla_columns)
+
+    problems += compare_frames('customer_states', customer_states(con, state).sort_values('state'),
+                               analytics.customer_states(tables['customers'], state).sort_values('state'),
+                               ['state', 'customer_count'])
+    for selected in [state] if state else filter_options(con)['states']:
+        problems += compare_ranked(f'top_cities[{selected}]', top_cities(con, selected),
+                                   analytics.top_cities(tables['customers'], selected), 'city', 'count')
+    return problems
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m olist.sql',
+                                     description='Basis data SQL tertanam (DuckDB/SQLite) untuk metrik dashboard.')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    for command, help_text in [('build', 'Bangun basis data dari CSV di data/'),
+                               ('status', 'Tampilkan status basis data'),
+                               ('check', 'Bandingkan setiap metrik dengan jalur pandas')]:
+        command_parser = subparsers.add_parser(command, help=help_text)
+        command_parser.add_argument('--engine', choices=ENGINES, default=None,
+                                    help='Mesin basis data (default duckdb jika terpasang, selain itu sqlite)')
+        if command == 'build':
+            command_parser.add_argument('--chunk-size', type=int, default=STREAM_CHUNK_SIZE,
+                                        help='Jumlah baris CSV per potongan saat memuat')
+        if command == 'check':
+            command_parser.add_argument('--start', help='Tanggal mulai (YYYY-MM-DD), default awal data')
+            command_parser.add_argument('--end', help='Tanggal akhir (YYYY-MM-DD), default akhir data')
+            command_parser.add_argument('--category', help='Kategori produk (nama bahasa Inggris)')
+            command_parser.add_argument('--state', help='Kode negara bagian pelanggan, misalnya SP')
+    args = parser.parse_args(argv)
+    engine = args.engine or default_engine()
+
+    if args.command == 'status':
+        print(f'Basis data {database_path(engine)}: {database_status(engine)}')
+        return
+
+    if args.command == 'build':
+        start = time.perf_counter()
+        meta = build_database(engine, chunk_size=args.chunk_size)
+        elapsed = time.perf_counter() - start
+        for table, rows in meta['rows'].items():
+            print(f'  {table:<16} {rows:>10,} baris')
+        print(f'Basis data {engine} versi {meta["version"]} dibangun di {database_path(engine)} '
+              f'dalam {elapsed:.2f} detik')
+        return
+
+    status = database_status(engine)
+    if status != 'fresh':
+        print(f'Basis data {engine} {status}, jalankan `python -m olist.sql build --engine {engine}`.')
+        sys.exit(1)
+    tables, _, source = store.load_tables()
+    con = connect(engine)
+    timestamps = tables['orders']['order_purchase_timestamp']
+    start_date = pd.Timestamp(args.start) if args.start else timestamps.min()
+    end_date = pd.Timestamp(args.end) if args.end else timestamps.max()
+    problems = compare_with_pandas(con, tables, start_date, end_date, args.category, args.state)
+    for problem in problems:
+        print(f'  {problem}')
+    print(f'Pemeriksaan {engine} terhadap pandas ({source}): '
+          f'{"semua metrik cocok" if not problems else f"{len(problems)} perbedaan"}')
+    if problems:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
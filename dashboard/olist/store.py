@@ -0,0 +1,611 @@
+"""Penyimpanan kolumnar (Parquet) untuk dataset Olist.
+
+Build sekali dari CSV mentah:
+
+    cd dashboard
+    python -m olist.store build
+
+Dashboard kemudian membaca file Parquet di ``processed_data/`` dan hanya
+kembali ke CSV jika store belum ada atau sudah kedaluwarsa.
+
+Setiap tabel disimpan sebagai direktori berisi satu atau lebih file part;
+tabel berbasis waktu pembelian (``PARTITIONED_TABLES``) dipecah menjadi satu
+part per bulan pembelian. Data baru bisa ditambahkan tanpa build ulang:
+letakkan CSV delta di ``data/deltas/<YYYY-MM-DD>/`` (nama file sama dengan CSV
+mentah), lalu
+
+    python -m olist.store append
+
+Delta boleh berisi pesanan baru beserta item, pembayaran, ulasan, dan
+pelanggan barunya, baris pesanan lama yang diperbarui (status, tanggal
+pengiriman), serta catatan susulan untuk pesanan lama (misalnya ulasan yang
+ditulis setelah barang diterima). Baris tabel mentah ditulis sebagai part
+baru, tabel fakta hanya dibangun untuk pesanan yang disentuh delta, part
+bulanan hanya ditulis ulang untuk bulan pesanan lama yang berubah, dan kubus
+penjualan hanya dihitung ulang untuk bulan yang terdampak.
+
+Kolom ID disimpan sebagai kode int32 dengan kamus per entitas di ``keys/``
+(lihat ``olist.keys``).
+"""
+import argparse
+import hashlib
+import json
+import shutil
+import time
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from . import keys
+from .config import COMPACT_IDS, DATA_DIR, PROCESSED_DIR
+from .cube import aggregate_cells, build_sales_cube
+from .facts import build_fact_tables
+from .index import SORTED_TABLES, TIMESTAMP_COLUMN, sort_by_timestamp
+from .spatial import zip_centroids
+
+# Naikkan angka ini setiap kali skema/tipe data store berubah
+SCHEMA_VERSION = 12
+
+MANIFEST_FILE = 'manifest.json'
+
+DELTA_DIR_NAME = 'deltas'
+
+# Nama tabel -> nama file CSV sumber
+SOURCE_FILES = {
+    'customers': 'customers_dataset.csv',
+    'geolocation': 'geolocation_dataset.csv',
+    'order_items': 'order_items_dataset.csv',
+    'order_payments': 'order_payments_dataset.csv',
+    'order_reviews': 'order_reviews_dataset.csv',
+    'orders': 'orders_dataset.csv',
+    'product_category': 'product_category_name_translation.csv',
+    'products': 'products_dataset.csv',
+    'sellers': 'sellers_dataset.csv',
+}
+
+# Sumber opsional: geolocation_dataset.csv (lebih dari 1 juta baris) tidak ikut di repo. Tanpa file ini
+# tabel geolocation dan shipping_facts tidak dibangun dan analisis jarak pengiriman tidak tersedia.
+OPTIONAL_SOURCES = ['geolocation']
+
+# Tabel yang boleh muncul di delta harian
+DELTA_TABLES = ['customers', 'orders', 'order_items', 'order_payments', 'order_reviews']
+
+# Tabel yang disimpan di store (kategori produk sudah digabung ke products, geolokasi
+# diringkas menjadi centroid per prefiks CEP), termasuk tabel fakta turunan agar join
+# hanya dilakukan sekali per versi data
+STORE_TABLES = ['customers', 'geolocation', 'order_items', 'order_payments', 'order_reviews',
+                'orders', 'products', 'sellers', 'order_facts', 'payment_facts', 'delivery_facts',
+                'shipping_facts', 'review_facts', 'seller_facts', 'sales_cube']
+
+# Tabel yang ditulis satu part per bulan pembelian (nama part diakhiri 'YYYY-MM'), sehingga
+# pembaruan pesanan lama cukup menulis ulang part bulan pesanan tersebut
+PARTITIONED_TABLES = SORTED_TABLES
+
+TIMESTAMP_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+# Kolom tanggal per tabel
+DATE_COLUMNS = {
+    'orders': ['order_purchase_timestamp', 'order_approved_at', 'order_delivered_carrier_date',
+               'order_delivered_customer_date', 'order_estimated_delivery_date'],
+    'order_items': ['shipping_limit_date'],
+    'order_reviews': ['review_creation_date', 'review_answer_timestamp'],
+}
+
+# Kolom berkardinalitas rendah yang disimpan sebagai categorical (kolom ID diatur oleh keys)
+CATEGORY_COLUMNS = {
+    'customers': ['customer_state', 'customer_city'],
+    'orders': ['order_status'],
+    'order_payments': ['payment_type'],
+    'products': ['product_category_name', 'product_category_name_english'],
+    'sellers': ['seller_state', 'seller_city'],
+}
+
+
+def find_source_file(filename, data_dir=None):
+    # Urutan pencarian sama seperti loader lama: processed_data dulu, lalu data mentah
+    data_dir = DATA_DIR if data_dir is None else data_dir
+    for directory in [PROCESSED_DIR, data_dir]:
+        path = directory / filename
+        if path.exists():
+            return path
+    return data_dir / filename
+
+
+def file_stat(path):
+    stat = path.stat()
+    return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+
+def source_fingerprint(data_dir=None):
+    # Ukuran dan waktu modifikasi setiap CSV sumber, dipakai untuk deteksi store kedaluwarsa
+    fingerprint = {}
+    for table, filename in SOURCE_FILES.items():
+        path = find_source_file(filename, data_dir)
+        if path.exists():
+            fingerprint[table] = file_stat(path)
+    return fingerprint
+
+
+def list_deltas(data_dir=None):
+    # Direktori delta diurutkan berdasarkan nama (tanggal)
+    delta_root = (DATA_DIR if data_dir is None else data_dir) / DELTA_DIR_NAME
+    if not delta_root.exists():
+        return []
+    return sorted(path for path in delta_root.iterdir() if path.is_dir())
+
+
+def delta_fingerprint(delta_dir):
+    return {table: file_stat(delta_dir / SOURCE_FILES[table])
+            for table in DELTA_TABLES if (delta_dir / SOURCE_FILES[table]).exists()}
+
+
+def delta_fingerprints(data_dir=None):
+    return {delta_dir.name: delta_fingerprint(delta_dir) for delta_dir in list_deltas(data_dir)}
+
+
+def compute_version(fingerprint, deltas=None):
+    payload = json.dumps({'schema': SCHEMA_VERSION, 'sources': fingerprint, 'deltas': deltas or {}},
+                         sort_keys=True)
+    return hashlib.sha1(payload.encode()).hexdigest()[:12]
+
+
+def apply_types(tables):
+    # Konversi kolom tanggal dan categorical (dipakai untuk data dasar maupun delta)
+    for table, columns in DATE_COLUMNS.items():
+        if table not in tables:
+            continue
+        for col in columns:
+            tables[table][col] = pd.to_datetime(tables[table][col], format=TIMESTAMP_FORMAT)
+
+    for table, columns in CATEGORY_COLUMNS.items():
+        if table not in tables:
+            continue
+        for col in columns:
+            if col in tables[table].columns:
+                tables[table][col] = tables[table][col].astype('category')
+    return tables
+
+
+def prepare_tables(raw):
+    # Gabungkan terjemahan kategori produk, ringkas geolokasi per prefiks CEP, terapkan tipe data
+    # (termasuk kamus ID bersama), lalu bangun tabel fakta dan kubus
+    tables = dict(raw)
+    if 'geolocation' in tables:
+        tables['geolocation'] = zip_centroids(tables['geolocation'])
+    tables['products'] = pd.merge(
+        tables['products'],
+        tables.pop('product_category'),
+        on='product_category_name',
+        how='left'
+    )
+    tables = keys.encode_ids(apply_types(tables))
+    tables.update(build_fact_tables(tables))
+    tables['sales_cube'] = build_sales_cube(tables['order_facts'])
+
+    # Tabel berbasis waktu pembelian disimpan terurut agar filter tanggal cukup memakai searchsorted
+    for table in SORTED_TABLES:
+        if table in tables:
+            tables[table] = sort_by_timestamp(tables[table])
+    return tables
+
+
+def concat_rows(frames):
+    # pd.concat tanpa frame kosong: delta sering tidak menambah baris pada sebagian tabel, dan concat
+    # dengan frame kosong memicu FutureWarning pandas (dtype hasilnya akan berubah di versi berikutnya)
+    frames = [frame for frame in frames if len(frame) > 0] or frames[:1]
+    return frames[0].reset_index(drop=True) if len(frames) == 1 else pd.concat(frames, ignore_index=True)
+
+
+def read_delta_csvs(delta_dir):
+    return {table: pd.read_csv(delta_dir / SOURCE_FILES[table])
+            for table in DELTA_TABLES if (delta_dir / SOURCE_FILES[table]).exists()}
+
+
+def load_csv_tables(data_dir=None):
+    # Jalur lambat: parsing semua CSV mentah, termasuk delta yang sudah diletakkan di data/deltas
+    raw = {}
+    for table, filename in SOURCE_FILES.items():
+        path = find_source_file(filename, data_dir)
+        if table not in OPTIONAL_SOURCES or path.exists():
+            raw[table] = pd.read_csv(path)
+    for delta_dir in list_deltas(data_dir):
+        for table, frame in read_delta_csvs(delta_dir).items():
+            if table == 'orders':
+                # Pesanan yang sudah ada di delta adalah pembaruan: baris terbaru menggantikan baris lama
+                raw[table] = raw[table][~raw[table]['order_id'].isin(frame['order_id'])]
+            raw[table] = concat_rows([raw[table], frame])
+    return prepare_tables(raw)
+
+
+def read_manifest(store_dir=None):
+    path = (PROCESSED_DIR if store_dir is None else store_dir) / MANIFEST_FILE
+    if not path.exists():
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+def write_manifest(manifest, store_dir):
+    with open(store_dir / MANIFEST_FILE, 'w') as f:
+        json.dump(manifest, f, indent=2)
+
+
+def store_status(data_dir=None, store_dir=None):
+    # Mengembalikan 'missing', 'stale', 'pending' (ada delta belum diterapkan), atau 'fresh'
+    store_dir = PROCESSED_DIR if store_dir is None else store_dir
+    manifest = read_manifest(store_dir)
+    if manifest is None or manifest.get('schema') != SCHEMA_VERSION:
+        return 'missing'
+    if any(not (store_dir / table).is_dir() for table in stored_tables(manifest)):
+        return 'missing'
+    if any(not (store_dir / keys.KEYS_DIR_NAME / col).is_dir() for col in manifest['keys']):
+        return 'missing'
+
+    # Store tetap dipakai jika CSV sumber tidak tersedia (misalnya di deployment)
+    current = source_fingerprint(data_dir)
+    for table, stat in current.items():
+        if manifest['sources'].get(table) != stat:
+            return 'stale'
+
+    applied = manifest['deltas']
+    pending = False
+    for name, files in delta_fingerprints(data_dir).items():
+        if name not in applied:
+            pending = True
+        elif applied[name] != files:
+            return 'stale'
+    return 'pending' if pending else 'fresh'
+
+
+def stored_tables(manifest):
+    # Tabel STORE_TABLES yang ada di store (tanpa tabel dari sumber opsional yang tidak tersedia saat build)
+    return [table for table in STORE_TABLES if table in manifest['rows']]
+
+
+def data_version(data_dir=None, store_dir=None):
+    # Versi data yang akan dibaca load_tables, murah untuk dipanggil di setiap rerun
+    if store_status(data_dir, store_dir) in ('fresh', 'pending'):
+        return read_manifest(store_dir)['version']
+    return compute_version(source_fingerprint(data_dir), delta_fingerprints(data_dir))
+
+
+def table_parts(store_dir, table):
+    return sorted((store_dir / table).glob('part-*.parquet'))
+
+
+def purchase_months(frame):
+    return frame[TIMESTAMP_COLUMN].dt.strftime('%Y-%m').to_numpy()
+
+
+def month_parts(store_dir, table, months):
+    # Part tabel PARTITIONED_TABLES untuk bulan-bulan pembelian tertentu
+    suffixes = tuple(f'-{month}' for month in months)
+    return [path for path in table_parts(store_dir, table) if suffixes and path.stem.endswith(suffixes)]
+
+
+def read_parts(paths):
+    return pq.read_table([str(path) for path in paths], memory_map=True).to_pandas()
+
+
+def to_arrow(frame):
+    # Kolom ID ditulis sebagai kode int32 (kamusnya di keys/). Kolom categorical lain hanya
+    # menyimpan nilai yang dipakai, dengan indeks dictionary int32 agar part delta yang kamusnya
+    # lebih besar tetap cocok dengan skema part pertama.
+    frame = keys.to_codes(frame)
+    for col in frame.columns:
+        if isinstance(frame[col].dtype, pd.CategoricalDtype):
+            frame[col] = frame[col].cat.remove_unused_categories()
+    arrow_table = pa.Table.from_pandas(frame, preserve_index=False)
+    fields = [field.with_type(pa.dictionary(pa.int32(), field.type.value_type))
+              if pa.types.is_dictionary(field.type) else field for field in arrow_table.schema]
+    return arrow_table.cast(pa.schema(fields, metadata=arrow_table.schema.metadata))
+
+
+def write_table(frame, store_dir, table, part_name='base', replace=False):
+    # Tulis frame sebagai part baru; replace=True menghapus part lama terlebih dahulu.
+    # Tabel PARTITIONED_TABLES ditulis satu part per bulan pembelian.
+    table_dir = store_dir / table
+    if replace and table_dir.exists():
+        shutil.rmtree(table_dir)
+    table_dir.mkdir(parents=True, exist_ok=True)
+    parts = table_parts(store_dir, table)
+    # Nomor part melanjutkan nomor terbesar, karena part bulanan yang ditulis ulang dihapus
+    number = int(parts[-1].name.split('-')[1]) + 1 if parts else 0
+    if parts:
+        # Samakan skema dengan part yang sudah ada agar semua part terbaca sebagai satu dataset
+        schema = pq.read_schema(parts[0])
+        arrow_table = to_arrow(frame[schema.names]).cast(schema)
+    else:
+        arrow_table = to_arrow(frame)
+
+    if table not in PARTITIONED_TABLES or len(frame) == 0:
+        pq.write_table(arrow_table, table_dir / f'part-{number:05d}-{part_name}.parquet', compression='zstd')
+        return
+    months = purchase_months(frame)
+    for offset, month in enumerate(np.unique(months)):
+        pq.write_table(arrow_table.take(np.flatnonzero(months == month)),
+                       table_dir / f'part-{number + offset:05d}-{part_name}-{month}.parquet', compression='zstd')
+
+
+def read_table(store_dir, table, **kwargs):
+    return pd.read_parquet(store_dir / table, engine='pyarrow', memory_map=True, **kwargs)
+
+
+def read_dictionaries(store_dir):
+    # Kamus ID per entitas dalam urutan kode store
+    keys_dir = store_dir / keys.KEYS_DIR_NAME
+    return {col: read_table(keys_dir, col)[col].to_numpy(object)
+            for col in keys.ID_COLUMNS if (keys_dir / col).is_dir()}
+
+
+def write_dictionaries(values, store_dir, part_name='base', replace=False):
+    for col, col_values in values.items():
+        if replace or len(col_values):
+            frame = pd.DataFrame({col: pd.Index(col_values).to_numpy(object)})
+            write_table(frame, store_dir / keys.KEYS_DIR_NAME, col, part_name=part_name, replace=replace)
+
+
+def sort_categories(frame):
+    # Part yang berbeda bisa menghasilkan urutan kategori berbeda; samakan dengan jalur CSV
+    for col in frame.columns:
+        if isinstance(frame[col].dtype, pd.CategoricalDtype):
+            categories = frame[col].cat.categories
+            if not categories.is_monotonic_increasing:
+                frame[col] = frame[col].cat.set_categories(categories.sort_values())
+    return frame
+
+
+def build_store(data_dir=None, store_dir=None):
+    store_dir = PROCESSED_DIR if store_dir is None else store_dir
+    store_dir.mkdir(parents=True, exist_ok=True)
+
+    fingerprint = source_fingerprint(data_dir)
+    deltas = delta_fingerprints(data_dir)
+    tables = load_csv_tables(data_dir)
+    dictionaries = {col: frame[col].cat.categories for frame in tables.values() for col in keys.ID_COLUMNS
+                    if col in frame.columns}
+    write_dictionaries(dictionaries, store_dir, replace=True)
+    for table in STORE_TABLES:
+        if table in tables:
+            write_table(tables[table], store_dir, table, replace=True)
+        elif (store_dir / table).exists():
+            shutil.rmtree(store_dir / table)
+
+    manifest = {
+        'schema': SCHEMA_VERSION,
+        'version': compute_version(fingerprint, deltas),
+        'built_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'sources': fingerprint,
+        'deltas': deltas,
+        'rows': {table: len(tables[table]) for table in STORE_TABLES if table in tables},
+        'keys': {col: len(values) for col, values in dictionaries.items()},
+    }
+    write_manifest(manifest, store_dir)
+    return manifest
+
+
+def update_sales_cube(cube, month_cells, months):
+    # Ganti sel bulan-bulan yang terdampak delta dengan sel yang dihitung ulang dari baris order_facts
+    # bulan tersebut (delta bisa memperbarui pesanan lama, sehingga sel lama tidak bisa sekadar ditambah)
+    affected = cube['purchase_month'].isin(months)
+    updated = concat_rows([cube[~affected], month_cells[cube.columns]])
+
+    # concat categorical dengan kategori berbeda menghasilkan object; kembalikan ke categorical
+    for col in cube.columns:
+        if isinstance(cube[col].dtype, pd.CategoricalDtype):
+            updated[col] = updated[col].astype('category')
+    return updated
+
+
+def replace_order_rows(frame, store_dir, table, dtypes, order_codes, months, part_name):
+    # Ganti baris pesanan order_codes (tersimpan di part bulan-bulan months) dengan baris frame: part
+    # bulan tersebut dibaca, baris lama pesanan dibuang, lalu ditulis ulang bersama frame sebagai part
+    # baru. Part bulan lain tidak disentuh. Mengembalikan selisih jumlah baris tabel.
+    old_parts = month_parts(store_dir, table, months)
+    added = len(frame)
+    if old_parts:
+        old = read_parts(old_parts)
+        stale = np.isin(old['order_id'].to_numpy(), order_codes)
+        kept = keys.from_codes(old[~stale].reset_index(drop=True), dtypes)
+        frame = sort_by_timestamp(concat_rows([kept, frame]))
+        added -= int(stale.sum())
+    if len(frame) or old_parts:
+        write_table(frame, store_dir, table, part_name=part_name)
+    for path in old_parts:
+        path.unlink()
+    return added
+
+
+def append_delta(delta_dir, store_dir=None):
+    store_dir = PROCESSED_DIR if store_dir is None else store_dir
+    manifest = read_manifest(store_dir)
+    delta = apply_types(read_delta_csvs(delta_dir))
+    dtypes = {col: pd.CategoricalDtype(values) for col, values in read_dictionaries(store_dir).items()}
+
+    # Pesanan delta yang sudah ada di store adalah pembaruan. Item, pembayaran, dan ulasan boleh merujuk
+    # pesanan delta maupun pesanan lama di store (catatan susulan, misalnya ulasan setelah pengiriman).
+    stored_orders = dtypes['order_id'].categories
+    delta_orders = pd.Index(delta['orders']['order_id'] if 'orders' in delta else [], dtype=object)
+    touched = delta_orders.unique()
+    for table in ['order_items', 'order_payments', 'order_reviews']:
+        if table in delta:
+            order_ids = pd.Index(delta[table]['order_id'].unique())
+            unknown = order_ids.difference(delta_orders).difference(stored_orders)
+            if len(unknown):
+                raise ValueError(f'Delta {delta_dir.name}: {table} merujuk {len(unknown)} pesanan yang tidak ada '
+                                 'di store maupun di delta')
+            touched = touched.union(order_ids)
+    if len(touched) == 0:
+        raise ValueError(f'Delta {delta_dir.name} tidak berisi pesanan maupun catatan pesanan')
+
+    # ID baru dari delta ditambahkan di ujung kamus store sehingga kode yang sudah ditulis tetap berlaku
+    dtypes, added = keys.extend_dtypes(dtypes, delta)
+    keys.encode_ids(delta, dtypes)
+    existing_codes = pd.Categorical(touched.intersection(stored_orders), dtype=dtypes['order_id']).codes
+
+    def read_keyed(table, codes=None, col='order_id'):
+        # Baris tabel store dengan kolom ID categorical, opsional hanya baris dengan kode col tertentu.
+        # Tanpa kode yang dicari cukup skema part pertama, tanpa membaca isi tabel.
+        if codes is not None and len(codes) == 0:
+            frame = pq.read_schema(table_parts(store_dir, table)[0]).empty_table().to_pandas()
+        else:
+            filters = None if codes is None else [(col, 'in', codes.tolist())]
+            frame = read_table(store_dir, table, filters=filters)
+        return keys.from_codes(frame, dtypes)
+
+    # Baris tersimpan pesanan lama yang disentuh delta (diganti baris delta jika ada); bulan pembeliannya
+    # menentukan part bulanan yang ditulis ulang
+    old_orders = read_keyed('orders', existing_codes)
+    old_months = np.unique(purchase_months(old_orders))
+    orders = old_orders
+    if 'orders' in delta:
+        orders = concat_rows([old_orders[~old_orders['order_id'].isin(delta['orders']['order_id'])],
+                              delta['orders']])
+    orders = sort_by_timestamp(orders)
+
+    # Konteks untuk tabel fakta: pelanggan pesanan, catatan tersimpan pesanan lama ditambah catatan delta,
+    # tabel produk, penjual, dan centroid CEP
+    customer_codes = keys.id_codes(orders['customer_id'].drop_duplicates())
+    customers = read_keyed('customers', customer_codes, 'customer_id')
+    if 'customers' in delta:
+        delta['customers'] = delta['customers'][~delta['customers']['customer_id'].isin(customers['customer_id'])]
+        customers = concat_rows([customers, delta['customers']])
+    context = {'orders': orders, 'customers': customers}
+    for table in ['order_items', 'order_payments', 'order_reviews']:
+        context[table] = concat_rows([read_keyed(table, existing_codes)] + ([delta[table]] if table in delta else []))
+    context.update(products=read_keyed('products'), sellers=read_keyed('sellers'))
+    if 'geolocation' in manifest['rows']:
+        context['geolocation'] = read_table(store_dir, 'geolocation')
+    delta_facts = build_fact_tables(keys.encode_ids(context, dtypes))
+    for table in SORTED_TABLES:
+        if table in delta_facts:
+            delta_facts[table] = sort_by_timestamp(delta_facts[table])
+
+    write_dictionaries(added, store_dir, part_name=delta_dir.name)
+    for col, values in added.items():
+        manifest['keys'][col] = manifest['keys'].get(col, 0) + len(values)
+    for table in ['customers', 'order_items', 'order_payments', 'order_reviews']:
+        if table in delta and len(delta[table]):
+            write_table(delta[table], store_dir, table, part_name=delta_dir.name)
+            manifest['rows'][table] += len(delta[table])
+    for table, frame in [('orders', orders)] + list(delta_facts.items()):
+        manifest['rows'][table] += replace_order_rows(frame, store_dir, table, dtypes, existing_codes, old_months,
+                                                      delta_dir.name)
+
+    # Sel kubus bulan yang terdampak dihitung ulang dari part order_facts bulan tersebut
+    months = np.union1d(old_months, purchase_months(orders))
+    month_facts = keys.from_codes(read_parts(month_parts(store_dir, 'order_facts', months)), dtypes)
+    month_cells = aggregate_cells(month_facts[month_facts['has_item']])
+    cube = update_sales_cube(read_table(store_dir, 'sales_cube'), month_cells, months)
+    write_table(cube, store_dir, 'sales_cube', replace=True)
+    manifest['rows']['sales_cube'] = len(cube)
+
+    files = delta_fingerprint(delta_dir)
+    manifest['deltas'][delta_dir.name] = files
+    payload = json.dumps([manifest['version'], delta_dir.name, files], sort_keys=True)
+    manifest['version'] = hashlib.sha1(payload.encode()).hexdigest()[:12]
+    write_manifest(manifest, store_dir)
+    return manifest
+
+
+def append_pending_deltas(data_dir=None, store_dir=None):
+    applied = read_manifest(store_dir)['deltas']
+    appended = []
+    for delta_dir in list_deltas(data_dir):
+        if delta_dir.name not in applied:
+            append_delta(delta_dir, store_dir)
+            appended.append(delta_dir.name)
+    return appended
+
+
+def load_store_tables(store_dir=None):
+    store_dir = PROCESSED_DIR if store_dir is None else store_dir
+    # Kamus ID diurutkan sekali per entitas; kolom ID di semua tabel berbagi dtype yang sama
+    dtypes, remaps = {}, {}
+    for col, values in read_dictionaries(store_dir).items():
+        dtypes[col], remaps[col] = keys.sorted_dtype(values)
+    tables = {table: keys.from_codes(sort_categories(read_table(store_dir, table)), dtypes, remaps)
+              for table in stored_tables(read_manifest(store_dir))}
+
+    # Part delta umumnya lebih baru dari data lama, tapi tetap pastikan urutan waktunya
+    for table in SORTED_TABLES:
+        if table in tables:
+            tables[table] = sort_by_timestamp(tables[table])
+    return tables
+
+
+def load_tables(data_dir=None, store_dir=None):
+    # Baca dari store jika masih segar (atau hanya tertinggal delta), selain itu fallback ke CSV.
+    # Mengembalikan (tables, version, source) dengan source 'store' atau 'csv'.
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        status = 'missing'
+    else:
+        status = store_status(data_dir, store_dir)
+
+    if status in ('fresh', 'pending'):
+        tables, version, source = load_store_tables(store_dir), read_manifest(store_dir)['version'], 'store'
+    else:
+        tables = load_csv_tables(data_dir)
+        version, source = compute_version(source_fingerprint(data_dir), delta_fingerprints(data_dir)), 'csv'
+
+    # OLIST_COMPACT_IDS=0: kolom ID kembali sebagai string biasa
+    if not COMPACT_IDS:
+        for frame in tables.values():
+            keys.decode_ids(frame)
+    return tables, version, source
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m olist.store',
+                                     description='Build penyimpanan Parquet dari CSV Olist.')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    build_parser = subparsers.add_parser('build', help='Bangun store dari CSV mentah')
+    build_parser.add_argument('--force', action='store_true', help='Bangun ulang walaupun store masih segar')
+
+    subparsers.add_parser('append', help='Tambahkan delta di data/deltas yang belum diterapkan')
+    subparsers.add_parser('status', help='Tampilkan status store')
+
+    args = parser.parse_args(argv)
+
+    status = store_status()
+    if args.command == 'status':
+        print(f'Store {PROCESSED_DIR}: {status}')
+        if status == 'pending':
+            applied = read_manifest()['deltas']
+            pending = [path.name for path in list_deltas() if path.name not in applied]
+            print(f'Delta belum diterapkan: {", ".join(pending)}')
+        return
+
+    if args.command == 'append':
+        if status not in ('fresh', 'pending'):
+            print(f'Store {status}, jalankan build terlebih dahulu.')
+            return
+        start = time.perf_counter()
+        appended = append_pending_deltas()
+        elapsed = time.perf_counter() - start
+        if not appended:
+            print('Tidak ada delta baru.')
+            return
+        print(f'Delta {", ".join(appended)} diterapkan dalam {elapsed:.2f} detik '
+              f'(versi {read_manifest()["version"]})')
+        return
+
+    if status == 'fresh' and not args.force:
+        print(f'Store sudah segar (versi {read_manifest()["version"]}), gunakan --force untuk build ulang.')
+        return
+
+    start = time.perf_counter()
+    manifest = build_store()
+    elapsed = time.perf_counter() - start
+    for table, rows in manifest['rows'].items():
+        print(f'  {table:<16} {rows:>10,} baris')
+    print(f'Store versi {manifest["version"]} selesai dibangun di {PROCESSED_DIR} dalam {elapsed:.2f} detik')
+
+
+if __name__ == '__main__':
+    main()
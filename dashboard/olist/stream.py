@@ -0,0 +1,443 @@
+"""Jalur ingest streaming untuk CSV pesanan yang lebih besar dari RAM.
+
+``store.load_csv_tables`` membaca setiap CSV sekaligus. Modul ini membaca
+``order_items``, ``order_payments``, dan ``order_reviews`` (termasuk CSV delta
+di ``data/deltas/``) per potongan berukuran tetap, dan hanya kolom yang
+dipakai. Filter tanggal dan kategori diterapkan saat membaca: pesanan di luar
+rentang tanggal dibuang dari potongan ``orders``, dan baris item/pembayaran/
+ulasan yang pesanannya tidak ada di indeks pesanan terpilih dibuang sebelum
+diagregasi. Agregat dashboard diperbarui per potongan:
+
+- penjualan bulanan dan per kategori (jumlah harga, pesanan unik);
+- total nilai dan pesanan unik per metode pembayaran, distribusi cicilan;
+- total pembayaran per pesanan untuk RFM, dijumlahkan dengan penjumlahan
+  Kahan dalam urutan baris seperti ``groupby().sum()`` pandas sehingga skor
+  dan segmen RFM identik dengan jalur in-memory;
+- jumlah ulasan per skor.
+
+Batas memori: tabel item, pembayaran, dan ulasan tidak pernah dimuat utuh
+(paling banyak satu potongan sekaligus), tetapi state per pesanan dalam rentang
+tanggal tetap disimpan sampai akhir: indeks dan baris pesanan, total pembayaran
+per pesanan untuk RFM, serta penanda pesanan per kategori dan metode
+pembayaran. Memori puncak karena itu tumbuh dengan jumlah pesanan dalam rentang
+yang dipilih, bukan hanya dengan ukuran potongan. State ini tidak bisa dibuang
+per bulan karena CSV item/pembayaran/ulasan tidak terurut menurut waktu pesanan:
+baris untuk bulan mana pun bisa muncul di potongan terakhir.
+
+Dashboard memakai jalur ini dengan ``OLIST_QUERY_BACKEND=stream``: tabel penuh
+tidak dimuat, dan bagian Tren Penjualan, Analisis Pelanggan, serta Metode
+Pembayaran dihitung dari ``stream_summary`` per kombinasi filter.
+
+    cd dashboard
+    python -m olist.stream --start 2018-01-01 --end 2018-08-31 [--category health_beauty] [--check]
+
+``--check`` menghitung ulang metrik yang sama dari tabel in-memory dan
+membandingkannya: jumlah, kunci, dan RFM harus sama persis; jumlah nilai
+desimal dibandingkan dengan toleransi pembulatan (urutan penjumlahannya
+berbeda), sama seperti pemeriksaan kubus penjualan.
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from . import analytics, index, store
+from . import rfm as rfm_engine
+from .config import PROCESSED_DIR, STREAM_CHUNK_SIZE
+from .cube import CATEGORY_COLUMN, compare_summaries
+from .facts import ORDER_COLUMNS
+
+ITEM_COLUMNS = ['order_id', 'product_id', 'price']
+PAYMENT_COLUMNS = ['order_id', 'payment_type', 'payment_installments', 'payment_value']
+REVIEW_COLUMNS = ['order_id', 'review_score']
+CUSTOMER_COLUMNS = ['customer_id', 'customer_state']
+
+
+def source_paths(table, data_dir=None):
+    # CSV dasar diikuti CSV delta dalam urutan yang sama dengan load_csv_tables
+    paths = [store.find_source_file(store.SOURCE_FILES[table], data_dir)]
+    for delta_dir in store.list_deltas(data_dir):
+        path = delta_dir / store.SOURCE_FILES[table]
+        if path.exists():
+            paths.append(path)
+    return paths
+
+
+def read_chunks(table, columns, chunk_size=STREAM_CHUNK_SIZE, data_dir=None):
+    for path in source_paths(table, data_dir):
+        with pd.read_csv(path, usecols=columns, chunksize=chunk_size) as reader:
+            yield from reader
+
+
+def load_orders(start_date, end_date, chunk_size=STREAM_CHUNK_SIZE, data_dir=None):
+    # Pesanan dalam rentang tanggal beserta lokasi pelanggan, terurut waktu seperti order_facts
+    kept = []
+    for chunk in read_chunks('orders', ORDER_COLUMNS, chunk_size, data_dir):
+        timestamps = pd.to_datetime(chunk[index.TIMESTAMP_COLUMN], format=store.TIMESTAMP_FORMAT)
+        mask = np.ones(len(chunk), dtype=bool)
+        if start_date is not None:
+            mask &= (timestamps >= start_date).to_numpy()
+        if end_date is not None:
+            mask &= (timestamps <= end_date).to_numpy()
+        chunk[index.TIMESTAMP_COLUMN] = timestamps
+        kept.append(chunk[mask])
+    # Pesanan yang muncul lagi di delta adalah pembaruan; baris terakhir yang berlaku seperti load_csv_tables
+    orders = pd.concat(kept, ignore_index=True).drop_duplicates('order_id', keep='last')
+
+    customer_ids = pd.Index(orders['customer_id'].unique())
+    customers = pd.concat([chunk[chunk['customer_id'].isin(customer_ids)]
+                           for chunk in read_chunks('customers', CUSTOMER_COLUMNS, chunk_size, data_dir)],
+                          ignore_index=True)
+    orders = pd.merge(orders, customers, on='customer_id', how='left')
+    orders = orders.astype({'order_status': 'category', 'customer_state': 'category'})
+    return index.sort_by_timestamp(orders)
+
+
+def data_version(data_dir=None):
+    # Versi data CSV (sama dengan jalur CSV store), kunci cache hasil streaming
+    return store.compute_version(store.source_fingerprint(data_dir), store.delta_fingerprints(data_dir))
+
+
+def filter_options(chunk_size=STREAM_CHUNK_SIZE, data_dir=None):
+    # Rentang tanggal, kategori produk, dan negara bagian untuk sidebar dashboard (seperti sql.filter_options)
+    min_date = max_date = None
+    for chunk in read_chunks('orders', [index.TIMESTAMP_COLUMN], chunk_size, data_dir):
+        timestamps = pd.to_datetime(chunk[index.TIMESTAMP_COLUMN], format=store.TIMESTAMP_FORMAT)
+        min_date = timestamps.min() if min_date is None else min(min_date, timestamps.min())
+        max_date = timestamps.max() if max_date is None else max(max_date, timestamps.max())
+    states = set()
+    for chunk in read_chunks('customers', ['customer_state'], chunk_size, data_dir):
+        states.update(chunk['customer_state'].dropna().unique())
+    _, product_categories = load_product_categories(data_dir)
+    return {
+        'min_date': min_date,
+        'max_date': max_date,
+        'categories': sorted(product_categories.dropna().unique().tolist()),
+        'states': sorted(states),
+    }
+
+
+def load_product_categories(data_dir=None):
+    # Kategori (bahasa Inggris) per produk; tabel dimensi kecil sehingga dibaca utuh
+    products = pd.merge(
+        pd.read_csv(store.find_source_file(store.SOURCE_FILES['products'], data_dir),
+                    usecols=['product_id', 'product_category_name']),
+        pd.read_csv(store.find_source_file(store.SOURCE_FILES['product_category'], data_dir)),
+        on='product_category_name',
+        how='left'
+    )
+    return pd.Index(products['product_id']), products[CATEGORY_COLUMN].astype('category')
+
+
+def kahan_add(total, compensation, codes, values):
+    # Jumlah per kode dengan penjumlahan Kahan dalam urutan baris, langkah demi langkah sama dengan
+    # group_sum pandas. Baris ke-k setiap kode dalam potongan diproses bersama pada langkah ke-k.
+    if len(codes) == 0:
+        return
+    order = np.argsort(codes, kind='stable')
+    sorted_codes = codes[order]
+    is_start = np.r_[True, sorted_codes[1:] != sorted_codes[:-1]]
+    group_start = np.maximum.accumulate(np.where(is_start, np.arange(len(codes)), 0))
+    rank = np.empty(len(codes), dtype=np.int64)
+    rank[order] = np.arange(len(codes)) - group_start
+    for k in range(rank.max() + 1):
+        step = rank == k
+        c, y = codes[step], values[step] - compensation[codes[step]]
+        t = total[c] + y
+        compensation[c] = t - total[c] - y
+        total[c] = t
+
+
+def add_order_categories(first_category, overflow, counts, order_codes, category_codes):
+    # Pesanan unik per kategori tanpa menyimpan semua pasangan (pesanan, kategori): kategori pertama
+    # setiap pesanan disimpan per pesanan, pasangan tambahan (pesanan multi-kategori, jarang) di overflow.
+    n_categories = len(counts)
+    pairs = np.unique(order_codes.astype(np.int64) * n_categories + category_codes)
+    orders, categories = pairs // n_categories, pairs % n_categories
+    known = first_category[orders]
+    claim = np.r_[True, orders[1:] != orders[:-1]] & (known < 0)
+    first_category[orders[claim]] = categories[claim]
+    counts += np.bincount(categories[claim], minlength=n_categories)
+
+    extra = pairs[~claim & (known != categories)]
+    new = np.setdiff1d(extra, overflow, assume_unique=True)
+    counts += np.bincount(new % n_categories, minlength=n_categories)
+    return np.union1d(overflow, new)
+
+
+def stream_sales(chunks, orders, order_index, product_index, product_categories, category=None):
+    # Ringkasan penjualan dengan bentuk yang sama seperti cube.sales_summary_from_items
+    months = orders[index.TIMESTAMP_COLUMN].dt.strftime('%Y-%m').astype('category')
+    order_month = months.cat.codes.to_numpy()
+    n_months = len(months.cat.categories)
+    category_codes = product_categories.cat.codes.to_numpy()
+    n_categories = len(product_categories.cat.categories)
+    wanted = None
+    if category is not None:
+        wanted = product_categories.cat.categories.get_indexer([category])[0]
+
+    has_item = np.zeros(len(orders), dtype=bool)
+    month_sales = np.zeros(n_months)
+    month_items = np.zeros(n_months, dtype=np.int64)
+    category_sales = np.zeros(n_categories)
+    category_items = np.zeros(n_categories, dtype=np.int64)
+    category_orders = np.zeros(n_categories, dtype=np.int64)
+    first_category = np.full(len(orders), -1, dtype=np.int16)
+    overflow = np.array([], dtype=np.int64)
+    total_sales = 0.0
+
+    for chunk in chunks:
+        codes = order_index.get_indexer(chunk['order_id'])
+        products = product_index.get_indexer(chunk['product_id'])
+        item_category = np.where(products >= 0, category_codes[products], -1)
+        keep = codes >= 0
+        if category is not None:
+            keep &= item_category == wanted
+        codes, item_category = codes[keep], item_category[keep]
+        price = chunk['price'].to_numpy(np.float64)[keep]
+        if len(codes) == 0:
+            continue
+
+        has_item[codes] = True
+        total_sales += np.nansum(price)
+        month = order_month[codes]
+        month_sales += np.bincount(month, weights=np.nan_to_num(price), minlength=n_months)
+        month_items += np.bincount(month, minlength=n_months)
+
+        known = item_category >= 0
+        category_sales += np.bincount(item_category[known], weights=np.nan_to_num(price[known]),
+                                      minlength=n_categories)
+        category_items += np.bincount(item_category[known], minlength=n_categories)
+        overflow = add_order_categories(first_category, overflow, category_orders,
+                                        codes[known], item_category[known])
+
+    observed = month_items > 0
+    monthly_sales = pd.DataFrame({'month': months.cat.categories[observed].astype(str),
+                                  'price': month_sales[observed]})
+    observed = np.flatnonzero(category_items > 0)
+    category_table = pd.DataFrame({
+        CATEGORY_COLUMN: pd.Categorical.from_codes(observed, dtype=product_categories.dtype),
+        'price': category_sales[observed],
+        'order_id': category_orders[observed],
+    })
+    return {
+        'total_orders': int(has_item.sum()),
+        'total_sales': total_sales,
+        'monthly_sales': monthly_sales,
+        'category_sales': category_table,
+    }
+
+
+def stream_payments(chunks, order_index):
+    # Mengembalikan (total pembayaran per pesanan, jumlah baris pembayaran per pesanan,
+    # (ringkasan per metode, distribusi cicilan, rata-rata nilai per cicilan)) seperti payment_summary
+    n_orders = len(order_index)
+    order_total = np.zeros(n_orders)
+    compensation = np.zeros(n_orders)
+    order_rows = np.zeros(n_orders, dtype=np.int64)
+    type_values, type_orders = {}, {}
+    installment_counts = np.zeros(0, dtype=np.int64)
+    installment_values = np.zeros(0)
+
+    for chunk in chunks:
+        codes = order_index.get_indexer(chunk['order_id'])
+        chunk = chunk[codes >= 0]
+        codes = codes[codes >= 0]
+        values = chunk['payment_value'].to_numpy(np.float64)
+        order_rows += np.bincount(codes, minlength=n_orders)
+        valid = ~np.isnan(values)
+        kahan_add(order_total, compensation, codes[valid], values[valid])
+
+        type_codes, types = pd.factorize(chunk['payment_type'])
+        for code, payment_type in enumerate(types):
+            rows = type_codes == code
+            if payment_type not in type_values:
+                type_values[payment_type] = 0.0
+                type_orders[payment_type] = np.zeros(n_orders, dtype=bool)
+            type_values[payment_type] += np.nansum(values[rows])
+            type_orders[payment_type][codes[rows]] = True
+
+        credit = (chunk['payment_type'] == 'credit_card').to_numpy()
+        installments = chunk['payment_installments'].to_numpy()[credit].astype(np.int64)
+        if len(installments):
+            size = max(len(installment_counts), installments.max() + 1)
+            installment_counts = np.pad(installment_counts, (0, size - len(installment_counts)))
+            installment_values = np.pad(installment_values, (0, size - len(installment_values)))
+            installment_counts += np.bincount(installments, minlength=size)
+            installment_values += np.bincount(installments, weights=np.nan_to_num(values[credit]), minlength=size)
+
+    types = sorted(type_values)
+    summary = pd.DataFrame({
+        'payment_type': pd.Categorical(types),
+        'total_value': [type_values[t] for t in types],
+        'order_count': [int(type_orders[t].sum()) for t in types],
+    })
+    summary['percentage'] = summary['total_value'] / summary['total_value'].sum() * 100
+
+    present = np.flatnonzero(installment_counts)
+    if len(present) == 0:
+        return order_total, order_rows, (summary, None, None)
+    counts = pd.DataFrame({'installments': present, 'count': installment_counts[present]})
+    values = pd.DataFrame({'installments': present,
+                           'avg_value': installment_values[present] / installment_counts[present]})
+    return order_total, order_rows, (summary, counts, values)
+
+
+def stream_reviews(chunks, order_index):
+    counts = np.zeros(0, dtype=np.int64)
+    for chunk in chunks:
+        keep = (order_index.get_indexer(chunk['order_id']) >= 0) & chunk['review_score'].notna().to_numpy()
+        scores = chunk['review_score'].to_numpy()[keep].astype(np.int64)
+        if len(scores):
+            counts = np.pad(counts, (0, max(scores.max() + 1 - len(counts), 0)))
+            counts += np.bincount(scores, minlength=len(counts))
+    present = np.flatnonzero(counts)
+    return pd.DataFrame({'review_score': present, 'count': counts[present]})
+
+
+def rfm_order_rows(orders, order_total, order_rows):
+    # Baris pesanan untuk rfm.compute_rfm, sama dengan rfm.select_rfm_orders pada order_facts
+    rows = orders.assign(order_payment_value=np.where(order_rows > 0, order_total, np.nan))
+    return rfm_engine.select_rfm_orders(rows.assign(order_first_row=True))
+
+
+def stream_summary(start_date=None, end_date=None, category=None, chunk_size=STREAM_CHUNK_SIZE, data_dir=None):
+    # Metrik dashboard dari CSV yang dibaca per potongan. Mengembalikan (frames, scalars, timings,
+    # (start_date, end_date)) dengan nama yang sama seperti analytics.compute_all; batas tanggal None
+    # berarti awal/akhir data dan dikembalikan sebagai timestamp pesanan pertama/terakhir.
+    frames, scalars, timings = {}, {}, {}
+
+    def timed(name, fn, *args, **kwargs):
+        start = time.perf_counter()
+        result = fn(*args, **kwargs)
+        timings[name] = time.perf_counter() - start
+        return result
+
+    orders = timed('orders', load_orders, start_date, end_date, chunk_size, data_dir)
+    order_index = pd.Index(orders['order_id'])
+    timestamps = orders[index.TIMESTAMP_COLUMN]
+    start_date = timestamps.min() if start_date is None else start_date
+    end_date = timestamps.max() if end_date is None else end_date
+
+    product_index, product_categories = load_product_categories(data_dir)
+    sales = timed('sales', stream_sales, read_chunks('order_items', ITEM_COLUMNS, chunk_size, data_dir),
+                  orders, order_index, product_index, product_categories, category)
+    frames['sales_monthly'] = sales['monthly_sales']
+    frames['sales_by_category'] = sales['category_sales']
+    scalars['total_orders'] = sales['total_orders']
+    scalars['total_sales'] = float(sales['total_sales'])
+
+    order_total, order_rows, payments = timed(
+        'payments', stream_payments, read_chunks('order_payments', PAYMENT_COLUMNS, chunk_size, data_dir), order_index)
+    frames['payment_methods'], installment_counts, installment_values = payments
+    if installment_counts is not None:
+        frames['installment_counts'] = installment_counts
+        frames['installment_values'] = installment_values
+
+    rfm = timed('rfm', rfm_engine.compute_rfm, rfm_order_rows(orders, order_total, order_rows), end_date)
+    frames['rfm'] = rfm
+    if len(rfm) > 0:
+        frames['rfm_segments'] = analytics.segment_distribution(rfm)
+        for col in ['recency', 'frequency', 'monetary']:
+            scalars[f'avg_{col}'] = float(rfm[col].mean())
+
+    frames['review_scores'] = timed(
+        'reviews', stream_reviews, read_chunks('order_reviews', REVIEW_COLUMNS, chunk_size, data_dir), order_index)
+    return frames, scalars, timings, (start_date, end_date)
+
+
+def as_strings(frame, columns):
+    return frame.astype({col: str for col in columns if col in frame.columns}).reset_index(drop=True)
+
+
+def compare_frames(name, left, right, exact, approx=()):
+    # Daftar perbedaan antara frame streaming dan in-memory (kosong jika sama)
+    if left is None or right is None:
+        return [] if left is None and right is None else [f'{name}: hanya ada di salah satu jalur']
+    if len(left) != len(right):
+        return [f'{name}: jumlah baris {len(left)} != {len(right)}']
+    left, right = as_strings(left, exact), as_strings(right, exact)
+    problems = [f'{name}.{col}: nilai berbeda' for col in exact
+                if not np.array_equal(left[col].to_numpy(), right[col].to_numpy())]
+    problems += [f'{name}.{col}: nilai berbeda' for col in approx
+                 if not np.allclose(left[col].to_numpy(np.float64), right[col].to_numpy(np.float64))]
+    return problems
+
+
+def compare_with_tables(frames, scalars, tables, start_date, end_date, category=None):
+    # Bandingkan hasil stream_summary dengan jalur in-memory (analytics pada tabel load_tables)
+    problems = []
+    memory_sales, _ = analytics.sales_summary(tables['order_facts'], tables['sales_cube'], start_date, end_date,
+                                              category, use_cube=False)
+    problems += compare_summaries(
+        {'total_orders': scalars['total_orders'], 'total_sales': scalars['total_sales'],
+         'monthly_sales': frames['sales_monthly'], 'category_sales': frames['sales_by_category']},
+        memory_sales)
+    problems += compare_frames('sales_monthly', frames['sales_monthly'], memory_sales['monthly_sales'], ['month'])
+    problems += compare_frames('sales_by_category', frames['sales_by_category'], memory_sales['category_sales'],
+                               [CATEGORY_COLUMN, 'order_id'])
+
+    summary, counts, values = analytics.payment_summary(tables['payment_facts'], start_date, end_date)
+    problems += compare_frames('payment_methods', frames['payment_methods'], summary,
+                               ['payment_type', 'order_count'], ['total_value', 'percentage'])
+    problems += compare_frames('installment_counts', frames.get('installment_counts'), counts,
+                               ['installments', 'count'])
+    problems += compare_frames('installment_values', frames.get('installment_values'), values,
+                               ['installments'], ['avg_value'])
+
+    rfm = analytics.customer_rfm(tables['order_facts'], start_date, end_date)
+    problems += compare_frames('rfm', frames['rfm'], rfm, list(rfm.columns))
+
+    reviews = analytics.review_scores(tables['orders'], tables['order_reviews'], start_date, end_date)
+    problems += compare_frames('review_scores', frames['review_scores'], reviews, ['review_score', 'count'])
+    return problems
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m olist.stream',
+                                     description='Hitung metrik dashboard dengan membaca CSV per potongan.')
+    parser.add_argument('--start', help='Tanggal mulai (YYYY-MM-DD), default awal data')
+    parser.add_argument('--end', help='Tanggal akhir (YYYY-MM-DD), default akhir data')
+    parser.add_argument('--category', help='Kategori produk (nama bahasa Inggris)')
+    parser.add_argument('--chunk-size', type=int, default=STREAM_CHUNK_SIZE,
+                        help=f'Jumlah baris CSV per potongan (default {STREAM_CHUNK_SIZE})')
+    parser.add_argument('--out', help='Direktori hasil, default processed_data/results/stream_<versi>_<filter>')
+    parser.add_argument('--check', action='store_true', help='Bandingkan hasil dengan jalur in-memory')
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    start_date = pd.Timestamp(args.start) if args.start else None
+    end_date = pd.Timestamp(args.end) if args.end else None
+    frames, scalars, timings, (start_date, end_date) = stream_summary(start_date, end_date, args.category,
+                                                                      args.chunk_size)
+    elapsed = time.perf_counter() - start
+
+    version = data_version()
+    out_dir = Path(args.out) if args.out else (
+        PROCESSED_DIR / analytics.RESULTS_DIR_NAME /
+        f'stream_{analytics.result_name(version, start_date, end_date, args.category, None)}')
+    params = {'version': version, 'source': 'stream', 'start_date': str(start_date), 'end_date': str(end_date),
+              'category': args.category, 'chunk_size': args.chunk_size}
+    analytics.write_results(out_dir, frames, scalars, timings, params)
+
+    print(f'Metrik dihitung dari CSV per potongan ({args.chunk_size:,} baris) dalam {elapsed:.2f} detik')
+    for name, seconds in timings.items():
+        print(f'  {name:<12} {seconds * 1000:>10.1f} ms')
+    print(f'Hasil ({len(frames)} tabel) ditulis ke {out_dir}')
+
+    if args.check:
+        tables, _, source = store.load_tables()
+        problems = compare_with_tables(frames, scalars, tables, start_date, end_date, args.category)
+        for problem in problems:
+            print(f'  {problem}')
+        print(f'Pemeriksaan terhadap jalur in-memory ({source}): '
+              f'{"cocok" if not problems else f"{len(problems)} perbedaan"}')
+        if problems:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,355 @@
+"""Generator data sintetis berbentuk dataset Olist untuk benchmark.
+
+    cd dashboard
+    python -m olist.synth --scale 10 --out /tmp/olist-10x
+
+Skala 1 setara ukuran dataset publik Olist (~99 ribu pesanan). Semua CSV di
+``store.SOURCE_FILES`` ditulis dengan kolom dan format yang sama dengan data
+asli, sehingga bisa langsung dipakai dengan ``OLIST_DATA_DIR``. Distribusinya
+dibuat miring seperti data asli: negara bagian pelanggan didominasi SP/RJ/MG,
+kategori produk mengikuti frekuensi di ``products_dataset.csv`` repositori,
+popularitas produk dan penjual mengikuti distribusi Zipf, cicilan kartu kredit
+menurun dari 1x, dan volume pesanan naik dari 2016 ke 2018.
+
+Pesanan ditulis per potongan (``--chunk-size``) agar skala besar tidak perlu
+menampung seluruh tabel di memori.
+"""
+import argparse
+import shutil
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from .config import DATA_DIR
+from .store import SOURCE_FILES, TIMESTAMP_FORMAT
+
+BASE_ORDERS = 99_441
+BASE_PRODUCTS = 32_951
+BASE_SELLERS = 3_095
+
+PERIOD_START = np.datetime64('2016-09-04T00:00:00')
+PERIOD_END = np.datetime64('2018-10-17T00:00:00')
+
+# Porsi pelanggan per negara bagian pada data asli
+CUSTOMER_STATES = {
+    'SP': 41.9, 'RJ': 12.9, 'MG': 11.7, 'RS': 5.5, 'PR': 5.1, 'SC': 3.7, 'BA': 3.4, 'DF': 2.2,
+    'ES': 2.0, 'GO': 2.0, 'PE': 1.7, 'CE': 1.3, 'PA': 1.0, 'MT': 0.9, 'MA': 0.8, 'MS': 0.7,
+    'PB': 0.5, 'PI': 0.5, 'RN': 0.5, 'AL': 0.4, 'SE': 0.3, 'TO': 0.3, 'RO': 0.25, 'AM': 0.15,
+    'AC': 0.08, 'AP': 0.07, 'RR': 0.05,
+}
+
+# Penjual jauh lebih terpusat di SP dibanding pelanggan
+SELLER_STATES = {
+    'SP': 59.7, 'PR': 11.3, 'MG': 7.9, 'SC': 6.1, 'RJ': 5.5, 'RS': 4.2, 'GO': 1.3, 'DF': 1.0,
+    'ES': 0.8, 'BA': 0.6, 'CE': 0.4, 'PE': 0.3, 'PB': 0.2, 'MS': 0.2, 'RN': 0.2, 'MT': 0.1,
+}
+
+# Ibu kota dan rentang prefiks CEP (5 digit) per negara bagian
+STATE_INFO = {
+    'AC': ('rio branco', 69900, 69999), 'AL': ('maceio', 57000, 57999), 'AM': ('manaus', 69000, 69299),
+    'AP': ('macapa', 68900, 68999), 'BA': ('salvador', 40000, 48999), 'CE': ('fortaleza', 60000, 63999),
+    'DF': ('brasilia', 70000, 73699), 'ES': ('vitoria', 29000, 29999), 'GO': ('goiania', 74000, 76799),
+    'MA': ('sao luis', 65000, 65999), 'MG': ('belo horizonte', 30000, 39999),
+    'MS': ('campo grande', 79000, 79999), 'MT': ('cuiaba', 78000, 78899), 'PA': ('belem', 66000, 68899),
+    'PB': ('joao pessoa', 58000, 58999), 'PE': ('recife', 50000, 56999), 'PI': ('teresina', 64000, 64999),
+    'PR': ('curitiba', 80000, 87999), 'RJ': ('rio de janeiro', 20000, 28999), 'RN': ('natal', 59000, 59999),
+    'RO': ('porto velho', 76800, 76999), 'RR': ('boa vista', 69300, 69399), 'RS': ('porto alegre', 90000, 99999),
+    'SC': ('florianopolis', 88000, 89999), 'SE': ('aracaju', 49000, 49999), 'SP': ('sao paulo', 1000, 19999),
+    'TO': ('palmas', 77000, 77999),
+}
+
+# Koordinat (lintang, bujur) ibu kota per negara bagian, pusat sebaran titik geolokasi
+STATE_COORDS = {
+    'AC': (-9.97, -67.81), 'AL': (-9.67, -35.74), 'AM': (-3.12, -60.02), 'AP': (0.03, -51.07),
+    'BA': (-12.97, -38.50), 'CE': (-3.73, -38.53), 'DF': (-15.79, -47.88), 'ES': (-20.32, -40.34),
+    'GO': (-16.68, -49.25), 'MA': (-2.53, -44.30), 'MG': (-19.92, -43.94), 'MS': (-20.47, -54.62),
+    'MT': (-15.60, -56.10), 'PA': (-1.46, -48.50), 'PB': (-7.12, -34.86), 'PE': (-8.05, -34.88),
+    'PI': (-5.09, -42.80), 'PR': (-25.43, -49.27), 'RJ': (-22.91, -43.17), 'RN': (-5.79, -35.21),
+    'RO': (-8.76, -63.90), 'RR': (2.82, -60.67), 'RS': (-30.03, -51.23), 'SC': (-27.60, -48.55),
+    'SE': (-10.91, -37.07), 'SP': (-23.55, -46.63), 'TO': (-10.18, -48.33),
+}
+
+# Geolokasi: titik per prefiks CEP (banyak duplikat seperti data asli), sebagian kecil prefiks
+# tanpa titik dan sebagian kecil titik di luar Brasil
+GEO_POINTS_PER_ZIP = 3
+GEO_MISSING_ZIP = 0.01
+GEO_OUTLIERS = 0.001
+
+ORDER_STATUSES = {'delivered': 97.0, 'shipped': 1.1, 'canceled': 0.6, 'unavailable': 0.6,
+                  'invoiced': 0.3, 'processing': 0.3, 'created': 0.05, 'approved': 0.05}
+PAYMENT_TYPES = {'credit_card': 73.9, 'boleto': 19.0, 'voucher': 5.6, 'debit_card': 1.5}
+INSTALLMENTS = {1: 33.0, 2: 15.0, 3: 12.0, 4: 9.0, 5: 6.5, 6: 5.0, 7: 2.0, 8: 5.5, 9: 0.8, 10: 7.0,
+                12: 0.5, 15: 0.2, 18: 0.1, 24: 0.1}
+ITEMS_PER_ORDER = {1: 90.1, 2: 7.6, 3: 1.2, 4: 0.5, 5: 0.3, 6: 0.3}
+REVIEW_SCORES = {1: 11.5, 2: 3.2, 3: 8.2, 4: 19.3, 5: 57.8}
+REVIEW_MESSAGES = ['', '', '', '', '', '', 'recomendo', 'produto muito bom', 'chegou antes do prazo',
+                   'nao recebi o produto', 'produto chegou com defeito', 'otimo vendedor, entrega rapida']
+
+# Pola jam pembelian (0-23) dan hari dalam seminggu (Senin = 0)
+HOUR_WEIGHTS = np.array([2.5, 1.2, 0.5, 0.3, 0.2, 0.2, 0.5, 1.2, 3.0, 4.8, 6.2, 6.5,
+                         6.0, 6.3, 6.6, 6.4, 6.4, 6.0, 5.7, 5.8, 6.1, 6.2, 6.0, 4.5])
+WEEKDAY_WEIGHTS = np.array([16.3, 16.1, 15.7, 14.9, 14.2, 10.9, 11.9])
+
+
+def probabilities(weights):
+    values = np.asarray(list(weights.values()) if isinstance(weights, dict) else weights, dtype=np.float64)
+    return values / values.sum()
+
+
+def choice(rng, weights, size):
+    # Sampel dari dict {nilai: bobot}
+    return np.asarray(list(weights))[rng.choice(len(weights), size=size, p=probabilities(weights))]
+
+
+def zipf_index(rng, n, size, a=1.1):
+    # Indeks 0..n-1 dengan popularitas miring (Zipf terpotong), indeks 0 paling populer
+    ranks = np.arange(1, n + 1, dtype=np.float64)
+    weights = ranks ** -a
+    return rng.choice(n, size=size, p=weights / weights.sum())
+
+
+def hex_ids(rng, n):
+    # ID heksadesimal 32 karakter seperti data asli
+    raw = rng.integers(0, 256, size=(n, 16), dtype=np.uint8).tobytes().hex().encode()
+    return np.frombuffer(raw, dtype='S32').astype(str)
+
+
+def zip_prefixes(rng, states):
+    low = np.array([STATE_INFO[state][1] for state in states])
+    high = np.array([STATE_INFO[state][2] for state in states])
+    return low + (rng.random(len(states)) * (high - low + 1)).astype(np.int64)
+
+
+def cities(rng, states):
+    # Sekitar 40% di ibu kota, sisanya tersebar di kota lain dengan distribusi Zipf
+    capital = np.array([STATE_INFO[state][0] for state in states], dtype=object)
+    other = np.char.add('municipio ', zipf_index(rng, 400, len(states)).astype(str)).astype(object)
+    other = np.char.add(np.char.lower(states.astype(str)), ' ').astype(object) + other
+    return np.where(rng.random(len(states)) < 0.4, capital, other)
+
+
+def purchase_times(rng, n):
+    # Volume harian naik linear dari awal ke akhir periode, dengan pola hari dan jam
+    days = int((PERIOD_END - PERIOD_START) / np.timedelta64(1, 'D'))
+    day = np.floor(np.sqrt(rng.random(n)) * days).astype(np.int64)
+    weekday = (PERIOD_START.astype('datetime64[D]').astype(np.int64) + day + 3) % 7
+    # Tolak-sampel hari agar mengikuti bobot hari dalam seminggu
+    keep = rng.random(n) < WEEKDAY_WEIGHTS[weekday] / WEEKDAY_WEIGHTS.max()
+    day = np.where(keep, day, np.floor(np.sqrt(rng.random(n)) * days).astype(np.int64))
+    hour = rng.choice(24, size=n, p=probabilities(HOUR_WEIGHTS))
+    seconds = day * 86400 + hour * 3600 + rng.integers(0, 3600, n)
+    return PERIOD_START + seconds.astype('timedelta64[s]')
+
+
+def category_weights(data_dir):
+    # Frekuensi kategori dari products_dataset.csv repositori; fallback ke daftar terjemahan
+    products_path = data_dir / SOURCE_FILES['products']
+    if products_path.exists():
+        counts = pd.read_csv(products_path, usecols=['product_category_name'])['product_category_name'].value_counts()
+        return counts.to_dict()
+    translation = pd.read_csv(data_dir / SOURCE_FILES['product_category'])
+    return {name: 1.0 for name in translation['product_category_name']}
+
+
+def make_products(rng, n, categories):
+    category = choice(rng, categories, n).astype(object)
+    # ~1.9% produk tanpa kategori seperti data asli
+    category[rng.random(n) < 0.019] = np.nan
+    return pd.DataFrame({
+        'product_id': hex_ids(rng, n),
+        'product_category_name': category,
+        'product_name_lenght': rng.integers(5, 77, n),
+        'product_description_lenght': np.minimum(rng.lognormal(6.4, 0.75, n).astype(np.int64) + 4, 3992),
+        'product_photos_qty': np.minimum(rng.geometric(0.5, n), 20),
+        'product_weight_g': np.minimum(rng.lognormal(6.6, 1.2, n).astype(np.int64), 40425),
+        'product_length_cm': rng.integers(16, 106, n),
+        'product_height_cm': rng.integers(2, 106, n),
+        'product_width_cm': rng.integers(6, 119, n),
+    })
+
+
+def make_sellers(rng, n):
+    states = choice(rng, SELLER_STATES, n)
+    return pd.DataFrame({
+        'seller_id': hex_ids(rng, n),
+        'seller_zip_code_prefix': zip_prefixes(rng, states),
+        'seller_city': cities(rng, states),
+        'seller_state': states,
+    })
+
+
+def make_geolocation(rng):
+    # Titik untuk setiap prefiks CEP di rentang negara bagian; ukuran tetap, tidak ikut skala
+    frames = []
+    for state, (_, low, high) in STATE_INFO.items():
+        zips = np.arange(low, high + 1)
+        zips = zips[rng.random(len(zips)) >= GEO_MISSING_ZIP]
+        lat0, lng0 = STATE_COORDS[state]
+        # Pusat prefiks tersebar di sekitar ibu kota, titik per prefiks di sekitar pusatnya
+        zip_lat = lat0 + rng.normal(0, 1.0, len(zips))
+        zip_lng = lng0 + rng.normal(0, 1.0, len(zips))
+        counts = rng.integers(1, 2 * GEO_POINTS_PER_ZIP, len(zips))
+        rows = np.repeat(np.arange(len(zips)), counts)
+        frames.append(pd.DataFrame({
+            'geolocation_zip_code_prefix': zips[rows],
+            'geolocation_lat': zip_lat[rows] + rng.normal(0, 0.02, len(rows)),
+            'geolocation_lng': zip_lng[rows] + rng.normal(0, 0.02, len(rows)),
+            'geolocation_city': STATE_INFO[state][0],
+            'geolocation_state': state,
+        }))
+    geolocation = pd.concat(frames, ignore_index=True)
+    outliers = rng.random(len(geolocation)) < GEO_OUTLIERS
+    geolocation.loc[outliers, 'geolocation_lat'] = rng.uniform(20, 45, outliers.sum())
+    return geolocation
+
+
+def make_order_chunk(rng, n, products, product_price, product_seller):
+    # Satu potongan pesanan beserta pelanggan, item, pembayaran, dan ulasannya
+    order_id = hex_ids(rng, n)
+    customer_id = hex_ids(rng, n)
+
+    # ~3% pelanggan unik melakukan pembelian ulang
+    unique_id = hex_ids(rng, n)
+    repeat = rng.random(n) < 0.03
+    unique_id[repeat] = unique_id[rng.integers(0, n, repeat.sum())]
+
+    states = choice(rng, CUSTOMER_STATES, n)
+    customers = pd.DataFrame({
+        'customer_id': customer_id,
+        'customer_unique_id': unique_id,
+        'customer_zip_code_prefix': zip_prefixes(rng, states),
+        'customer_city': cities(rng, states),
+        'customer_state': states,
+    })
+
+    purchased = purchase_times(rng, n)
+    status = choice(rng, ORDER_STATUSES, n)
+    approved = purchased + rng.integers(600, 2 * 86400, n).astype('timedelta64[s]')
+    carrier = approved + rng.lognormal(11.5, 0.7, n).astype(np.int64).astype('timedelta64[s]')
+    delivered = carrier + rng.lognormal(13.4, 0.6, n).astype(np.int64).astype('timedelta64[s]')
+    estimated = (purchased + rng.integers(12, 40, n).astype('timedelta64[D]')).astype('datetime64[D]')
+
+    is_delivered = status == 'delivered'
+    has_carrier = is_delivered | (status == 'shipped')
+    not_approved = status == 'created'
+    orders = pd.DataFrame({
+        'order_id': order_id,
+        'customer_id': customer_id,
+        'order_status': status,
+        'order_purchase_timestamp': purchased,
+        'order_approved_at': np.where(not_approved, np.datetime64('NaT'), approved),
+        'order_delivered_carrier_date': np.where(has_carrier, carrier, np.datetime64('NaT')),
+        'order_delivered_customer_date': np.where(is_delivered, delivered, np.datetime64('NaT')),
+        'order_estimated_delivery_date': estimated.astype('datetime64[s]'),
+    })
+
+    # Item: beberapa pesanan berisi lebih dari satu item; produk populer mengikuti Zipf
+    counts = choice(rng, ITEMS_PER_ORDER, n).astype(np.int64)
+    item_order = np.repeat(np.arange(n), counts)
+    starts = np.cumsum(counts) - counts
+    product_idx = zipf_index(rng, len(products), len(item_order), a=0.9)
+    items = pd.DataFrame({
+        'order_id': order_id[item_order],
+        'order_item_id': np.arange(len(item_order)) - np.repeat(starts, counts) + 1,
+        'product_id': products['product_id'].values[product_idx],
+        'seller_id': product_seller[product_idx],
+        'shipping_limit_date': purchased[item_order] + np.timedelta64(6, 'D'),
+        'price': product_price[product_idx],
+        'freight_value': np.round(rng.lognormal(2.8, 0.55, len(item_order)), 2),
+    })
+
+    # Pembayaran: total item per pesanan, sebagian dipecah dengan voucher
+    order_total = np.bincount(item_order, weights=items['price'].values + items['freight_value'].values,
+                              minlength=n)
+    payment_type = choice(rng, PAYMENT_TYPES, n)
+    installments = np.where(payment_type == 'credit_card', choice(rng, INSTALLMENTS, n), 1)
+    split = rng.random(n) < 0.03
+    voucher_value = np.round(order_total[split] * rng.uniform(0.1, 0.6, split.sum()), 2)
+    payments = pd.DataFrame({
+        'order_id': np.concatenate([order_id, order_id[split]]),
+        'payment_sequential': np.concatenate([np.ones(n, dtype=np.int64), np.full(split.sum(), 2)]),
+        'payment_type': np.concatenate([payment_type, np.full(split.sum(), 'voucher')]),
+        'payment_installments': np.concatenate([installments, np.ones(split.sum(), dtype=np.int64)]),
+        'payment_value': np.concatenate([np.round(order_total, 2), voucher_value]),
+    })
+    payments.loc[np.flatnonzero(split), 'payment_value'] -= voucher_value
+    payments['payment_value'] = payments['payment_value'].round(2)
+
+    # Ulasan: ~99% pesanan; skor rendah lebih sering untuk pesanan terlambat
+    reviewed = np.flatnonzero(rng.random(n) < 0.99)
+    late = (delivered > estimated.astype('datetime64[s]') + np.timedelta64(1, 'D'))[reviewed]
+    score = choice(rng, REVIEW_SCORES, len(reviewed))
+    score = np.where(late & (rng.random(len(reviewed)) < 0.5), rng.integers(1, 3, len(reviewed)), score)
+    created = np.where(is_delivered, delivered, estimated.astype('datetime64[s]'))[reviewed]
+    created = (created.astype('datetime64[D]') + np.timedelta64(1, 'D')).astype('datetime64[s]')
+    message = np.asarray(REVIEW_MESSAGES, dtype=object)[rng.integers(0, len(REVIEW_MESSAGES), len(reviewed))]
+    message[message == ''] = np.nan
+    reviews = pd.DataFrame({
+        'review_id': hex_ids(rng, len(reviewed)),
+        'order_id': order_id[reviewed],
+        'review_score': score,
+        'review_comment_title': np.nan,
+        'review_comment_message': message,
+        'review_creation_date': created,
+        'review_answer_timestamp': created + rng.lognormal(11.5, 1.0, len(reviewed)).astype(np.int64).astype('timedelta64[s]'),
+    })
+
+    return {'customers': customers, 'orders': orders, 'order_items': items,
+            'order_payments': payments, 'order_reviews': reviews}
+
+
+def generate(out_dir, scale=1.0, seed=0, chunk_size=500_000, source_dir=None):
+    # Tulis semua CSV sumber ke out_dir. Mengembalikan jumlah baris per tabel.
+    source_dir = DATA_DIR if source_dir is None else source_dir
+    out_dir.mkdir(parents=True, exist_ok=True)
+    rng = np.random.default_rng(seed)
+
+    # Katalog tumbuh lebih lambat dari jumlah pesanan
+    n_orders = max(int(round(BASE_ORDERS * scale)), 1)
+    n_products = max(int(round(BASE_PRODUCTS * np.sqrt(scale))), 100)
+    n_sellers = max(int(round(BASE_SELLERS * np.sqrt(scale))), 10)
+
+    shutil.copy(source_dir / SOURCE_FILES['product_category'], out_dir / SOURCE_FILES['product_category'])
+    products = make_products(rng, n_products, category_weights(source_dir))
+    sellers = make_sellers(rng, n_sellers)
+    products.to_csv(out_dir / SOURCE_FILES['products'], index=False)
+    sellers.to_csv(out_dir / SOURCE_FILES['sellers'], index=False)
+    geolocation = make_geolocation(rng)
+    geolocation.to_csv(out_dir / SOURCE_FILES['geolocation'], index=False)
+
+    # Harga dan penjual tetap per produk; penjual populer memegang lebih banyak produk
+    product_price = np.round(rng.lognormal(4.3, 0.95, n_products), 2)
+    product_seller = sellers['seller_id'].values[zipf_index(rng, n_sellers, n_products, a=0.8)]
+
+    rows = {'product_category': None, 'products': n_products, 'sellers': n_sellers, 'geolocation': len(geolocation)}
+    for start in range(0, n_orders, chunk_size):
+        chunk = make_order_chunk(rng, min(chunk_size, n_orders - start), products, product_price, product_seller)
+        for table, frame in chunk.items():
+            frame.to_csv(out_dir / SOURCE_FILES[table], mode='w' if start == 0 else 'a',
+                         header=start == 0, index=False, date_format=TIMESTAMP_FORMAT)
+            rows[table] = rows.get(table, 0) + len(frame)
+    rows.pop('product_category')
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m olist.synth',
+                                     description='Buat dataset sintetis berbentuk Olist.')
+    parser.add_argument('--scale', type=float, default=1.0, help='Kelipatan ukuran dataset publik Olist')
+    parser.add_argument('--out', required=True, help='Direktori tujuan CSV')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--chunk-size', type=int, default=500_000, help='Jumlah pesanan per potongan')
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    rows = generate(Path(args.out), args.scale, args.seed, args.chunk_size)
+    elapsed = time.perf_counter() - start
+    for table, count in rows.items():
+        print(f'  {table:<16} {count:>12,} baris')
+    print(f'Dataset skala {args.scale:g}x ditulis ke {args.out} dalam {elapsed:.1f} detik')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,38 @@
+"""Dataset tanpa geolocation_dataset.csv tetap bisa dimuat dan dianalisis.
+
+File geolokasi (lebih dari 1 juta baris) tidak ikut di repo; tanpa file itu
+hanya shipping_facts dan analisis jarak pengiriman yang tidak tersedia.
+"""
+import pytest
+
+from olist import analytics, results, store, synth
+from olist.config import ROOT_DIR
+
+SCALE = 0.02
+
+
+@pytest.fixture(scope='module')
+def data_dir(tmp_path_factory):
+    directory = tmp_path_factory.mktemp('data')
+    synth.generate(directory, scale=SCALE, seed=1, source_dir=ROOT_DIR / 'data')
+    (directory / store.SOURCE_FILES['geolocation']).unlink()
+    return directory
+
+
+def test_csv_path_without_geolocation(data_dir, tmp_path):
+    tables, _, source = store.load_tables(data_dir, tmp_path)
+    assert source == 'csv'
+    assert 'geolocation' not in tables and 'shipping_facts' not in tables
+    assert 'shipping' not in results.available_bundles(tables)
+
+    timestamps = tables['orders']['order_purchase_timestamp']
+    frames, scalars, _ = analytics.compute_all(tables, timestamps.min(), timestamps.max())
+    assert 'shipping_distance' not in frames and scalars['total_orders'] > 0
+
+
+def test_store_without_geolocation(data_dir, tmp_path):
+    manifest = store.build_store(data_dir, tmp_path)
+    assert 'shipping_facts' not in manifest['rows']
+    assert store.store_status(data_dir, tmp_path) == 'fresh'
+    tables, _, source = store.load_tables(data_dir, tmp_path)
+    assert source == 'store' and 'shipping_facts' not in tables
@@ -0,0 +1,114 @@
+"""Cache hasil bersama: isi, kunci, dan batas ukurannya.
+
+Setiap test memakai direktori cache sementara sendiri (``tmp_path``).
+Penghitung hit/miss ``olist.results`` berlaku per proses, jadi test hanya
+membandingkan selisihnya.
+"""
+import os
+import pickle
+
+import pytest
+
+from olist import analytics, results, store, synth
+from olist.config import ROOT_DIR
+from olist.cube import CATEGORY_COLUMN
+
+SCALE = 0.02
+
+
+@pytest.fixture(scope='module')
+def data_dir(tmp_path_factory):
+    directory = tmp_path_factory.mktemp('data')
+    synth.generate(directory, scale=SCALE, seed=1, source_dir=ROOT_DIR / 'data')
+    return directory
+
+
+@pytest.fixture(scope='module')
+def loaded(data_dir, tmp_path_factory):
+    tables, version, _ = store.load_tables(data_dir, tmp_path_factory.mktemp('store'))
+    return tables, version
+
+
+@pytest.fixture(scope='module')
+def filters(loaded):
+    # Rentang "Semua Data", kategori terlaris, dan negara bagian dengan pelanggan terbanyak
+    tables, _ = loaded
+    timestamps = tables['orders']['order_purchase_timestamp']
+    category = tables['order_facts'][CATEGORY_COLUMN].value_counts().index[0]
+    state = tables['customers']['customer_state'].value_counts().index[0]
+    return timestamps.min(), timestamps.max(), category, state
+
+
+def entries(cache_dir, version):
+    return sorted((cache_dir / str(version)).glob('*.pkl'))
+
+
+def test_keys_follow_bundle_dimensions(loaded, filters):
+    _, version = loaded
+    assert results.check_keys(version, *filters) == []
+
+
+def test_cached_bundles_match_direct_computation(loaded, filters, tmp_path):
+    tables, version = loaded
+    min_date, max_date, category, state = filters
+    combos = [(*analytics.preset_range(preset, min_date, max_date), c, s)
+              for preset in analytics.DATE_PRESETS
+              for c, s in [(None, None), (category, None), (None, state), (category, state)]]
+    problems, reads, hits = results.check_cache(tables, version, combos, tmp_path)
+    assert problems == []
+    assert reads == hits == len(combos) * len(results.available_bundles(tables))
+
+
+def test_ignored_dimension_shares_entry(loaded, filters, tmp_path):
+    tables, version = loaded
+    start_date, end_date, category, state = filters
+
+    # sales hanya bergantung pada kategori: semua negara bagian memakai satu entri
+    for s in [None, state, 'XX']:
+        results.fetch('sales', tables, version, start_date, end_date, category, s, cache_dir=tmp_path)
+    assert len(entries(tmp_path, version)) == 1
+
+    hits = results.process_stats()['hits']
+    cached = results.fetch('sales', tables, version, start_date, end_date, category, 'YY', cache_dir=tmp_path)
+    assert results.process_stats()['hits'] == hits + 1
+    assert results.compare_results('sales', cached,
+                                   results.compute('sales', tables, start_date, end_date, category)) == []
+
+    # seller_stats bergantung pada negara bagian: setiap nilai punya entri sendiri
+    for s in [None, state]:
+        results.fetch('seller_stats', tables, version, start_date, end_date, category, s, cache_dir=tmp_path)
+    assert len(entries(tmp_path, version)) == 3
+
+
+def test_data_version_change_misses(loaded, filters, tmp_path):
+    tables, version = loaded
+    start_date, end_date, category, state = filters
+    results.fetch('rfm', tables, version, start_date, end_date, cache_dir=tmp_path)
+
+    before = results.process_stats()
+    results.fetch('rfm', tables, f'{version}-baru', start_date, end_date, cache_dir=tmp_path)
+    after = results.process_stats()
+    assert (after['hits'], after['misses']) == (before['hits'], before['misses'] + 1)
+    assert len(entries(tmp_path, version)) == len(entries(tmp_path, f'{version}-baru')) == 1
+
+
+def test_eviction_keeps_recently_used_within_cap(tmp_path):
+    payload = b'x' * 10_000
+    size = len(pickle.dumps(payload, protocol=pickle.HIGHEST_PROTOCOL))
+    paths = {name: results.entry_path(tmp_path, 'v', name) for name in ['a', 'b', 'c']}
+
+    results.store_entry(tmp_path, paths['a'], payload)
+    results.store_entry(tmp_path, paths['b'], payload)
+    # a lebih dulu ditulis tetapi baru dibaca, jadi b yang paling lama tidak dipakai
+    os.utime(paths['a'], (1_000, 1_000))
+    os.utime(paths['b'], (2_000, 2_000))
+    assert results.read_entry(paths['a']) == (True, payload)
+
+    max_mb = 2.5 * size / results.MB
+    assert results.store_entry(tmp_path, paths['c'], payload, max_mb) == 1
+    assert sorted(path.stem for path, _, _ in results.cache_entries(tmp_path)) == ['a', 'c']
+    assert sum(size for _, size, _ in results.cache_entries(tmp_path)) <= max_mb * results.MB
+
+    # Batas yang lebih kecil dari satu entri mengosongkan cache
+    assert results.evict(tmp_path, size - 1) == 2
+    assert results.cache_entries(tmp_path) == []
@@ -0,0 +1,65 @@
+"""Paritas backend SQL (DuckDB/SQLite) dengan jalur pandas pada dataset sintetis kecil.
+
+    cd dashboard
+    python -m pytest -q tests
+
+Skala kecil sengaja dipakai agar negara bagian kecil (AC/AP/RR) punya kurang
+dari 10 kota, kasus yang membedakan top_cities pandas dan SQL.
+"""
+import pandas as pd
+import pytest
+
+from olist import analytics, sql, store, synth
+from olist.config import ROOT_DIR
+
+SCALE = 0.02
+
+
+@pytest.fixture(scope='module')
+def data_dir(tmp_path_factory):
+    directory = tmp_path_factory.mktemp('data')
+    synth.generate(directory, scale=SCALE, seed=1, source_dir=ROOT_DIR / 'data')
+    return directory
+
+
+@pytest.fixture(scope='module')
+def tables(data_dir, tmp_path_factory):
+    # Store kosong -> jalur CSV dengan tipe data yang sama seperti store (categorical, kamus ID)
+    tables, _, _ = store.load_tables(data_dir, tmp_path_factory.mktemp('store'))
+    return tables
+
+
+@pytest.fixture(scope='module', params=sql.ENGINES)
+def connection(request, data_dir, tmp_path_factory):
+    if request.param == 'duckdb':
+        pytest.importorskip('duckdb')
+    processed_dir = tmp_path_factory.mktemp(f'processed-{request.param}')
+    with pytest.MonkeyPatch.context() as patch:
+        patch.setattr(sql, 'PROCESSED_DIR', processed_dir)
+        sql.build_database(request.param, data_dir)
+        con = sql.connect(request.param)
+    yield con
+    con.close()
+
+
+def test_top_cities_only_counts_cities_in_state(tables):
+    customers = tables['customers']
+    for state in customers['customer_state'].dropna().unique():
+        cities = analytics.top_cities(customers, state)
+        in_state = customers.loc[customers['customer_state'] == state, 'customer_city'].astype(str)
+        assert (cities['count'] > 0).all()
+        assert set(cities['city']) <= set(in_state)
+        assert len(cities) == min(10, in_state.nunique())
+
+
+@pytest.mark.parametrize('category,state', [(None, None), ('bed_bath_table', None), (None, 'SP'), (None, 'AC')])
+def test_sql_matches_pandas(connection, tables, category, state):
+    timestamps = tables['orders']['order_purchase_timestamp']
+    problems = sql.compare_with_pandas(connection, tables, timestamps.min(), timestamps.max(), category, state)
+    assert problems == []
+
+
+def test_sql_matches_pandas_date_range(connection, tables):
+    problems = sql.compare_with_pandas(connection, tables, pd.Timestamp('2017-03-15'),
+                                       pd.Timestamp('2018-02-10 12:00'))
+    assert problems == []